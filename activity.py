@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import sqlite3
+import time
+import weakref
+
+import discord
+
+log = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+WINDOWS = {"day": DAY, "week": 7 * DAY, "month": 30 * DAY, "all": None}
+
+
+class ActivityIndex:
+    """Per-channel, per-user message counts bucketed by time
+
+    Counts are buffered in memory and flushed to SQLite in batches. Hourly
+    buckets older than `hourly_retention` are rolled up into daily buckets, and
+    daily buckets older than `daily_retention` into a single all-time total, so
+    storage stays bounded by channels x users rather than by message volume.
+    """
+
+    def __init__(self, path, flush_interval=60, max_pending=10000,
+                 hourly_retention=7 * DAY, daily_retention=365 * DAY):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        for table in ("activity_hourly", "activity_daily"):
+            self.db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "channel_id INTEGER NOT NULL, bucket INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+                "count INTEGER NOT NULL, PRIMARY KEY (channel_id, bucket, user_id)) WITHOUT ROWID"
+            )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS activity_totals ("
+            "channel_id INTEGER NOT NULL, user_id INTEGER NOT NULL, count INTEGER NOT NULL, "
+            "PRIMARY KEY (channel_id, user_id)) WITHOUT ROWID"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS activity_channels ("
+            "channel_id INTEGER PRIMARY KEY, first_seen_id INTEGER, backfill_cursor INTEGER, "
+            "backfill_done INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.db.commit()
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.hourly_retention = hourly_retention
+        self.daily_retention = daily_retention
+        self._pending = {}
+        self._seen_channels = set()
+        # A lock lives while a backfill of its channel holds or waits on it
+        self._backfill_locks = weakref.WeakValueDictionary()
+        self._last_rollup = 0
+        self._task = None
+
+    def record(self, channel_id, user_id, timestamp, message_id=None):
+        key = (channel_id, int(timestamp) // HOUR * HOUR, user_id)
+        self._pending[key] = self._pending.get(key, 0) + 1
+        if message_id is not None and channel_id not in self._seen_channels:
+            # Remember where live tracking began so a backfill never double counts
+            self._seen_channels.add(channel_id)
+            self.db.execute(
+                "INSERT OR IGNORE INTO activity_channels (channel_id, first_seen_id) VALUES (?, ?)",
+                (channel_id, message_id)
+            )
+        if len(self._pending) >= self.max_pending:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            pending, self._pending = self._pending, {}
+            self.db.executemany(
+                "INSERT INTO activity_hourly (channel_id, bucket, user_id, count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (channel_id, bucket, user_id) DO UPDATE SET count = count + excluded.count",
+                [(c, b, u, n) for (c, b, u), n in pending.items()]
+            )
+        self.db.commit()
+
+    def rollup(self, now=None):
+        self.flush()
+        now = time.time() if now is None else now
+        hourly_cutoff = int(now - self.hourly_retention) // DAY * DAY
+        daily_cutoff = int(now - self.daily_retention) // DAY * DAY
+        self.db.execute(
+            "INSERT INTO activity_daily (channel_id, bucket, user_id, count) "
+            "SELECT channel_id, bucket - bucket % ?, user_id, SUM(count) FROM activity_hourly WHERE bucket < ? "
+            "GROUP BY 1, 2, 3 "
+            "ON CONFLICT (channel_id, bucket, user_id) DO UPDATE SET count = count + excluded.count",
+            (DAY, hourly_cutoff)
+        )
+        self.db.execute("DELETE FROM activity_hourly WHERE bucket < ?", (hourly_cutoff,))
+        self.db.execute(
+            "INSERT INTO activity_totals (channel_id, user_id, count) "
+            "SELECT channel_id, user_id, SUM(count) FROM activity_daily WHERE bucket < ? GROUP BY 1, 2 "
+            "ON CONFLICT (channel_id, user_id) DO UPDATE SET count = count + excluded.count",
+            (daily_cutoff,)
+        )
+        self.db.execute("DELETE FROM activity_daily WHERE bucket < ?", (daily_cutoff,))
+        self.db.commit()
+        self._last_rollup = now
+
+    def top_users(self, channel_id, window=None, limit=5, now=None):
+        """Return [(user_id, count)] for the busiest users over the last `window` seconds"""
+        self.flush()
+        now = time.time() if now is None else now
+        since = 0 if window is None else int(now - window)
+        query = (
+            "SELECT user_id, SUM(count) FROM ("
+            "SELECT user_id, count FROM activity_hourly WHERE channel_id = ? AND bucket >= ? "
+            "UNION ALL SELECT user_id, count FROM activity_daily WHERE channel_id = ? AND bucket >= ?"
+        )
+        params = [channel_id, since // HOUR * HOUR, channel_id, since // DAY * DAY]
+        if window is None:
+            query += " UNION ALL SELECT user_id, count FROM activity_totals WHERE channel_id = ?"
+            params.append(channel_id)
+        query += ") GROUP BY user_id ORDER BY 2 DESC LIMIT ?"
+        params.append(limit)
+        return self.db.execute(query, params).fetchall()
+
+    def backfill_state(self, channel_id):
+        row = self.db.execute(
+            "SELECT first_seen_id, backfill_cursor, backfill_done FROM activity_channels WHERE channel_id = ?",
+            (channel_id,)
+        ).fetchone()
+        return row or (None, None, 0)
+
+    async def backfill(self, channel, limit=1000, chunk_size=100):
+        """Page backwards through history from where live tracking (or the last run) stopped
+
+        Returns (messages indexed, finished). Progress is saved after every chunk,
+        so an interrupted backfill resumes from the same spot. Backfills of the
+        same channel run one after another, each picking up the other's cursor.
+        """
+        lock = self._backfill_locks.get(channel.id)
+        if lock is None:
+            lock = self._backfill_locks[channel.id] = asyncio.Lock()
+        async with lock:
+            return await self._backfill(channel, limit, chunk_size)
+
+    async def _backfill(self, channel, limit, chunk_size):
+        first_seen_id, cursor, done = self.backfill_state(channel.id)
+        if done:
+            return 0, True
+        if first_seen_id is None:
+            first_seen_id = channel.last_message_id
+            self._seen_channels.add(channel.id)
+            self.db.execute(
+                "INSERT OR IGNORE INTO activity_channels (channel_id, first_seen_id) VALUES (?, ?)",
+                (channel.id, first_seen_id)
+            )
+            # The latest message itself has not been counted live either
+            cursor = first_seen_id + 1 if first_seen_id else None
+        before = cursor or first_seen_id
+        indexed = 0
+        while indexed < limit:
+            size = min(chunk_size, limit - indexed)
+            batch = [
+                message async for message in channel.history(
+                    limit=size,
+                    before=discord.Object(id=before) if before else None
+                )
+            ]
+            for message in batch:
+                self.record(channel.id, message.author.id, message.created_at.timestamp())
+            indexed += len(batch)
+            if batch:
+                before = batch[-1].id
+            finished = len(batch) < size
+            self.flush()
+            self.db.execute(
+                "UPDATE activity_channels SET backfill_cursor = ?, backfill_done = ? WHERE channel_id = ?",
+                (before, int(finished), channel.id)
+            )
+            self.db.commit()
+            if finished:
+                return indexed, True
+            await asyncio.sleep(0)
+        return indexed, False
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self.flush()
+                if time.time() - self._last_rollup >= HOUR:
+                    self.rollup()
+            except sqlite3.Error as e:
+                log.warning("Failed to flush channel activity: %s", e)
+
+    def close(self):
+        if self._task:
+            self._task.cancel()
+        self.flush()
+        self.db.close()
+
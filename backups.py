@@ -0,0 +1,297 @@
+import asyncio
+import gzip
+import io
+import json
+import logging
+import sqlite3
+import time
+import zlib
+
+import discord
+
+log = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+SECTIONS = ("roles", "channels", "emojis")
+
+
+def _overwrites(channel):
+    overwrites = []
+    for target, overwrite in channel.overwrites.items():
+        allow, deny = overwrite.pair()
+        overwrites.append({
+            "type": "role" if isinstance(target, discord.Role) else "member",
+            "id": target.id,
+            "name": getattr(target, "name", None),
+            "allow": allow.value,
+            "deny": deny.value
+        })
+    return overwrites
+
+
+def snapshot_guild(guild):
+    """Capture the restorable state of a guild as plain JSON-ready data"""
+    roles = sorted((role for role in guild.roles if not role.is_default()), key=lambda role: (role.position, role.id))
+    channels = sorted(guild.channels, key=lambda channel: (channel.position, channel.id))
+    return {
+        "version": FORMAT_VERSION,
+        "created_at": time.time(),
+        "guild_id": guild.id,
+        "name": guild.name,
+        "description": guild.description,
+        "icon_url": str(guild.icon.url) if guild.icon else None,
+        "verification_level": str(guild.verification_level),
+        "default_notifications": str(guild.default_notifications),
+        "explicit_content_filter": str(guild.explicit_content_filter),
+        "afk_timeout": guild.afk_timeout,
+        "afk_channel": guild.afk_channel.name if guild.afk_channel else None,
+        "system_channel": guild.system_channel.name if guild.system_channel else None,
+        "preferred_locale": str(guild.preferred_locale),
+        "roles": [{
+            "id": role.id,
+            "name": role.name,
+            "color": str(role.color),
+            "permissions": role.permissions.value,
+            "position": role.position,
+            "hoist": role.hoist,
+            "mentionable": role.mentionable
+        } for role in roles],
+        "channels": [{
+            "id": channel.id,
+            "name": channel.name,
+            "type": str(channel.type),
+            "category": channel.category.name if channel.category else None,
+            "position": channel.position,
+            "topic": getattr(channel, "topic", None),
+            "nsfw": getattr(channel, "nsfw", False),
+            "slowmode_delay": getattr(channel, "slowmode_delay", 0),
+            "bitrate": getattr(channel, "bitrate", None),
+            "user_limit": getattr(channel, "user_limit", None),
+            "overwrites": _overwrites(channel)
+        } for channel in channels],
+        "emojis": [{
+            "id": emoji.id,
+            "name": emoji.name,
+            "animated": emoji.animated,
+            "url": str(emoji.url),
+            "roles": [role.id for role in emoji.roles]
+        } for emoji in guild.emojis]
+    }
+
+
+def diff_snapshots(old, new):
+    """Return a delta holding only what changed between two snapshots"""
+    delta = {"settings": {key: value for key, value in new.items() if key not in SECTIONS and old.get(key) != value}}
+    for section in SECTIONS:
+        before = {item["id"]: item for item in old.get(section, [])}
+        after = {item["id"]: item for item in new.get(section, [])}
+        delta[section] = {
+            "upsert": [item for item_id, item in after.items() if before.get(item_id) != item],
+            "removed": [item_id for item_id in before if item_id not in after]
+        }
+    return delta
+
+
+def apply_delta(base, delta):
+    snapshot = {key: value for key, value in base.items() if key not in SECTIONS}
+    snapshot.update(delta["settings"])
+    for section in SECTIONS:
+        items = {item["id"]: item for item in base.get(section, [])}
+        for item_id in delta[section]["removed"]:
+            items.pop(item_id, None)
+        for item in delta[section]["upsert"]:
+            items[item["id"]] = item
+        snapshot[section] = sorted(items.values(), key=lambda item: (item.get("position", 0), item["id"]))
+    return snapshot
+
+
+def _iter_json(data, batch=256):
+    """Yield the compact JSON for a snapshot piece by piece, a batch of list items at a time"""
+    yield "{"
+    for i, (key, value) in enumerate(data.items()):
+        yield ("," if i else "") + json.dumps(key) + ":"
+        if isinstance(value, list):
+            yield "["
+            for start in range(0, len(value), batch):
+                yield ("," if start else "") + ",".join(json.dumps(item, separators=(",", ":")) for item in value[start:start + batch])
+            yield "]"
+        else:
+            yield json.dumps(value, separators=(",", ":"))
+    yield "}"
+
+
+def encode(data):
+    """Serialize to gzip-compressed JSON, streaming encoder output into the compressor"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    buffer = io.BytesIO()
+    for chunk in _iter_json(data):
+        buffer.write(compressor.compress(chunk.encode("utf-8")))
+    buffer.write(compressor.flush())
+    return buffer.getvalue()
+
+
+def decode(data):
+    """Load a backup, accepting both compressed snapshots and the old plain JSON files"""
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return json.loads(data.decode("utf-8"))
+
+
+class SnapshotStore:
+    """Stores full and incremental guild snapshots in SQLite
+
+    Each guild's history is a series of chains: a full snapshot followed by up to
+    `full_every - 1` incremental deltas against the previous snapshot.
+    """
+
+    def __init__(self, path, full_every=7):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS backups ("
+            "id INTEGER PRIMARY KEY, guild_id INTEGER NOT NULL, created_at REAL NOT NULL, "
+            "kind TEXT NOT NULL, base_id INTEGER, data BLOB NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS backups_guild ON backups (guild_id, id)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS backup_schedules ("
+            "guild_id INTEGER PRIMARY KEY, interval_hours INTEGER NOT NULL, keep INTEGER NOT NULL, "
+            "last_run REAL NOT NULL DEFAULT 0)"
+        )
+        self.db.commit()
+        self.full_every = full_every
+        self._latest = {}
+
+    def _latest_snapshot(self, guild_id):
+        if guild_id not in self._latest:
+            row = self.db.execute(
+                "SELECT id FROM backups WHERE guild_id = ? ORDER BY id DESC LIMIT 1", (guild_id,)
+            ).fetchone()
+            self._latest[guild_id] = (row[0], self.load(row[0])) if row else None
+        return self._latest[guild_id]
+
+    async def save(self, guild_id, snapshot):
+        """Store a snapshot, as a delta when possible, and return (id, kind, stored bytes)"""
+        latest = self._latest_snapshot(guild_id)
+        kind, base_id, payload = "full", None, snapshot
+        if latest:
+            chain_length = self.db.execute(
+                "SELECT COUNT(*) FROM backups WHERE guild_id = ? AND id > "
+                "(SELECT MAX(id) FROM backups WHERE guild_id = ? AND kind = 'full')",
+                (guild_id, guild_id)
+            ).fetchone()[0]
+            if chain_length + 1 < self.full_every:
+                kind, base_id, payload = "incremental", latest[0], diff_snapshots(latest[1], snapshot)
+        data = await asyncio.to_thread(encode, payload)
+        cur = self.db.execute(
+            "INSERT INTO backups (guild_id, created_at, kind, base_id, data) VALUES (?, ?, ?, ?, ?)",
+            (guild_id, snapshot["created_at"], kind, base_id, data)
+        )
+        self.db.commit()
+        self._latest[guild_id] = (cur.lastrowid, snapshot)
+        return cur.lastrowid, kind, len(data)
+
+    def load(self, snapshot_id):
+        """Rebuild a full snapshot by replaying its chain of deltas"""
+        chain = []
+        while snapshot_id is not None:
+            row = self.db.execute("SELECT kind, base_id, data FROM backups WHERE id = ?", (snapshot_id,)).fetchone()
+            if row is None:
+                return None
+            chain.append(decode(row[2]))
+            snapshot_id = row[1] if row[0] == "incremental" else None
+        snapshot = chain.pop()
+        while chain:
+            snapshot = apply_delta(snapshot, chain.pop())
+        return snapshot
+
+    def list(self, guild_id, limit=10):
+        return self.db.execute(
+            "SELECT id, created_at, kind, LENGTH(data) FROM backups WHERE guild_id = ? ORDER BY id DESC LIMIT ?",
+            (guild_id, limit)
+        ).fetchall()
+
+    def guild_of(self, snapshot_id):
+        row = self.db.execute("SELECT guild_id FROM backups WHERE id = ?", (snapshot_id,)).fetchone()
+        return row[0] if row else None
+
+    def prune(self, guild_id, keep):
+        """Drop whole chains that lie entirely outside the newest `keep` snapshots"""
+        ids = [row[0] for row in self.db.execute(
+            "SELECT id FROM backups WHERE guild_id = ? ORDER BY id DESC LIMIT ?", (guild_id, keep)
+        )]
+        if len(ids) < keep:
+            return 0
+        oldest_full = self.db.execute(
+            "SELECT MAX(id) FROM backups WHERE guild_id = ? AND kind = 'full' AND id <= ?", (guild_id, ids[-1])
+        ).fetchone()[0]
+        if oldest_full is None:
+            return 0
+        cur = self.db.execute("DELETE FROM backups WHERE guild_id = ? AND id < ?", (guild_id, oldest_full))
+        self.db.commit()
+        return cur.rowcount
+
+    def set_schedule(self, guild_id, interval_hours, keep):
+        if interval_hours <= 0:
+            self.db.execute("DELETE FROM backup_schedules WHERE guild_id = ?", (guild_id,))
+        else:
+            self.db.execute(
+                "INSERT INTO backup_schedules (guild_id, interval_hours, keep) VALUES (?, ?, ?) "
+                "ON CONFLICT (guild_id) DO UPDATE SET interval_hours = excluded.interval_hours, keep = excluded.keep",
+                (guild_id, interval_hours, keep)
+            )
+        self.db.commit()
+
+    def due_schedules(self, now):
+        return self.db.execute(
+            "SELECT guild_id, keep FROM backup_schedules WHERE last_run + interval_hours * 3600 <= ?", (now,)
+        ).fetchall()
+
+    def mark_run(self, guild_id, now):
+        self.db.execute("UPDATE backup_schedules SET last_run = ? WHERE guild_id = ?", (now, guild_id))
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+class BackupScheduler:
+    """Takes scheduled snapshots of every guild that enabled automatic backups"""
+
+    def __init__(self, store, get_guild, check_interval=60):
+        self.store = store
+        self.get_guild = get_guild
+        self.check_interval = check_interval
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def backup(self, guild, keep=None):
+        snapshot = snapshot_guild(guild)
+        result = await self.store.save(guild.id, snapshot)
+        if keep:
+            self.store.prune(guild.id, keep)
+        return snapshot, result
+
+    async def run(self):
+        while True:
+            now = time.time()
+            for guild_id, keep in self.store.due_schedules(now):
+                guild = self.get_guild(guild_id)
+                if guild is None:
+                    continue
+                try:
+                    await self.backup(guild, keep)
+                    self.store.mark_run(guild_id, now)
+                except Exception as e:
+                    log.warning("Scheduled backup of guild %s failed: %s", guild_id, e)
+            await asyncio.sleep(self.check_interval)
@@ -0,0 +1,115 @@
+"""Size and speed of the old serverbackup file against compressed and incremental snapshots
+
+Builds a synthetic guild with 500 channels and compares:
+  * the old pretty-printed JSON written to a temp file and read back for upload
+  * a full compressed snapshot built in memory
+  * an incremental snapshot after a handful of edits
+
+Run from the repository root: python benchmarks/bench_backup.py [channels] [roles]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import discord
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backups import SnapshotStore, decode, encode, snapshot_guild  # noqa: E402
+
+
+class FakeRole(SimpleNamespace):
+    def is_default(self):
+        return self.position == 0
+
+
+class FakeOverwrite:
+    def __init__(self, allow, deny):
+        self.allow, self.deny = allow, deny
+
+    def pair(self):
+        return discord.Permissions(self.allow), discord.Permissions(self.deny)
+
+
+def synthetic_guild(channels, roles, categories=25):
+    role_list = [FakeRole(id=1, name="@everyone", position=0, color=discord.Color.default(),
+                          permissions=discord.Permissions.none(), hoist=False, mentionable=False)]
+    for i in range(1, roles + 1):
+        role_list.append(FakeRole(id=10_000 + i, name=f"role-{i}", position=i, color=discord.Color(i * 997),
+                                  permissions=discord.Permissions(i * 1024), hoist=i % 5 == 0, mentionable=False))
+    category_list = [
+        SimpleNamespace(id=20_000 + c, name=f"category-{c}", type=discord.ChannelType.category, category=None,
+                        position=c, overwrites={})
+        for c in range(categories)
+    ]
+    channel_list = list(category_list)
+    for i in range(channels - categories):
+        overwrites = {discord.Object(id=role_list[1 + i % roles].id): FakeOverwrite(1024, 2048)}
+        channel_list.append(SimpleNamespace(
+            id=30_000 + i, name=f"channel-{i}", type=discord.ChannelType.text, category=category_list[i % categories],
+            position=i, topic=f"Topic for channel {i}", nsfw=False, slowmode_delay=0, overwrites=overwrites
+        ))
+    emojis = [SimpleNamespace(id=40_000 + i, name=f"emoji_{i}", animated=False,
+                              url=f"https://cdn.discordapp.com/emojis/{40_000 + i}.png", roles=[]) for i in range(50)]
+    return SimpleNamespace(
+        id=1, name="Synthetic Guild", description="A benchmark guild", icon=None, roles=role_list,
+        channels=channel_list, emojis=emojis, verification_level=discord.VerificationLevel.low,
+        default_notifications=discord.NotificationLevel.only_mentions,
+        explicit_content_filter=discord.ContentFilter.all_members, afk_timeout=300, afk_channel=None,
+        system_channel=None, preferred_locale=discord.Locale.american_english
+    )
+
+
+def old_backup(guild, directory):
+    backup_data = {
+        "name": guild.name,
+        "description": guild.description,
+        "icon_url": None,
+        "roles": [{"name": role.name, "color": str(role.color), "permissions": role.permissions.value}
+                  for role in guild.roles if not role.is_default()],
+        "channels": [{"name": channel.name, "type": str(channel.type), "category": channel.category.name if channel.category else None}
+                     for channel in guild.channels]
+    }
+    filename = os.path.join(directory, "backup.txt")
+    with open(filename, 'w') as f:
+        json.dump(backup_data, f, indent=2)
+    with open(filename, 'rb') as f:
+        data = f.read()
+    os.remove(filename)
+    return data
+
+
+def timed(func, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+async def main(channels, roles):
+    guild = synthetic_guild(channels, roles)
+    with tempfile.TemporaryDirectory() as tmp:
+        old, old_ms = timed(lambda: old_backup(guild, tmp))
+        full, full_ms = timed(lambda: encode(snapshot_guild(guild)))
+        assert decode(full)["channels"][-1]["name"] == guild.channels[-1].name
+        print(f"{'old .txt file':>22}: {len(old) / 1024:8.1f} KiB {old_ms:7.2f} ms  (names, colours, permissions only)")
+        print(f"{'full snapshot (gzip)':>22}: {len(full) / 1024:8.1f} KiB {full_ms:7.2f} ms  (+ overwrites, positions, topics, emojis, settings)")
+
+        store = SnapshotStore(os.path.join(tmp, "bench.db"))
+        await store.save(guild.id, snapshot_guild(guild))
+        for channel in guild.channels[-5:]:
+            channel.topic = "Edited topic"
+        guild.roles[-1].name = "renamed-role"
+        snapshot_id, kind, size = await store.save(guild.id, snapshot_guild(guild))
+        restored = store.load(snapshot_id)
+        assert restored["roles"][-1]["name"] == "renamed-role"
+        print(f"{'incremental snapshot':>22}: {size / 1024:8.1f} KiB             ({kind}, 5 topics and 1 role changed)")
+        store.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500, int(sys.argv[2]) if len(sys.argv) > 2 else 100))
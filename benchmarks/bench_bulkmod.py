@@ -0,0 +1,71 @@
+"""Sequential moderation calls vs the bulk executor against a local fake REST server
+
+Uses discord.py's real HTTP client, including its rate-limit bucket handling, against
+benchmarks/fake_gateway.py with `--latency` seconds per response and `--rate-limit`
+requests per route and guild per second.
+
+Run from the repository root: python benchmarks/bench_bulkmod.py [--members N] [--latency S]
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+import time
+
+import discord
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bulkmod import BulkExecutor  # noqa: E402
+from fake_gateway import FakeDiscord, guild_payload  # noqa: E402
+
+
+async def timed(label, fake, coro, count):
+    requests, limited = fake.requests, fake.rate_limited
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:7.2f}s  {count / elapsed:7.1f} members/s  "
+          f"{fake.requests - requests:5} requests  {fake.rate_limited - limited:3} 429s")
+
+
+async def sequential(members, action):
+    for member in members:
+        await action(member)
+
+
+async def main(args):
+    fake = FakeDiscord(guilds=1, members=args.members, port=args.port, latency=args.latency, rate_limit=args.rate_limit)
+    await fake.start()
+    discord.http.Route.BASE = f"{fake.url}/api/v10"
+    client = discord.Client(intents=discord.Intents(guilds=True, members=True))
+    await client.login("fake")
+    try:
+        guild = discord.Guild(data=guild_payload(0, args.members), state=client._connection)
+        members = [member for member in guild.members if not member.bot]
+        count = len(members)
+        until = datetime.timedelta(minutes=10)
+        print(f"{count} members, {args.latency * 1000:.0f}ms per request, {args.rate_limit} requests/s per route")
+
+        await timed("kick, sequential", fake, sequential(members, lambda m: m.kick()), count)
+        await timed(f"kick, executor x{args.concurrency}", fake,
+                    BulkExecutor(args.concurrency).run(members, lambda m: m.kick()), count)
+        await timed("timeout, sequential", fake, sequential(members, lambda m: m.timeout(until)), count)
+        await timed(f"timeout, executor x{args.concurrency}", fake,
+                    BulkExecutor(args.concurrency).run(members, lambda m: m.timeout(until)), count)
+        await timed("ban, sequential", fake, sequential(members, lambda m: guild.ban(m)), count)
+        await timed("ban, bulk-ban endpoint", fake, BulkExecutor().bulk_ban(guild, members), count)
+    finally:
+        await client.close()
+        await fake.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rate-limit", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8770)
+    asyncio.run(main(parser.parse_args()))
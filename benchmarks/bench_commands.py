@@ -0,0 +1,245 @@
+"""Offline latency, allocations and REST calls of command callbacks against synthetic guilds
+
+Loads every extension into a bot that never connects, builds real discord.py
+Guild, Member and Role objects from gateway payloads of each requested size, and
+calls the commands' callbacks with a stand-in Context. The bot's HTTP client
+answers REST calls locally and counts them per route, so nothing leaves the
+machine and the suite can run in CI.
+
+For each command and guild size it reports the first call (cold caches), p50/p95/
+p99 of the following calls, peak and retained traced memory of one call and the
+REST calls issued per call. --save writes the results as a baseline; --compare
+exits with status 1 when a command got slower than --tolerance times its
+baseline or issues more REST calls than it did. benchmarks/baselines/commands.json
+holds the baseline for the default sizes.
+
+Run from the repository root: python benchmarks/bench_commands.py [--members 10,1000,100000] [--roles 10,1000]
+                              [--runs N] [--save FILE] [--compare FILE]
+"""
+import argparse
+import asyncio
+import collections
+import gc
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+TMP = tempfile.TemporaryDirectory()
+os.environ.setdefault("BOT_DB_PATH", os.path.join(TMP.name, "bench.db"))
+
+import discord  # noqa: E402
+from discord.ext import commands  # noqa: E402
+
+import main  # noqa: E402
+from cogs import EXTENSIONS  # noqa: E402
+from fake_gateway import APPLICATION_ID, BOT_USER, JOINED_AT, guild_payload, member_id  # noqa: E402
+from outbound import OutboundDispatcher  # noqa: E402
+
+# Differences below this are noise whatever the tolerance
+NOISE_FLOOR_MS = 0.2
+
+
+class FakeHTTP:
+    """Stands in for HTTPClient.request: counts routes and answers with minimal payloads"""
+
+    def __init__(self):
+        self.calls = collections.Counter()
+        self._ids = itertools.count(10 ** 17)
+
+    def message(self, channel_id):
+        return {
+            "id": str(next(self._ids)), "channel_id": str(channel_id), "type": 0, "content": "",
+            "author": BOT_USER, "embeds": [], "attachments": [], "mentions": [], "mention_roles": [],
+            "pinned": False, "mention_everyone": False, "tts": False, "timestamp": JOINED_AT,
+            "edited_timestamp": None, "flags": 0, "components": []
+        }
+
+    async def request(self, route, *, files=None, form=None, **kwargs):
+        self.calls[f"{route.method} {route.path}"] += 1
+        if route.method == "POST" and route.path == "/channels/{channel_id}/messages":
+            return self.message(route.channel_id)
+        if route.method == "POST" and route.path == "/users/@me/channels":
+            recipient = kwargs["json"]["recipient_id"]
+            return {"id": str(next(self._ids)), "type": 1, "last_message_id": None,
+                    "recipients": [{"id": str(recipient), "username": "user", "discriminator": "0",
+                                    "global_name": None, "avatar": None}]}
+        return {}
+
+
+class FakeContext:
+    """The parts of commands.Context the command callbacks use, for a prefix invocation"""
+
+    def __init__(self, bot, guild, author, command=None, invoked_with=None):
+        self.bot = bot
+        self.guild = guild
+        self.author = author
+        self.channel = guild.text_channels[0]
+        self.command = command
+        self.invoked_with = invoked_with or (command.name if command else None)
+        self.interaction = None
+        self.message = None
+        self.prefix = "+"
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+    async def defer(self, **kwargs):
+        pass
+
+    def typing(self):
+        return self.channel.typing()
+
+
+def build_guild(state, members, roles):
+    data = guild_payload(0, members)
+    gid = int(data["id"])
+    role_ids = [str(gid + 10 + i) for i in range(roles)]
+    data["roles"] += [
+        {"id": role_id, "name": f"role-{i}", "color": i * 997, "hoist": i % 5 == 0, "position": i + 1,
+         "permissions": str(1 << (i % 40)), "managed": False, "mentionable": False, "flags": 0}
+        for i, role_id in enumerate(role_ids)
+    ]
+    for i, member in enumerate(data["members"]):
+        member["roles"] = [role_ids[i % roles]] if roles else []
+    return discord.Guild(data=data, state=state)
+
+
+def cases(bot, guild):
+    author = guild.get_member(member_id(0, 1))
+    role = guild.roles[len(guild.roles) // 2]
+
+    def command(name, *args, **kwargs):
+        cmd = bot.get_command(name)
+        return lambda: cmd.callback(cmd.cog, FakeContext(bot, guild, author, cmd), *args, **kwargs)
+
+    def unknown_command():
+        ctx = FakeContext(bot, guild, author, invoked_with="rol")
+        return main.on_command_error(ctx, commands.CommandNotFound('Command "rol" is not found'))
+
+    return {
+        "roll": command("roll", dice="4d20"),
+        "membercount": command("membercount"),
+        "roleinfo": command("roleinfo", role),
+        "commands": command("commands"),
+        "serverbackup": command("serverbackup"),
+        "on_command_error": unknown_command,
+    }
+
+
+async def measure(bot, http, call, runs):
+    started = time.perf_counter()
+    await call()
+    first = time.perf_counter() - started
+    await bot.outbound.drain(timeout=None)
+
+    http.calls.clear()
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - started)
+    # Replies queued on the outbound dispatcher go out after the callback returns
+    await bot.outbound.drain(timeout=None)
+    rest = sum(http.calls.values()) / runs
+    routes = {route: count / runs for route, count in http.calls.items()}
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    await call()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    quantiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "first_ms": first * 1000, "p50_ms": quantiles[49] * 1000, "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000, "peak_kib": (peak - before) / 1024,
+        "retained_kib": (current - before) / 1024, "rest": rest, "routes": routes
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for size, commands_ in results.items():
+        for name, result in commands_.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            if result["p50_ms"] > base["p50_ms"] * tolerance and result["p50_ms"] - base["p50_ms"] > NOISE_FLOOR_MS:
+                regressions.append(f"{size} {name}: p50 {base['p50_ms']:.2f}ms -> {result['p50_ms']:.2f}ms")
+            if result["rest"] > base["rest"]:
+                regressions.append(f"{size} {name}: REST calls {base['rest']:g} -> {result['rest']:g}")
+    return regressions
+
+
+async def run(args):
+    bot = main.bot
+    bot._connection.user = discord.ClientUser(state=bot._connection, data=BOT_USER)
+    http = FakeHTTP()
+    bot.http.request = http.request
+    # Pacing is the dispatcher's job in production; here it would only add sleeps between measurements
+    bot.outbound = OutboundDispatcher(rate=10 ** 9)
+    # With ERROR_REPLY_TTL set, error replies are cleaned up that many seconds later, which drain() would wait out
+    main.ERROR_REPLY_TTL = 0
+    for name in EXTENSIONS:
+        await bot.load_extension(name)
+    assert bot.user.id == APPLICATION_ID
+
+    results = {}
+    for members, roles in itertools.product(args.members, args.roles):
+        size = f"{members}m/{roles}r"
+        started = time.perf_counter()
+        guild = build_guild(bot._connection, members, roles)
+        bot._connection._add_guild(guild)
+        print(f"\n{size}: guild built in {time.perf_counter() - started:.2f}s")
+        print(f"{'command':>16} {'first':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'peak':>10} {'retained':>10} {'REST':>5}")
+        results[size] = {}
+        for name, call in cases(bot, guild).items():
+            result = results[size][name] = await measure(bot, http, call, args.runs)
+            print(f"{name:>16} {result['first_ms']:7.2f}ms {result['p50_ms']:7.2f}ms {result['p95_ms']:7.2f}ms "
+                  f"{result['p99_ms']:7.2f}ms {result['peak_kib']:7.1f}KiB {result['retained_kib']:7.1f}KiB "
+                  f"{result['rest']:5g}")
+        bot._connection._remove_guild(guild)
+        bot.member_counters.remove_guild(guild)
+        del guild
+        gc.collect()
+
+    for name in list(bot.extensions):
+        await bot.unload_extension(name)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions against " + args.compare + ":\n  " + "\n  ".join(regressions))
+            return 1
+        print(f"\nNo regressions against {args.compare}")
+    return 0
+
+
+def sizes(value):
+    return [int(size) for size in value.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=sizes, default=[10, 1000, 100000])
+    parser.add_argument("--roles", type=sizes, default=[10, 1000])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--save", help="write the results as a baseline JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to check the results against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed p50 slowdown factor")
+    sys.exit(asyncio.run(run(parser.parse_args())))
@@ -0,0 +1,64 @@
+"""Dice rolls: the old NdN per-die randint loop vs the dice expression engine
+
+The old loop rolled every die with random.randint and joined all results into
+one string. The engine caches parsed expressions, rolls small groups die by die
+and large ones in bulk as a tally of faces, summarised instead of listed.
+
+Run from the repository root: python benchmarks/bench_dice.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dice  # noqa: E402
+from dice import parse_dice  # noqa: E402
+
+CASES = ("2d6", "100d1000", "10000d6", "1000000d6", "1000000d20", "1000000d1000")
+EXPRESSIONS = ("4d6kh3+2d8+5", "40d6!kh10", "1000000d6kh3", "100000d6!+500d12dl100*2")
+
+
+def old_roll(expression):
+    rolls, limit = map(int, expression.split('d'))
+    results = [random.randint(1, limit) for _ in range(rolls)]
+    return ', '.join(map(str, results)), sum(results)
+
+
+def new_roll(expression):
+    result = parse_dice(expression).roll()
+    return "\n".join(group.describe() for group in result.groups), result.total
+
+
+def timed(func, expression):
+    number = max(1, 20000 // int(expression.split("d")[0] or 1))
+    seconds = min(timeit.repeat(lambda: func(expression), number=number, repeat=3)) / number
+    return seconds, len(func(expression)[0])
+
+
+def main():
+    random.seed(0)
+    print(f"{'dice':>14} {'old loop':>10} {'old text':>10} {'engine':>10} {'text':>6} {'speedup':>8}")
+    for expression in CASES:
+        old, old_text = timed(old_roll, expression)
+        new, new_text = timed(new_roll, expression)
+        print(f"{expression:>14} {old * 1000:8.3f}ms {old_text:>10,} {new * 1000:8.3f}ms {new_text:>6} {old / new:7.1f}x")
+
+    print()
+    for expression in EXPRESSIONS:
+        parsed = parse_dice(expression)
+        number = max(1, 20000 // parsed.dice)
+        cached = min(timeit.repeat(lambda: parse_dice(expression), number=1000, repeat=3)) / 1000
+
+        def uncached():
+            dice._parse.cache_clear()
+            parse_dice(expression)
+
+        parse = min(timeit.repeat(uncached, number=1000, repeat=3)) / 1000
+        roll = min(timeit.repeat(parsed.roll, number=number, repeat=3)) / number
+        print(f"{expression:>26}: parse {parse * 1e6:7.2f}us, cached {cached * 1e6:5.2f}us, roll {roll * 1000:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Gateway load: how many dispatches per second the bot keeps up with, and where the time goes
+
+The parent runs main.py's bot in-process, with every extension loaded, and
+instruments its dispatch path. A child process serves benchmarks/fake_gateway.py
+and, once the bot is ready, pushes events at each rate in --rates for --duration
+seconds. Events are synthesized (MESSAGE_CREATE, GUILD_MEMBER_ADD/REMOVE and
+MESSAGE_REACTION_ADD/REMOVE in the proportions of --mix) or replayed from a
+recording, made by running the bot with GATEWAY_RECORD=events.jsonl.
+
+Every payload carries the time it was sent, so for each rate it reports:
+  * sustained throughput, events parsed per second against the rate offered
+  * queueing delay per event type, from send to parse: time spent in the socket
+    and waiting for the event loop
+  * parse time per event type, and wait and run time per listener
+  * event loop lag, sampled every 10ms
+A rate is flagged as falling behind when the p99 queueing delay passes
+--budget or throughput drops below 95% of the offered rate.
+
+Run from the repository root: python benchmarks/bench_gateway.py [--rates 500,1000,2000,4000] [--duration 5]
+                              [--mix message=85,reaction_add=6,reaction_remove=2,member_add=4,member_remove=3]
+                              [--replay events.jsonl] [NAME=value ...]
+"""
+import argparse
+import asyncio
+import collections
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_gateway import (  # noqa: E402
+    FakeDiscord, guild_id, member_id, member_payload, message_payload, user_payload
+)
+
+LAG_INTERVAL = 0.01
+EVENTS = {
+    "message": "MESSAGE_CREATE", "reaction_add": "MESSAGE_REACTION_ADD", "reaction_remove": "MESSAGE_REACTION_REMOVE",
+    "member_add": "GUILD_MEMBER_ADD", "member_remove": "GUILD_MEMBER_REMOVE"
+}
+
+
+def shard_of(gid, shards):
+    return (gid >> 22) % shards
+
+
+def synthesized(args):
+    """Endless (shard, event, payload) stream in the proportions of --mix"""
+    rng = random.Random(0)
+    kinds, weights = zip(*args.mix.items())
+    ids = itertools.count(10 ** 17)
+    joined = collections.deque()
+    while True:
+        kind = rng.choices(kinds, weights)[0]
+        index = rng.randrange(args.guilds)
+        gid = guild_id(index)
+        user_id = member_id(index, rng.randrange(args.members))
+        if kind == "message":
+            data = message_payload(next(ids), gid + 1, gid, user_id)
+        elif kind in ("reaction_add", "reaction_remove"):
+            data = {"user_id": str(user_id), "channel_id": str(gid + 1), "message_id": str(next(ids)),
+                    "guild_id": str(gid), "emoji": {"id": None, "name": "🎉"}, "burst": False, "type": 0}
+            if kind == "reaction_add":
+                data["member"] = member_payload(user_id)
+        elif kind == "member_add":
+            new_id = next(ids)
+            joined.append((gid, new_id))
+            data = dict(member_payload(new_id), guild_id=str(gid))
+        else:
+            # Members who joined earlier in the run leave again, so guild sizes stay put
+            if joined:
+                gid, user_id = joined.popleft()
+            data = {"guild_id": str(gid), "user": user_payload(user_id)}
+        yield shard_of(gid, args.shards), EVENTS[kind], data
+
+
+def replayed(events, shards):
+    """Endless (shard, event, payload) stream cycling through a recording"""
+    if not events:
+        raise SystemExit("The recording has no events besides GUILD_CREATE")
+    for event, data in itertools.cycle(events):
+        gid = data.get("guild_id") if isinstance(data, dict) else None
+        yield shard_of(int(gid), shards) if gid else 0, event, data
+
+
+async def push(fake, source, rate, duration, step):
+    started = time.time()
+    sent = 0
+    while time.time() - started < duration:
+        for _ in range(int(rate * (time.time() - started)) + 1 - sent):
+            shard, event, data = next(source)
+            await fake.dispatch(shard, event, dict(data, _sent_at=time.time(), _step=step))
+            sent += 1
+        await asyncio.sleep(0.002)
+    return sent, time.time() - started
+
+
+async def serve(args):
+    """Child: the fake gateway and the load generator, driven by the parent over stdin/stdout"""
+    fake = FakeDiscord(guilds=args.guilds, members=args.members, shards=args.shards, port=args.port)
+    await fake.start()
+    reader = asyncio.StreamReader()
+    await asyncio.get_running_loop().connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    print("listening", flush=True)
+    if not await reader.readline():
+        await fake.stop()
+        return
+
+    if args.replay:
+        from eventlog import load_recording
+        events = load_recording(args.replay)
+        # The recorded guilds go in first, so later events find their channels and members
+        for event, data in events:
+            if event == "GUILD_CREATE":
+                await fake.dispatch(shard_of(int(data["id"]), args.shards), event, data)
+        source = replayed([(event, data) for event, data in events if event != "GUILD_CREATE"], args.shards)
+    else:
+        source = synthesized(args)
+
+    for step, rate in enumerate(args.rates):
+        sent, elapsed = await push(fake, source, rate, args.duration, step)
+        print(f"step {step} {sent} {elapsed:.3f}", flush=True)
+        if not await reader.readline():
+            break
+    await fake.stop()
+
+
+class LoadStats:
+    def __init__(self):
+        self.step = None
+        self.sent_at = {}
+        self.parsed = collections.Counter()
+        self.last_parse = {}
+        self.delay = collections.defaultdict(list)
+        self.parse = collections.defaultdict(list)
+        self.handler_wait = collections.defaultdict(list)
+        self.handler_run = collections.defaultdict(list)
+        self.lag = collections.defaultdict(list)
+
+
+def instrument(bot, stats):
+    def timed_parser(name, parser):
+        def parse(data):
+            sent_at = data.pop("_sent_at", None) if isinstance(data, dict) else None
+            if sent_at is None:
+                return parser(data)
+            received = time.time()
+            step = stats.step = data.pop("_step")
+            started = time.perf_counter()
+            parser(data)
+            stats.parse[step, name].append(time.perf_counter() - started)
+            stats.delay[step, name].append(received - sent_at)
+            stats.sent_at[step] = min(stats.sent_at.get(step, sent_at), sent_at)
+            stats.parsed[step] += 1
+            stats.last_parse[step] = time.time()
+        return parse
+
+    # The websocket looks parsers up in this same dict, so wrapping in place covers every shard
+    parsers = bot._connection.parsers
+    for name, parser in list(parsers.items()):
+        parsers[name] = timed_parser(name.upper(), parser)
+
+    run_event = bot._run_event
+
+    def schedule_event(coro, event_name, *args, **kwargs):
+        scheduled = time.perf_counter()
+        step = stats.step
+
+        async def timed():
+            started = time.perf_counter()
+            await run_event(coro, event_name, *args, **kwargs)
+            if step is not None:
+                stats.handler_wait[step, event_name].append(started - scheduled)
+                stats.handler_run[step, event_name].append(time.perf_counter() - started)
+
+        return bot.loop.create_task(timed(), name=f"discord.py: {event_name}")
+
+    bot._schedule_event = schedule_event
+
+
+async def sample_lag(stats):
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        if stats.step is not None:
+            stats.lag[stats.step].append(max(0.0, time.perf_counter() - started - LAG_INTERVAL))
+
+
+def pct(values, q):
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1] if len(values) > 1 else values[0]
+
+
+def ms(seconds):
+    return f"{seconds * 1000:8.2f}ms"
+
+
+def report(stats, step, rate, sent, elapsed, budget):
+    parsed = stats.parsed[step]
+    span = stats.last_parse.get(step, 0) - stats.sent_at.get(step, 0)
+    sustained = parsed / span if span > 0 else 0.0
+    lag = stats.lag[step] or [0.0]
+    delays = [d for (s, _), values in stats.delay.items() if s == step for d in values]
+    behind = not delays or pct(delays, 99) > budget or sustained < 0.95 * sent / elapsed
+    print(f"\n{rate}/s: offered {sent / elapsed:.0f}/s ({sent} events in {elapsed:.2f}s), "
+          f"sustained {sustained:.0f}/s ({parsed} parsed), loop lag p50{ms(pct(lag, 50))} p99{ms(pct(lag, 99))} "
+          f"max{ms(max(lag))} -> {'FALLING BEHIND' if behind else 'keeping up'}")
+    print(f"  {'event':<26}{'count':>7} {'delay p50':>10} {'delay p99':>10} {'delay max':>10} {'parse p50':>10}")
+    for (s, name), values in sorted(stats.delay.items()):
+        if s == step:
+            print(f"  {name:<26}{len(values):>7} {ms(pct(values, 50))} {ms(pct(values, 99))} {ms(max(values))} "
+                  f"{ms(pct(stats.parse[s, name], 50))}")
+    print(f"  {'listener':<26}{'count':>7} {'wait p50':>10} {'wait p99':>10} {'run p50':>10} {'run p99':>10}")
+    for (s, name), values in sorted(stats.handler_run.items()):
+        if s == step:
+            waits = stats.handler_wait[s, name]
+            print(f"  {name:<26}{len(values):>7} {ms(pct(waits, 50))} {ms(pct(waits, 99))} "
+                  f"{ms(pct(values, 50))} {ms(pct(values, 99))}")
+    return not behind
+
+
+async def run(args):
+    tmp = tempfile.TemporaryDirectory()
+    os.environ.update(
+        DISCORD_API_BASE=f"http://127.0.0.1:{args.port}/api/v10",
+        DISCORD_GATEWAY_URL=f"ws://127.0.0.1:{args.port}/gateway",
+        BOT_DB_PATH=os.path.join(tmp.name, "bench.db"), WEB_PORT=str(args.web_port)
+    )
+    os.environ.update(item.split("=", 1) for item in args.env)
+    import main
+
+    child_args = [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(args.port),
+                  "--guilds", str(args.guilds), "--members", str(args.members), "--shards", str(args.shards),
+                  "--duration", str(args.duration), "--rates", ",".join(map(str, args.rates)),
+                  "--mix", ",".join(f"{kind}={weight}" for kind, weight in args.mix.items())]
+    if args.replay:
+        child_args += ["--replay", args.replay]
+    child = await asyncio.create_subprocess_exec(*child_args, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE)
+    await child.stdout.readline()
+
+    bot = main.bot
+    stats = LoadStats()
+    instrument(bot, stats)
+    await bot.login("fake")
+    bot_task = asyncio.create_task(bot.connect())
+    await bot.wait_until_ready()
+    lag_task = asyncio.create_task(sample_lag(stats))
+    print(f"Bot ready with {len(bot.guilds)} guilds and {len(bot.extensions)} extensions; "
+          + (f"replaying {args.replay}" if args.replay else f"mix {args.mix}"))
+    child.stdin.write(b"go\n")
+
+    best = None
+    try:
+        for step, rate in enumerate(args.rates):
+            _, _, sent, elapsed = (await child.stdout.readline()).decode().split()
+            sent, elapsed = int(sent), float(elapsed)
+            deadline = time.monotonic() + args.duration * 4 + 10
+            while stats.parsed[step] < sent and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            # Let listeners scheduled by the last events finish
+            await asyncio.sleep(0.2)
+            if report(stats, step, rate, sent, elapsed, args.budget):
+                best = rate
+            child.stdin.write(b"next\n")
+    finally:
+        lag_task.cancel()
+        await bot.close()
+        bot_task.cancel()
+        child.stdin.close()
+        await child.wait()
+    print(f"\nHighest rate kept up with: {f'{best}/s' if best else 'none'} "
+          f"(p99 queueing delay under {args.budget * 1000:.0f}ms)")
+
+
+def rates(value):
+    return [int(rate) for rate in value.split(",")]
+
+
+def mix(value):
+    weights = {kind: float(weight) for kind, weight in (item.split("=") for item in value.split(","))}
+    unknown = set(weights) - set(EVENTS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown event kinds {', '.join(sorted(unknown))}, expected {', '.join(EVENTS)}")
+    return weights
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rates", type=rates, default=[500, 1000, 2000, 4000], help="events per second, one step each")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per rate")
+    parser.add_argument("--mix", type=mix, default=mix("message=85,reaction_add=6,reaction_remove=2,member_add=4,member_remove=3"))
+    parser.add_argument("--replay", help="JSON lines recording made with GATEWAY_RECORD")
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--budget", type=float, default=0.1, help="p99 queueing delay in seconds that still counts as keeping up")
+    parser.add_argument("--port", type=int, default=8795)
+    parser.add_argument("--web-port", type=int, default=5064)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("env", nargs="*", help="NAME=value environment for the bot, e.g. EXTENSIONS=general,stats")
+    args = parser.parse_args()
+    asyncio.run(serve(args) if args.serve else run(args))
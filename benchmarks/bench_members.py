@@ -0,0 +1,124 @@
+"""Memory and readiness of each member cache policy with a synthetic 100k-member guild
+
+The parent serves benchmarks/fake_gateway.py; every policy runs in its own child
+process so RSS figures do not leak into each other. Each child connects a real
+discord.py client, waits for READY, feeds `--messages` MESSAGE_CREATE events from
+Zipf-distributed authors through the gateway parser, then asks the policy for the
+complete member list the way membercount does.
+
+Run from the repository root: python benchmarks/bench_members.py [--members N] [--messages N]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import resource
+import sys
+import time
+
+import discord
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_gateway import FakeDiscord, guild_id, member_id, message_payload  # noqa: E402
+from membercache import POLICIES, MemberCachePolicy  # noqa: E402
+
+
+def rss_mib():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+async def child(args):
+    discord.http.Route.BASE = f"http://127.0.0.1:{args.port}/api/v10"
+    discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = discord.gateway.yarl.URL(f"ws://127.0.0.1:{args.port}/gateway")
+    policy = MemberCachePolicy(args.child, args.cache_size)
+    intents = discord.Intents(guilds=True, members=True, guild_messages=True)
+    client = discord.Client(intents=intents, **policy.client_options(intents))
+
+    @client.event
+    async def on_guild_available(guild):
+        policy.install(guild)
+
+    @client.event
+    async def on_message(message):
+        policy.seen(message.author)
+
+    result = {}
+    await client.login("fake")
+    gc.collect()
+    baseline = rss_mib()
+    start = time.perf_counter()
+    connection = asyncio.create_task(client.connect(reconnect=False))
+    await client.wait_until_ready()
+    result["ready_s"] = time.perf_counter() - start
+    guild = client.get_guild(guild_id(0))
+    gc.collect()
+    result["ready_mib"] = rss_mib() - baseline
+    result["ready_cached"] = len(guild.members)
+
+    weights = [1 / (rank + 1) for rank in range(args.members)]
+    authors = random.Random(1).choices(range(args.members), weights, k=args.messages)
+    start = time.perf_counter()
+    for n, author in enumerate(authors):
+        client._connection.parse_message_create(message_payload(n + 1, guild.id + 1, guild.id, member_id(0, author)))
+        if n % 1000 == 0:
+            await asyncio.sleep(0)
+    await asyncio.sleep(0.1)
+    result["active_authors"] = len(set(authors))
+    result["messages_s"] = time.perf_counter() - start
+    gc.collect()
+    result["active_mib"] = rss_mib() - baseline
+    result["active_cached"] = len(guild.members)
+
+    start = time.perf_counter()
+    members = await policy.members(guild)
+    result["list_s"] = time.perf_counter() - start
+    result["listed"] = len(members)
+    del members
+    gc.collect()
+    result["after_list_mib"] = rss_mib() - baseline
+    result["after_list_cached"] = len(guild.members)
+    result["peak_mib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(result))
+    await client.close()
+    connection.cancel()
+
+
+async def parent(args):
+    fake = FakeDiscord(guilds=1, members=args.members, port=args.port)
+    await fake.start()
+    print(f"1 guild with {args.members} members, {args.messages} messages, recent cache size {args.cache_size}\n")
+    print(f"{'policy':<8} {'ready':>7} {'RSS':>9} {'cached':>8} | {'after activity':>18} | "
+          f"{'full list':>9} {'RSS':>9} {'cached':>8} | {'peak':>9}")
+    try:
+        for policy in args.policies:
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, os.path.abspath(__file__), "--child", policy, "--port", str(args.port),
+                "--members", str(args.members), "--messages", str(args.messages), "--cache-size", str(args.cache_size),
+                stdout=asyncio.subprocess.PIPE
+            )
+            out, _ = await proc.communicate()
+            r = json.loads(out.decode().strip().splitlines()[-1])
+            print(f"{policy:<8} {r['ready_s']:6.2f}s {r['ready_mib']:6.1f}MiB {r['ready_cached']:8} | "
+                  f"{r['active_mib']:6.1f}MiB {r['active_cached']:8} | "
+                  f"{r['list_s']:8.2f}s {r['after_list_mib']:6.1f}MiB {r['after_list_cached']:8} | {r['peak_mib']:6.1f}MiB")
+    finally:
+        await fake.stop()
+    print("\nRSS is relative to the logged-in client before connecting. Memory freed after a full list")
+    print("that was not cached stays with Python's allocator, so RSS does not drop back.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--cache-size", type=int, default=1000)
+    parser.add_argument("--policies", nargs="+", default=list(POLICIES), choices=POLICIES)
+    parser.add_argument("--port", type=int, default=8791)
+    parser.add_argument("--child", choices=POLICIES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    asyncio.run(child(args) if args.child else parent(args))
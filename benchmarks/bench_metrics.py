@@ -0,0 +1,44 @@
+"""Per-command overhead of the metrics hooks and cost of rendering /metrics
+
+Times the work done by the before_invoke/after_invoke hooks for one command
+(one perf_counter call each plus a histogram update) and a full render with 60 commands.
+
+Run from the repository root: python benchmarks/bench_metrics.py
+"""
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import Metrics  # noqa: E402
+
+
+class Ctx:
+    pass
+
+
+def main():
+    metrics = Metrics()
+    names = [f"command{i}" for i in range(60)]
+    ctx = Ctx()
+
+    def hooks():
+        ctx.started_at = time.perf_counter()
+        metrics.observe("roll", time.perf_counter() - ctx.started_at)
+
+    number = 200_000
+    seconds = min(timeit.repeat(hooks, number=number, repeat=5))
+    print(f"before/after invoke hooks: {seconds / number * 1e6:.2f} us per command")
+
+    for name in names:
+        for value in (0.001, 0.02, 0.3, 2.0):
+            metrics.observe(name, value)
+        metrics.error(name, ValueError())
+    seconds = min(timeit.repeat(metrics.render, number=100, repeat=3))
+    print(f"render with {len(names)} commands: {seconds / 100 * 1e3:.2f} ms, {len(metrics.render()) / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
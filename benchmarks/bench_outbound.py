@@ -0,0 +1,126 @@
+"""Handler latency under a burst: direct sends vs the outbound dispatcher
+
+A fake channel allows `--rate` operations per `--per` seconds; going over costs a
+429 and an inline wait until the window resets, the way discord.py retries.
+Handlers either await the send themselves or enqueue it with the dispatcher.
+
+Run from the repository root: python benchmarks/bench_outbound.py [--handlers N]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from outbound import OutboundDispatcher  # noqa: E402
+
+
+class FakeMessage:
+    def __init__(self, channel, id):
+        self.channel = channel
+        self.id = id
+
+    async def edit(self, **kwargs):
+        await self.channel.call()
+        return self
+
+    async def delete(self):
+        await self.channel.call()
+
+
+class FakeChannel:
+    def __init__(self, rate, per, latency=0.02):
+        self.id = 1
+        self.rate = rate
+        self.per = per
+        self.latency = latency
+        self.window_start = 0.0
+        self.used = 0
+        self.calls = 0
+        self.rate_limited = 0
+        self.lock = asyncio.Lock()
+
+    async def call(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now - self.window_start >= self.per:
+                    self.window_start, self.used = now, 0
+                if self.used < self.rate:
+                    self.used += 1
+                    break
+                self.rate_limited += 1
+                await asyncio.sleep(self.window_start + self.per - now)
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+
+    async def send(self, **kwargs):
+        await self.call()
+        return FakeMessage(self, self.calls)
+
+    async def delete_messages(self, messages):
+        await self.call()
+
+
+def report(label, latencies, elapsed, channel):
+    latencies.sort()
+    print(f"{label:<12} handler p50 {statistics.median(latencies) * 1000:8.2f}ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:8.2f}ms  "
+          f"all done {elapsed:5.2f}s  {channel.calls:3} API calls  {channel.rate_limited:3} 429s")
+
+
+async def run_direct(args):
+    channel = FakeChannel(args.rate, args.per)
+    status = await channel.send(content="status")
+    latencies = []
+
+    async def handler(i):
+        start = time.perf_counter()
+        reply = await channel.send(content=f"reply {i}")
+        await status.edit(content=f"processed {i}")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(args.cleanup)
+        await reply.delete()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(i) for i in range(args.handlers)))
+    report("direct", latencies, time.perf_counter() - start, channel)
+
+
+async def run_dispatcher(args):
+    channel = FakeChannel(args.rate, args.per)
+    dispatcher = OutboundDispatcher(rate=args.rate, per=args.per)
+    status = await dispatcher.send(channel, content="status")
+    latencies = []
+
+    async def handler(i):
+        start = time.perf_counter()
+        dispatcher.send(channel, content=f"reply {i}", cleanup_after=args.cleanup)
+        dispatcher.edit(status, content=f"processed {i}")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(i) for i in range(args.handlers)))
+    await dispatcher.drain(timeout=None)
+    report("dispatcher", latencies, time.perf_counter() - start, channel)
+    print(f"{'':<12} {dispatcher.coalesced} edits coalesced, {dispatcher.deleted} deletes in "
+          f"{dispatcher.delete_calls} calls, average wait {dispatcher.wait_time.sum / dispatcher.wait_time.count * 1000:.0f}ms")
+
+
+async def main(args):
+    print(f"{args.handlers} handlers each sending a reply, editing a shared status message and "
+          f"cleaning the reply up after {args.cleanup}s; limit {args.rate} per {args.per}s")
+    await run_direct(args)
+    await run_dispatcher(args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--handlers", type=int, default=30)
+    parser.add_argument("--rate", type=int, default=5)
+    parser.add_argument("--per", type=float, default=1.0)
+    parser.add_argument("--cleanup", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,61 @@
+"""Votes per second and message edits for a poll with thousands of voters
+
+Simulates `--voters` users clicking over `--seconds` seconds (some change their
+mind) and counts how many times the results message would be edited.
+
+Run from the repository root: python benchmarks/bench_polls.py [--voters N] [--seconds S]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polls import PollManager, PollStore, poll_embed  # noqa: E402
+
+
+async def main(args):
+    edits = 0
+
+    async def edit(poll, final):
+        nonlocal edits
+        edits += 1
+        poll_embed(poll)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PollStore(os.path.join(tmp, "bench.db"))
+        manager = PollManager(store, edit, debounce=args.debounce)
+        poll = manager.create(1, 1, 1, "Best option?", [f"Option {i}" for i in range(5)])
+        manager.attach(poll, 1)
+
+        votes = args.voters + args.voters // 5
+        delay = args.seconds / votes
+        vote_time = 0.0
+        start = time.perf_counter()
+        for i in range(votes):
+            user_id = i if i < args.voters else random.randrange(args.voters)
+            t = time.perf_counter()
+            manager.vote(poll.id, user_id, random.randrange(5))
+            vote_time += time.perf_counter() - t
+            await asyncio.sleep(delay)
+        closed = await manager.close_poll(poll.id)
+        elapsed = time.perf_counter() - start
+
+        print(f"{votes} clicks from {args.voters} voters over {elapsed:.1f}s")
+        print(f"vote handling: {vote_time / votes * 1e6:.1f} µs per click")
+        print(f"final tally: {closed.tallies} ({closed.total} votes)")
+        print(f"message edits: {edits} (reaction polls: 0 live results; per-vote edits: {votes})")
+        assert sum(closed.tallies) == closed.total == len(store.votes(poll.id))
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--voters", type=int, default=5000)
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--debounce", type=float, default=3.0)
+    asyncio.run(main(parser.parse_args()))
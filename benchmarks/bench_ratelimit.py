@@ -0,0 +1,82 @@
+"""Cost of the command limiter's check and memory of its buckets
+
+Runs CommandLimiter.check with the bot's default limits plus a per-command
+limit, for invocations spread over a growing number of users, channels and
+guilds, and reports the time per check, the traced memory per bucket and how
+many buckets were evicted to stay under --max-keys. A single user hammering one
+command shows the cost of a rejection, which happens before any embed or REST
+work.
+
+Run from the repository root: python benchmarks/bench_ratelimit.py [--users 1000,100000,1000000] [--max-keys N]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ratelimit import CommandLimiter, RateLimited  # noqa: E402
+
+DEFAULTS = "user=10/10,channel=30/10,guild=60/10"
+COMMAND = SimpleNamespace(qualified_name="roll", extras={"limits": "user=5/10"})
+
+
+def contexts(users):
+    # Five users per channel and fifty per guild, all within the default limits
+    return [
+        SimpleNamespace(command=COMMAND, author=SimpleNamespace(id=10 ** 17 + i),
+                        channel=SimpleNamespace(id=2 * 10 ** 17 + i // 5), guild=SimpleNamespace(id=3 * 10 ** 17 + i // 50))
+        for i in range(users)
+    ]
+
+
+def run_checks(limiter, ctxs):
+    rejected = 0
+    started = time.perf_counter()
+    for ctx in ctxs:
+        try:
+            limiter.check(ctx)
+        except RateLimited:
+            rejected += 1
+    return time.perf_counter() - started, rejected
+
+
+def main(args):
+    print(f"{'users':>9} {'per check':>10} {'rejected':>9} {'buckets':>9} {'memory':>10} {'per bucket':>11} {'evicted':>9}")
+    for users in args.users:
+        ctxs = contexts(users)
+        limiter = CommandLimiter(DEFAULTS, max_keys=args.max_keys)
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        elapsed, rejected = run_checks(limiter, ctxs)
+        memory = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        # Timed again without tracemalloc, which slows allocation down
+        limiter = CommandLimiter(DEFAULTS, max_keys=args.max_keys)
+        elapsed, rejected = run_checks(limiter, ctxs)
+        buckets = len(limiter.buckets)
+        print(f"{users:>9} {elapsed / users * 1e6:8.2f}us {rejected:>9} {buckets:>9} {memory / 2 ** 20:7.1f}MiB "
+              f"{memory / max(buckets, 1):9.0f}B {limiter.buckets.evicted:>9}")
+
+    limiter = CommandLimiter(DEFAULTS, max_keys=args.max_keys)
+    ctxs = contexts(1) * args.spam
+    elapsed, rejected = run_checks(limiter, ctxs)
+    print(f"\none user spamming {args.spam} times: {elapsed / args.spam * 1e6:.2f}us per check, {rejected} rejected, "
+          f"{sum(limiter.rejected.values())} counted in metrics")
+
+
+def sizes(value):
+    return [int(size) for size in value.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=sizes, default=[1000, 100000, 1000000])
+    parser.add_argument("--max-keys", type=int, default=100000)
+    parser.add_argument("--spam", type=int, default=100000)
+    main(parser.parse_args())
@@ -0,0 +1,56 @@
+"""Schedule and fire 100k reminders through ReminderScheduler
+
+Run from the repository root: python benchmarks/bench_reminders.py [count]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reminders import ReminderScheduler, ReminderStore  # noqa: E402
+
+
+async def main(count):
+    delivered = 0
+
+    async def deliver(row):
+        nonlocal delivered
+        delivered += 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        scheduler = ReminderScheduler(ReminderStore(path), deliver, window=60, batch_size=500)
+        scheduler.load_window()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        # Spread reminders over a day so only the first window lands on the heap
+        for i in range(count):
+            scheduler.schedule(i % 5000, 1, (i * 86400) / count, f"reminder {i}")
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"scheduled {count} reminders in {elapsed:.2f}s ({count / elapsed:,.0f}/s)")
+        print(f"in-memory heap entries: {len(scheduler._heap)}, traced memory {current / 1024:.0f} KiB (peak {peak / 1024:.0f} KiB)")
+
+        start = time.perf_counter()
+        scheduler.store.db.close()
+        scheduler = ReminderScheduler(ReminderStore(path), deliver, window=86400, batch_size=500)
+        scheduler.load_window()
+        print(f"reloaded a full-day window of {len(scheduler._heap)} reminders in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        far_future = time.time() + 2 * 86400
+        while scheduler._heap:
+            await scheduler.fire_due(far_future)
+        elapsed = time.perf_counter() - start
+        print(f"fired {delivered} reminders in {elapsed:.2f}s ({delivered / elapsed:,.0f}/s)")
+        scheduler.store.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,201 @@
+"""Compare the old delete-everything restore with the diff-based planner on a fake guild
+
+Every fake REST call takes `latency` seconds and calls on the same route bucket are
+serialised, roughly like Discord's per-route limits. The old path also pays its fixed
+0.5s sleep per created object. Both are scaled by --scale to keep the run short.
+
+Run from the repository root: python benchmarks/bench_restore.py [--roles N] [--channels N] [--changed N]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import defaultdict
+
+import discord
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from restore import RestoreExecutor, plan_restore  # noqa: E402
+
+
+class FakeREST:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.buckets = defaultdict(asyncio.Lock)
+
+    async def call(self, bucket):
+        async with self.buckets[bucket]:
+            self.calls += 1
+            await asyncio.sleep(self.latency)
+
+
+class FakeRole:
+    def __init__(self, guild, name, color, permissions, position):
+        self.guild = guild
+        self.id = position
+        self.name = name
+        self.color = color
+        self.permissions = permissions
+        self.position = position
+        self.managed = False
+
+    def is_default(self):
+        return self.position == 0
+
+    def __lt__(self, other):
+        return self.position < other.position
+
+    async def edit(self, color=None, permissions=None):
+        await self.guild.rest.call(("PATCH /guilds/roles", self.guild.id))
+        self.color, self.permissions = color, permissions
+
+    async def delete(self):
+        await self.guild.rest.call(("DELETE /guilds/roles", self.guild.id))
+        self.guild.roles.remove(self)
+
+
+class FakeChannel:
+    def __init__(self, guild, name, type, category=None):
+        guild.next_id += 1
+        self.guild = guild
+        self.id = guild.next_id
+        self.name = name
+        self.type = type
+        self.category = category
+
+    async def edit(self, category=None):
+        await self.guild.rest.call(("PATCH /channels", self.id))
+        self.category = category
+
+    async def delete(self):
+        await self.guild.rest.call(("DELETE /channels", self.id))
+        self.guild.channels.remove(self)
+
+
+class FakeGuild:
+    def __init__(self, rest, roles, channels_per_category, categories):
+        self.id = 1
+        self.next_id = 1000
+        self.rest = rest
+        self.name = "Fake Guild"
+        self.description = None
+        self.roles = [FakeRole(self, "@everyone", discord.Color.default(), discord.Permissions.none(), 0)]
+        for i in range(roles):
+            self.roles.append(FakeRole(self, f"role-{i}", discord.Color(i), discord.Permissions(i), i + 1))
+        self.me = type("Me", (), {"top_role": FakeRole(self, "bot", discord.Color.default(), discord.Permissions.none(), 10 ** 6)})()
+        self.channels = []
+        for c in range(categories):
+            category = FakeChannel(self, f"category-{c}", discord.ChannelType.category)
+            self.channels.append(category)
+            for i in range(channels_per_category):
+                self.channels.append(FakeChannel(self, f"chat-{c}-{i}", discord.ChannelType.text, category))
+
+    @property
+    def categories(self):
+        return [c for c in self.channels if str(c.type) == "category"]
+
+    def backup(self):
+        return {
+            "name": self.name,
+            "description": self.description,
+            "roles": [{"name": r.name, "color": str(r.color), "permissions": r.permissions.value}
+                      for r in self.roles if not r.is_default()],
+            "channels": [{"name": c.name, "type": str(c.type), "category": c.category.name if c.category else None}
+                         for c in self.channels]
+        }
+
+    async def create_role(self, name, color, permissions):
+        await self.rest.call(("POST /guilds/roles", self.id))
+        role = FakeRole(self, name, color, permissions, len(self.roles))
+        self.roles.append(role)
+        return role
+
+    async def _create_channel(self, name, type, category=None):
+        await self.rest.call(("POST /guilds/channels", self.id))
+        channel = FakeChannel(self, name, type, category)
+        self.channels.append(channel)
+        return channel
+
+    async def create_category(self, name):
+        return await self._create_channel(name, discord.ChannelType.category)
+
+    async def create_text_channel(self, name, category=None):
+        return await self._create_channel(name, discord.ChannelType.text, category)
+
+    async def create_voice_channel(self, name, category=None):
+        return await self._create_channel(name, discord.ChannelType.voice, category)
+
+    async def edit(self, **fields):
+        await self.rest.call(("PATCH /guilds", self.id))
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+
+async def old_restore(backup_data, guild, sleep):
+    """The sequential delete-and-recreate loop restorebackup used before the planner"""
+    for channel in list(guild.channels):
+        await channel.delete()
+    for role in list(guild.roles):
+        if not role.is_default() and role < guild.me.top_role:
+            await role.delete()
+    for role_data in reversed(backup_data["roles"]):
+        await guild.create_role(
+            name=role_data["name"],
+            color=discord.Color(int(role_data["color"].replace("#", ""), 16)),
+            permissions=discord.Permissions(int(role_data["permissions"]))
+        )
+        await asyncio.sleep(sleep)
+    for channel_data in backup_data["channels"]:
+        category = None
+        if channel_data["category"]:
+            category = discord.utils.get(guild.categories, name=channel_data["category"])
+            if not category:
+                category = await guild.create_category(name=channel_data["category"])
+        if channel_data["type"] == "text":
+            await guild.create_text_channel(name=channel_data["name"], category=category)
+        elif channel_data["type"] == "voice":
+            await guild.create_voice_channel(name=channel_data["name"], category=category)
+        await asyncio.sleep(sleep)
+    await guild.edit(name=backup_data["name"])
+
+
+def drifted_guild(args, rest):
+    """A guild whose backup differs from the live state in `changed` roles and channels"""
+    guild = FakeGuild(rest, args.roles, args.channels // args.categories, args.categories)
+    backup = guild.backup()
+    for role in guild.roles[1:args.changed + 1]:
+        role.permissions = discord.Permissions(role.permissions.value + 1)
+    text_channels = [c for c in guild.channels if str(c.type) == "text"]
+    for channel in text_channels[:args.changed]:
+        guild.channels.remove(channel)
+    return guild, backup
+
+
+async def main(args):
+    latency = 0.05 * args.scale
+    for label, run in (
+        ("old sequential", lambda backup, guild: old_restore(backup, guild, 0.5 * args.scale)),
+        ("diff planner", lambda backup, guild: RestoreExecutor(args.concurrency).run(plan_restore(backup, guild))),
+    ):
+        rest = FakeREST(latency)
+        guild, backup = drifted_guild(args, rest)
+        start = time.perf_counter()
+        await run(backup, guild)
+        elapsed = time.perf_counter() - start
+        assert sorted(r.name for r in guild.roles) == sorted(["@everyone"] + [r["name"] for r in backup["roles"]])
+        assert sorted(c.name for c in guild.channels) == sorted(c["name"] for c in backup["channels"])
+        print(f"{label:>15}: {rest.calls:5d} REST calls, {elapsed:6.2f}s (x{1 / args.scale:.0f} = {elapsed / args.scale:7.1f}s real)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--roles", type=int, default=100)
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--changed", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=0.02)
+    asyncio.run(main(parser.parse_args()))
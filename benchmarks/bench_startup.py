@@ -0,0 +1,82 @@
+"""Cold start of main.py against the local fake Discord, from process spawn to READY
+
+Each run starts `python main.py` with a fresh database and reads its output until
+the "Ready" line, so the figures include interpreter start, imports, setup_hook
+and the gateway handshake. discord.py waits `guild_ready_timeout` (2s) after the
+last GUILD_CREATE before READY; that wait is the same for every run.
+Extra environment for the bot can be passed as NAME=value, e.g. to pick extensions.
+
+Run from the repository root: python benchmarks/bench_startup.py [--runs N] [NAME=value ...]
+"""
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_gateway import FakeDiscord  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = re.compile(r"Startup phases: (.*)")
+
+
+async def cold_start(fake, env, web_port):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, **env, DISCORD_BOT_TOKEN="fake", BOT_DB_PATH=os.path.join(tmp, "bench.db"),
+                   WEB_PORT=str(web_port), DISCORD_API_BASE=f"{fake.url}/api/v10",
+                   DISCORD_GATEWAY_URL=f"ws://{fake.host}:{fake.port}/gateway", PYTHONUNBUFFERED="1")
+        start = time.perf_counter()
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "main.py", cwd=ROOT, env=env,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+        result = {}
+        try:
+            async for line in proc.stdout:
+                line = line.decode().strip()
+                phases = PHASES.match(line)
+                if phases:
+                    result["setup"] = time.perf_counter() - start
+                    result["phases"] = phases.group(1)
+                elif line.startswith("Ready "):
+                    result["ready"] = time.perf_counter() - start
+                    break
+                elif "Traceback" in line:
+                    raise RuntimeError(f"main.py failed:\n{line}\n{(await proc.stdout.read()).decode()}")
+        finally:
+            proc.terminate()
+            await proc.wait()
+        return result
+
+
+async def main(args):
+    env = dict(item.split("=", 1) for item in args.env)
+    fake = FakeDiscord(guilds=args.guilds, members=args.members, port=args.port)
+    await fake.start()
+    try:
+        results = [await cold_start(fake, env, args.web_port) for _ in range(args.runs)]
+    finally:
+        await fake.stop()
+    setup = [r["setup"] for r in results]
+    ready = [r["ready"] for r in results]
+    print(f"{args.runs} cold starts, {args.guilds} guilds x {args.members} members"
+          + (f", {' '.join(args.env)}" if args.env else ""))
+    print(f"spawn -> setup_hook done: median {statistics.median(setup):.3f}s (min {min(setup):.3f}s)")
+    print(f"spawn -> READY:           median {statistics.median(ready):.3f}s (min {min(ready):.3f}s)")
+    print(f"last run: {results[-1]['phases']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8793)
+    parser.add_argument("--web-port", type=int, default=5061)
+    parser.add_argument("env", nargs="*", help="NAME=value passed to the bot")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,57 @@
+"""Microbenchmark of "did you mean" lookups: difflib over a rebuilt name list vs CommandSuggester
+
+Run from the repository root: python benchmarks/bench_suggest.py
+"""
+import difflib
+import os
+import random
+import string
+import sys
+import timeit
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from suggest import CommandSuggester  # noqa: E402
+
+NAMES = (
+    "ping serverinfo userinfo 8ball coinflip roll clear kick ban timeout warn unwarn warnings unmute commands "
+    "avatar remind reminders cancelreminder poll showicon random joke slowmode membercount serveremojis say "
+    "weather roles channelinfo serverstats botstats countercheck giveaway endgiveaway reroll embed servericon "
+    "nickname invites remindme report urban serverbackup autobackup backups serveremotes channelstats "
+    "channelbackfill roleinfo quickpoll firstmessage restorebackup help"
+).split()
+
+
+def main():
+    bot = SimpleNamespace(commands=[SimpleNamespace(name=name, aliases=[], hidden=False) for name in NAMES])
+    suggester = CommandSuggester(bot)
+    random.seed(0)
+    typos = []
+    for name in NAMES:
+        i = random.randrange(len(name))
+        typos.append(name[:i] + random.choice(string.ascii_lowercase) + name[i + 1:])
+    junk = ["".join(random.choices(string.ascii_letters + string.digits, k=random.randint(4, 20))) for _ in range(50)]
+
+    def old(words):
+        for word in words:
+            difflib.get_close_matches(word, [cmd.name for cmd in bot.commands], n=3)
+
+    def cold(words):
+        for word in words:
+            suggester._cache.clear()
+            suggester.suggest(word)
+
+    def warm(words):
+        for word in words:
+            suggester.suggest(word)
+
+    for label, words in (("typos", typos), ("junk", junk)):
+        number = 20
+        for name, func in (("difflib", old), ("index (uncached)", cold), ("index (cached)", warm)):
+            seconds = min(timeit.repeat(lambda: func(words), number=number, repeat=3))
+            print(f"{label:>6} {name:>20}: {seconds / (number * len(words)) * 1e6:8.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Weather cache hit ratio and latency against a local stand-in for the Open-Meteo API
+
+The stand-in answers geocoding and forecast requests after `--latency` seconds and
+counts the upstream calls. A Zipf-distributed load of lookups reports the hit
+ratio, upstream calls and command-side latency. The cache's behaviour is tested
+in tests/test_weather.py.
+
+Run from the repository root: python benchmarks/bench_weather.py [--lookups N] [--places N]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from httpclient import HttpClient  # noqa: E402
+from weather import OpenMeteoBackend, WeatherService  # noqa: E402
+
+
+class StandIn:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.fail = False
+        self.app = web.Application()
+        self.app.router.add_get("/v1/search", self.search)
+        self.app.router.add_get("/v1/forecast", self.forecast)
+
+    async def _enter(self):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.latency)
+        self.active -= 1
+
+    async def search(self, request):
+        await self._enter()
+        if self.fail:
+            return web.json_response({"reason": "down"}, status=503)
+        name = request.query["name"]
+        if name.startswith("nowhere"):
+            return web.json_response({"generationtime_ms": 0.1})
+        lat = sum(map(ord, name)) % 90
+        return web.json_response({"results": [{"name": name.title(), "latitude": lat, "longitude": lat, "country": "Testland"}]})
+
+    async def forecast(self, request):
+        await self._enter()
+        return web.json_response({"current": {
+            "temperature_2m": 21.5, "apparent_temperature": 20.9, "relative_humidity_2m": 40,
+            "wind_speed_10m": 12.0, "weather_code": 2
+        }})
+
+
+def service(http_client, base, **kwargs):
+    return WeatherService(OpenMeteoBackend(http_client, f"{base}/v1/search", f"{base}/v1/forecast"), **kwargs)
+
+
+async def load(http_client, base, stand_in, args):
+    weather = service(http_client, base, ttl=args.ttl)
+    places = [f"place {i}" for i in range(args.places)]
+    weights = [1 / (rank + 1) for rank in range(args.places)]
+    stand_in.calls = 0
+    latencies = []
+
+    async def lookup(name):
+        start = time.perf_counter()
+        await weather.get(name)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(args.lookups // args.burst):
+        await asyncio.gather(*(lookup(name) for name in random.choices(places, weights, k=args.burst)))
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    upstream = weather.upstream_latency
+    print(f"\n{args.lookups} lookups over {args.places} places (Zipf) in bursts of {args.burst}, {elapsed:.2f}s")
+    print(f"hit ratio {weather.hit_ratio:.1%} (hits {weather.hits}, stale {weather.stale_hits}, "
+          f"misses {weather.misses}, coalesced {weather.coalesced})")
+    print(f"upstream: {stand_in.calls} HTTP calls, {upstream.count} lookups, mean {upstream.sum / upstream.count * 1000:.0f}ms")
+    print(f"command-side latency p50 {latencies[len(latencies) // 2] * 1000:.2f}ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f}ms")
+
+
+async def main(args):
+    stand_in = StandIn(args.latency)
+    runner = web.AppRunner(stand_in.app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    base = f"http://127.0.0.1:{args.port}"
+    http_client = HttpClient(allow_private=True)
+    try:
+        await load(http_client, base, stand_in, args)
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--places", type=int, default=300)
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--ttl", type=float, default=600)
+    parser.add_argument("--port", type=int, default=8790)
+    asyncio.run(main(parser.parse_args()))
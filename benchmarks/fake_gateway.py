@@ -0,0 +1,310 @@
+"""Local stand-in for the Discord REST API and gateway
+
+Serves just enough of both for discord.py to log in, identify every shard, receive
+READY and GUILD_CREATE for synthetic guilds, heartbeat, request member chunks and
+sync its command tree.
+Guilds are spread over shards with Discord's (guild_id >> 22) % shard_count rule.
+
+    python benchmarks/fake_gateway.py --port 8765 --guilds 200 --members 50
+
+Then point the bot, or a whole cluster, at it:
+
+    DISCORD_BOT_TOKEN=fake DISCORD_API_BASE=http://127.0.0.1:8765/api/v10 \\
+    DISCORD_GATEWAY_URL=ws://127.0.0.1:8765/gateway python cluster.py --clusters 2 --shards 4
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import time
+
+from aiohttp import WSMsgType, web
+
+log = logging.getLogger(__name__)
+
+APPLICATION_ID = 100000000000000001
+BOT_USER = {
+    "id": str(APPLICATION_ID), "username": "FakeBot", "discriminator": "0",
+    "global_name": None, "avatar": None, "bot": True
+}
+APPLICATION = {
+    "id": str(APPLICATION_ID), "name": "FakeBot", "icon": None, "description": "", "bot_public": True,
+    "bot_require_code_grant": False, "verify_key": "0" * 64, "flags": 0, "owner": BOT_USER
+}
+JOINED_AT = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc).isoformat()
+# Like Discord, GUILD_CREATE for bigger guilds only carries the bot's own member
+LARGE_THRESHOLD = 250
+CHUNK_SIZE = 1000
+
+
+def guild_id(index):
+    # Timestamp bits chosen so consecutive guilds land on consecutive shards
+    return ((index + 1) << 22) | index
+
+
+def user_payload(user_id, bot=False):
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0",
+            "global_name": None, "avatar": None, "bot": bot}
+
+
+def member_payload(user_id, bot=False):
+    return {"user": user_payload(user_id, bot), "roles": [], "joined_at": JOINED_AT,
+            "deaf": False, "mute": False, "flags": 0}
+
+
+def message_payload(message_id, channel_id, gid, user_id, content="hello"):
+    return {
+        "id": str(message_id), "channel_id": str(channel_id), "guild_id": str(gid), "type": 0,
+        "author": user_payload(user_id), "content": content, "timestamp": JOINED_AT,
+        "member": {"roles": [], "joined_at": JOINED_AT, "deaf": False, "mute": False, "flags": 0},
+        "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [],
+        "mention_roles": [], "attachments": [], "embeds": [], "pinned": False
+    }
+
+
+def guild_index(gid):
+    return gid & ((1 << 22) - 1)
+
+
+def member_id(index, i):
+    return 10 ** 15 + index * 1_000_000 + i
+
+
+def member_list(index, members):
+    return [member_payload(APPLICATION_ID, bot=True)] + [
+        member_payload(member_id(index, i), bot=i % 10 == 0) for i in range(members)
+    ]
+
+
+def guild_payload(index, members, inline=True):
+    """GUILD_CREATE data; without `inline` a large guild only lists the bot, as Discord does"""
+    gid = guild_id(index)
+    large = members + 1 > LARGE_THRESHOLD
+    return {
+        "id": str(gid), "name": f"Fake Guild {index}", "icon": None, "owner_id": str(10 ** 15),
+        "member_count": members + 1, "large": large, "unavailable": False,
+        "roles": [{"id": str(gid), "name": "@everyone", "color": 0, "hoist": False, "position": 0,
+                   "permissions": "104324673", "managed": False, "mentionable": False, "flags": 0}],
+        "channels": [{"id": str(gid + 1), "type": 0, "name": "general", "position": 0,
+                      "permission_overwrites": [], "nsfw": False, "parent_id": None}],
+        "members": member_list(index, members if inline or not large else 0), "emojis": [], "stickers": [], "features": [], "threads": [],
+        "voice_states": [], "presences": [], "stage_instances": [], "guild_scheduled_events": [],
+        "joined_at": JOINED_AT, "premium_tier": 0, "verification_level": 0,
+        "default_message_notifications": 0, "explicit_content_filter": 0, "mfa_level": 0,
+        "nsfw_level": 0, "preferred_locale": "en-US", "system_channel_flags": 0
+    }
+
+
+def json_response(data, status=200):
+    # discord.py only decodes bodies whose content type is exactly application/json,
+    # while aiohttp's json_response appends a charset
+    return web.Response(body=json.dumps(data).encode(), status=status, content_type="application/json")
+
+
+class FakeDiscord:
+    """Fake REST + gateway server
+
+    `latency` delays every REST response, and each route (per guild) allows
+    `rate_limit` requests per `rate_window` seconds, answered with Discord's
+    X-RateLimit headers and 429s so the client's bucket handling is exercised.
+    """
+
+    def __init__(self, guilds=10, members=10, shards=1, host="127.0.0.1", port=8765,
+                 latency=0.0, rate_limit=50, rate_window=1.0):
+        self.guild_count = guilds
+        self.members = members
+        self.shards = shards
+        self.host = host
+        self.port = port
+        self.sockets = {}
+        self.identified = asyncio.Event()
+        self.requests = 0
+        self.rate_limited = 0
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.buckets = {}
+        self.actions = []
+        self.app = web.Application(middlewares=[self.rest_middleware])
+        self.app.router.add_get("/api/v10/users/@me", self.me)
+        self.app.router.add_get("/api/v10/oauth2/applications/@me", self.application)
+        self.app.router.add_get("/api/v10/gateway", self.gateway)
+        self.app.router.add_get("/api/v10/gateway/bot", self.gateway)
+        self.app.router.add_put("/api/v10/applications/{app}/commands", self.empty_list)
+        self.app.router.add_get("/api/v10/guilds/{guild}/invites", self.empty_list)
+        self.app.router.add_put("/api/v10/guilds/{guild}/bans/{user}", self.moderate)
+        self.app.router.add_delete("/api/v10/guilds/{guild}/members/{user}", self.moderate)
+        self.app.router.add_patch("/api/v10/guilds/{guild}/members/{user}", self.moderate)
+        self.app.router.add_post("/api/v10/guilds/{guild}/bulk-ban", self.bulk_ban)
+        self.app.router.add_get("/gateway", self.websocket)
+        self.app.router.add_route("*", "/api/v10/{tail:.*}", self.not_found)
+        self._runner = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self):
+        for ws, _ in list(self.sockets.values()):
+            await ws.close()
+        await self._runner.cleanup()
+
+    @web.middleware
+    async def rest_middleware(self, request, handler):
+        if not request.path.startswith("/api/"):
+            return await handler(request)
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        resource = request.match_info.route.resource
+        key = (request.method, resource.canonical if resource else request.path, request.match_info.get("guild"))
+        now = time.monotonic()
+        window_start, count = self.buckets.get(key, (now, 0))
+        if now - window_start >= self.rate_window:
+            window_start, count = now, 0
+        reset_after = window_start + self.rate_window - now
+        headers = {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": f"{abs(hash(key[:2])):x}"
+        }
+        if count >= self.rate_limit:
+            self.rate_limited += 1
+            headers["X-RateLimit-Remaining"] = "0"
+            headers["X-RateLimit-Scope"] = "user"
+            body = {"message": "You are being rate limited.", "retry_after": reset_after, "global": False}
+            response = json_response(body, status=429)
+            response.headers.update(headers)
+            return response
+        self.buckets[key] = (window_start, count + 1)
+        headers["X-RateLimit-Remaining"] = str(self.rate_limit - count - 1)
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    async def me(self, request):
+        return json_response(BOT_USER)
+
+    async def application(self, request):
+        return json_response(APPLICATION)
+
+    async def gateway(self, request):
+        return json_response({
+            "url": f"ws://{self.host}:{self.port}/gateway", "shards": self.shards,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 16}
+        })
+
+    async def empty_list(self, request):
+        return json_response([])
+
+    async def not_found(self, request):
+        return json_response({"message": "Unknown route", "code": 0}, status=404)
+
+    async def moderate(self, request):
+        self.actions.append((request.method, int(request.match_info["guild"]), int(request.match_info["user"])))
+        if request.method == "PATCH":
+            return json_response(member_payload(int(request.match_info["user"])))
+        return web.Response(status=204)
+
+    async def bulk_ban(self, request):
+        user_ids = (await request.json())["user_ids"]
+        guild = int(request.match_info["guild"])
+        self.actions.extend(("PUT", guild, int(user_id)) for user_id in user_ids)
+        return json_response({"banned_users": user_ids, "failed_users": []})
+
+    def guilds_for(self, shard_id, shard_count):
+        return [i for i in range(self.guild_count) if (guild_id(i) >> 22) % shard_count == shard_id]
+
+    async def send(self, ws, op, data, event=None, state=None):
+        payload = {"op": op, "d": data, "s": None, "t": event}
+        if event is not None:
+            state["seq"] += 1
+            payload["s"] = state["seq"]
+        await ws.send_str(json.dumps(payload))
+
+    async def dispatch(self, shard_id, event, data):
+        """Push one dispatch event to a connected shard"""
+        ws, state = self.sockets[shard_id]
+        await self.send(ws, 0, data, event, state)
+
+    async def member_chunks(self, ws, state, data):
+        """Answer REQUEST_GUILD_MEMBERS for a whole guild, a name prefix or a list of IDs"""
+        gid = int(data["guild_id"])
+        members = member_list(guild_index(gid), self.members)
+        not_found = []
+        if data.get("user_ids"):
+            wanted = {int(user_id) for user_id in data["user_ids"]}
+            members = [member for member in members if int(member["user"]["id"]) in wanted]
+            not_found = sorted(wanted - {int(member["user"]["id"]) for member in members})
+        elif data.get("query"):
+            members = [member for member in members if member["user"]["username"].startswith(data["query"])]
+        if data.get("limit"):
+            members = members[:data["limit"]]
+        chunks = [members[i:i + CHUNK_SIZE] for i in range(0, len(members), CHUNK_SIZE)] or [[]]
+        for index, chunk in enumerate(chunks):
+            payload = {"guild_id": str(gid), "members": chunk, "chunk_index": index,
+                       "chunk_count": len(chunks), "nonce": data.get("nonce")}
+            if index == 0 and not_found:
+                payload["not_found"] = [str(user_id) for user_id in not_found]
+            await self.send(ws, 0, payload, "GUILD_MEMBERS_CHUNK", state)
+
+    async def websocket(self, request):
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        state = {"seq": 0}
+        shard_id = None
+        await self.send(ws, 10, {"heartbeat_interval": 41250})
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(msg.data)
+            op, data = payload["op"], payload.get("d")
+            if op == 1:
+                await self.send(ws, 11, None)
+            elif op == 6:
+                await self.send(ws, 0, None, "RESUMED", state)
+            elif op == 2:
+                shard_id, shard_count = data.get("shard") or [0, 1]
+                self.sockets[shard_id] = (ws, state)
+                guilds = self.guilds_for(shard_id, shard_count)
+                await self.send(ws, 0, {
+                    "v": 10, "user": BOT_USER, "session_id": f"session-{shard_id}",
+                    "resume_gateway_url": f"ws://{self.host}:{self.port}/gateway",
+                    "guilds": [{"id": str(guild_id(i)), "unavailable": True} for i in guilds],
+                    "application": {"id": str(APPLICATION_ID), "flags": 0},
+                    "shard": [shard_id, shard_count]
+                }, "READY", state)
+                for i in guilds:
+                    await self.send(ws, 0, guild_payload(i, self.members, inline=False), "GUILD_CREATE", state)
+                self.identified.set()
+            elif op == 8:
+                await self.member_chunks(ws, state, data)
+        if shard_id is not None and self.sockets.get(shard_id, (None,))[0] is ws:
+            del self.sockets[shard_id]
+        return ws
+
+
+async def main(args):
+    fake = FakeDiscord(args.guilds, args.members, args.shards, args.host, args.port, args.latency, args.rate_limit)
+    await fake.start()
+    print(f"Fake Discord listening on {fake.url} (API base {fake.url}/api/v10, gateway ws://{args.host}:{args.port}/gateway)")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--members", type=int, default=10)
+    parser.add_argument("--shards", type=int, default=1, help="shard count reported by /gateway/bot")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every REST response")
+    parser.add_argument("--rate-limit", type=int, default=50, help="requests per route and guild per second")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,144 @@
+import discord
+
+CATEGORIES = {
+    "moderation": "🛡️ Moderation",
+    "fun": "🎮 Fun",
+    "utility": "🔧 Utility",
+    "statistics": "📊 Statistics",
+    "server": "🌍 Server",
+    "backup": "💾 Backup",
+    "other": "📦 Other"
+}
+PAGE_SIZE = 3000
+
+
+def _field_chunks(lines, limit=1024):
+    chunk, size = [], 0
+    for line in lines:
+        if chunk and size + len(line) + 1 > limit:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(line)
+        size += len(line) + 1
+    if chunk:
+        yield chunk
+
+
+class CommandCatalog:
+    """Help embeds built once from command metadata
+
+    Commands declare their category through `extras={"category": ...}`. The
+    list pages and per-command embeds are rebuilt lazily, only after a command
+    has been added or removed.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._pages = None
+        self._details = None
+
+    def invalidate(self):
+        self._pages = None
+        self._details = None
+
+    def _build(self):
+        prefix = self.bot.command_prefix
+        grouped = {category: [] for category in CATEGORIES}
+        details = {}
+        visible = sorted((cmd for cmd in self.bot.commands if not cmd.hidden), key=lambda cmd: cmd.name)
+        for cmd in visible:
+            category = cmd.extras.get("category", "other")
+            grouped.setdefault(category, []).append(f"`{prefix}{cmd.name}` - {cmd.description or 'No description'}")
+
+            embed = discord.Embed(
+                title=f"📚 Command Help: {cmd.name}",
+                description=cmd.description or "No description available",
+                color=discord.Color.blue()
+            )
+            embed.add_field(
+                name="Usage",
+                value=f"`{prefix}{cmd.name} {cmd.signature}`" if cmd.signature else f"`{prefix}{cmd.name}`"
+            )
+            embed.add_field(name="Category", value=CATEGORIES.get(category, category.title()))
+            if cmd.aliases:
+                embed.add_field(name="Aliases", value=", ".join(f"`{alias}`" for alias in cmd.aliases))
+            embed.set_footer(text=f"Tip: All commands work with both {prefix} prefix and /")
+            details[cmd.name] = embed
+            for alias in cmd.aliases:
+                details[alias] = embed
+
+        # Pack category fields into pages that stay well inside the embed size limit
+        pages, fields, size = [], [], 0
+        for category, lines in grouped.items():
+            for i, chunk in enumerate(_field_chunks(lines)):
+                name = CATEGORIES.get(category, category.title()) + (" (cont.)" if i else "")
+                value = "\n".join(chunk)
+                if fields and size + len(value) > PAGE_SIZE:
+                    pages.append(fields)
+                    fields, size = [], 0
+                fields.append((name, value))
+                size += len(value)
+        if fields or not pages:
+            pages.append(fields)
+
+        self._pages = []
+        for number, page_fields in enumerate(pages, 1):
+            embed = discord.Embed(
+                title="📚 Command List",
+                description=f"Use `{prefix}commands <command>` for detailed information about a command",
+                color=discord.Color.blue()
+            )
+            for name, value in page_fields:
+                embed.add_field(name=name, value=value, inline=False)
+            embed.set_footer(
+                text=f"Page {number}/{len(pages)} | Total Commands: {len(visible)} | All commands work with both {prefix} and /"
+            )
+            self._pages.append(embed)
+        self._details = details
+
+    @property
+    def pages(self):
+        if self._pages is None:
+            self._build()
+        return self._pages
+
+    def page(self, number):
+        pages = self.pages
+        return pages[max(1, min(number, len(pages))) - 1]
+
+    def detail(self, name):
+        if self._details is None:
+            self._build()
+        return self._details.get(name.lower())
+
+
+class CatalogPaginator(discord.ui.View):
+    """Previous/next buttons over the cached command list pages"""
+
+    def __init__(self, catalog, author_id, page=1, timeout=120):
+        super().__init__(timeout=timeout)
+        self.catalog = catalog
+        self.author_id = author_id
+        self.index = max(1, min(page, len(catalog.pages))) - 1
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.previous.disabled = self.index == 0
+        self.next.disabled = self.index >= len(self.catalog.pages) - 1
+
+    async def interaction_check(self, interaction):
+        return interaction.user.id == self.author_id
+
+    async def _show(self, interaction):
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.catalog.pages[self.index], view=self)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction, button):
+        self.index = max(0, self.index - 1)
+        await self._show(interaction)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction, button):
+        self.index = min(len(self.catalog.pages) - 1, self.index + 1)
+        await self._show(interaction)
@@ -0,0 +1,134 @@
+"""Cluster launcher: runs main.py as several processes, each owning a range of shards
+
+    python cluster.py --clusters 4 --shards 16
+
+Each worker gets SHARD_COUNT, SHARD_IDS, CLUSTER_ID and its own WEB_PORT, plus
+CLUSTER_PEERS listing every worker's web server so commands such as botstats can
+aggregate numbers across processes.
+"""
+import argparse
+import asyncio
+import logging
+import math
+import os
+import signal
+import sys
+import time
+
+import aiohttp
+
+log = logging.getLogger(__name__)
+
+
+def parse_shard_ids(spec):
+    """Parse "0-3,8,10-11" into [0, 1, 2, 3, 8, 10, 11]"""
+    shard_ids = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            shard_ids.extend(range(int(start), int(end) + 1))
+        else:
+            shard_ids.append(int(part))
+    return sorted(set(shard_ids))
+
+
+def shard_ranges(shard_count, clusters):
+    """Split shards 0..shard_count-1 into `clusters` contiguous ranges"""
+    per_cluster, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for i in range(clusters):
+        size = per_cluster + (1 if i < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+def shard_health(bot):
+    """Latency and connection state of every shard this process runs"""
+    shards = []
+    for shard_id, shard in sorted(getattr(bot, "shards", {}).items()):
+        shards.append({
+            "id": shard_id,
+            "latency": shard.latency if math.isfinite(shard.latency) else None,
+            "closed": shard.is_closed(),
+            "ratelimited": shard.is_ws_ratelimited()
+        })
+    return shards
+
+
+async def fetch_peer_stats(session, peers, timeout=2.0):
+    """Collect /stats from every peer; unreachable peers come back as None"""
+
+    async def fetch(url):
+        try:
+            async with session.get(f"{url.rstrip('/')}/stats", timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                if resp.status == 200:
+                    return await resp.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            log.warning("Failed to fetch stats from %s: %s", url, e)
+        return None
+
+    return await asyncio.gather(*(fetch(url) for url in peers))
+
+
+async def run_worker(cluster_id, env, stop, restart_delay=5):
+    """Run one worker process, restarting it whenever it exits until `stop` is set"""
+    delay = restart_delay
+    while not stop.is_set():
+        started = time.monotonic()
+        process = await asyncio.create_subprocess_exec(sys.executable, "main.py", env=env)
+        log.info("Cluster %s started (pid %s, shards %s)", cluster_id, process.pid, env["SHARD_IDS"])
+        waiter = asyncio.create_task(process.wait())
+        stopper = asyncio.create_task(stop.wait())
+        await asyncio.wait({waiter, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        if stop.is_set():
+            if process.returncode is None:
+                process.terminate()
+                await process.wait()
+            waiter.cancel()
+            return
+        stopper.cancel()
+        # Back off on crash loops, reset after a worker stayed up for a while
+        delay = restart_delay if time.monotonic() - started > 60 else min(delay * 2, 300)
+        log.warning("Cluster %s exited with code %s, restarting in %ss", cluster_id, process.returncode, delay)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def main(args):
+    ranges = shard_ranges(args.shards, args.clusters)
+    peers = ",".join(f"http://127.0.0.1:{args.base_port + i}" for i in range(args.clusters))
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    workers = []
+    for cluster_id, shard_ids in enumerate(ranges):
+        env = dict(
+            os.environ,
+            CLUSTER_ID=str(cluster_id),
+            SHARD_COUNT=str(args.shards),
+            SHARD_IDS=",".join(map(str, shard_ids)),
+            WEB_PORT=str(args.base_port + cluster_id),
+            CLUSTER_PEERS=peers
+        )
+        workers.append(run_worker(cluster_id, env, stop))
+    await asyncio.gather(*workers)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run the bot as several sharded worker processes")
+    parser.add_argument("--clusters", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", type=int, required=True, help="total shard count across all clusters")
+    parser.add_argument("--base-port", type=int, default=int(os.getenv("WEB_PORT", "5000")))
+    args = parser.parse_args()
+    if args.clusters > args.shards:
+        parser.error("--clusters cannot be larger than --shards")
+    asyncio.run(main(args))
@@ -0,0 +1,20 @@
+"""Command groups loaded as discord.py extensions
+
+Each module's cog owns the subsystem behind its commands: it opens it in
+cog_load and closes it in cog_unload, so an extension can be loaded late,
+unloaded or reloaded while the bot stays connected.
+"""
+
+EXTENSIONS = (
+    "cogs.general",
+    "cogs.fun",
+    "cogs.moderation",
+    "cogs.warnings",
+    "cogs.stats",
+    "cogs.reminders",
+    "cogs.polls",
+    "cogs.giveaways",
+    "cogs.invites",
+    "cogs.backups",
+    "cogs.weather",
+)
@@ -0,0 +1,139 @@
+import asyncio
+import datetime
+import io
+import json
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from backups import BackupScheduler, SnapshotStore, decode, encode
+from progress import ThrottledProgress
+
+
+class Backups(commands.Cog):
+    """Server snapshots, scheduled backups and restores"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.store = SnapshotStore(bot.db_path)
+        self.scheduler = BackupScheduler(self.store, bot.get_guild)
+
+    async def cog_load(self):
+        self.scheduler.start()
+
+    async def cog_unload(self):
+        self.scheduler.stop()
+        self.store.close()
+
+    @commands.hybrid_command(name="serverbackup", description="Create a backup of server settings", extras={"category": "backup"})
+    @app_commands.default_permissions(administrator=True)
+    async def serverbackup(self, ctx):
+        """Create a backup of the server settings"""
+        guild = ctx.guild
+        try:
+            backup_data, (snapshot_id, kind, stored_size) = await self.scheduler.backup(guild)
+            data = await asyncio.to_thread(encode, backup_data)
+
+            embed = discord.Embed(title="📑 Server Backup", color=discord.Color.green())
+            embed.add_field(name="Server Name", value=guild.name)
+            embed.add_field(name="Backup Time", value=datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"))
+            embed.add_field(name="Roles Backed Up", value=str(len(backup_data["roles"])))
+            embed.add_field(name="Channels Backed Up", value=str(len(backup_data["channels"])))
+            embed.add_field(name="Emojis Backed Up", value=str(len(backup_data["emojis"])))
+            embed.add_field(name="Snapshot", value=f"#{snapshot_id} ({kind}, {stored_size / 1024:.1f} KiB stored)")
+
+            timestamp = datetime.datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+            file = discord.File(io.BytesIO(data), filename=f"backup_{guild.id}_{timestamp}.json.gz")
+            await ctx.author.send(embed=embed, file=file)
+            await ctx.send("✅ Server backup has been created and sent to your DMs!")
+        except discord.HTTPException as e:
+            await ctx.send(f"❌ Failed to create backup: {str(e)}")
+
+    @commands.hybrid_command(name="autobackup", description="Schedule automatic server backups", extras={"category": "backup"})
+    @app_commands.default_permissions(administrator=True)
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def autobackup(self, ctx, interval_hours: int, keep: int = 14):
+        self.store.set_schedule(ctx.guild.id, interval_hours, max(1, keep))
+        if interval_hours <= 0:
+            await ctx.send("✅ Automatic backups disabled!")
+        else:
+            await ctx.send(f"✅ Backing up this server every {interval_hours} hours, keeping the latest {max(1, keep)} backups!")
+
+    @commands.hybrid_command(name="backups", description="List stored backups or get one as a file", extras={"category": "backup"})
+    @app_commands.default_permissions(administrator=True)
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def backups(self, ctx, snapshot_id: int = None):
+        if snapshot_id is None:
+            stored = self.store.list(ctx.guild.id)
+            if not stored:
+                await ctx.send("This server has no stored backups!")
+                return
+            embed = discord.Embed(title="📑 Stored Backups", color=discord.Color.blue())
+            embed.description = "\n".join(
+                f"`#{backup_id}` <t:{int(created_at)}:f> - {kind}, {size / 1024:.1f} KiB"
+                for backup_id, created_at, kind, size in stored
+            )
+            embed.set_footer(text=f"Use {self.bot.command_prefix}backups <id> to get a backup file for restorebackup")
+            await ctx.send(embed=embed)
+            return
+
+        if self.store.guild_of(snapshot_id) != ctx.guild.id:
+            await ctx.send("❌ No backup found with that ID!")
+            return
+        data = await asyncio.to_thread(encode, self.store.load(snapshot_id))
+        file = discord.File(io.BytesIO(data), filename=f"backup_{ctx.guild.id}_{snapshot_id}.json.gz")
+        await ctx.author.send(file=file)
+        await ctx.send("✅ Backup has been sent to your DMs!")
+
+    @commands.hybrid_command(name="restorebackup", description="Restore a server from a backup file", extras={"category": "backup"})
+    @app_commands.default_permissions(administrator=True)
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    @commands.bot_has_permissions(manage_roles=True, manage_channels=True)
+    async def restorebackup(self, ctx, backup_file: discord.Attachment, dry_run: bool = False):
+        # The restore planner is only needed here, so it is not imported until a restore runs
+        from restore import RestoreExecutor, plan_restore
+
+        try:
+            # Download and read backup file
+            backup_content = await backup_file.read()
+            backup_data = decode(backup_content)
+        except (discord.HTTPException, OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            await ctx.send(f"❌ Error reading backup: {str(e)}")
+            return
+
+        guild = ctx.guild
+        try:
+            phases = plan_restore(backup_data, guild, keep_channel=ctx.channel)
+        except (KeyError, TypeError, ValueError) as e:
+            await ctx.send(f"❌ Invalid backup file: {str(e)}")
+            return
+
+        operations = [op for phase in phases for op in phase]
+        if dry_run or not operations:
+            embed = discord.Embed(title="📑 Restore Plan", color=discord.Color.blue())
+            embed.description = "The server already matches the backup." if not operations else f"{len(operations)} changes needed"
+            for action in ("delete", "edit", "create"):
+                names = [str(op) for op in operations if op.action == action]
+                if names:
+                    value = "\n".join(names[:15]) + (f"\n...and {len(names) - 15} more" if len(names) > 15 else "")
+                    embed.add_field(name=f"{action.title()} ({len(names)})", value=value[:1024], inline=False)
+            await ctx.send(embed=embed)
+            return
+
+        progress_msg = await ctx.send("🔄 Starting server restoration...")
+        progress = ThrottledProgress(progress_msg)
+        failures = await RestoreExecutor(on_progress=progress).run(phases)
+
+        if failures:
+            details = "\n".join(f"{op}: {error.text or error.status}" for op, error in failures[:5])
+            await progress.finish(f"⚠️ Server restoration finished with {len(failures)} failed changes out of {len(operations)}:\n{details}"[:2000])
+        else:
+            await progress.finish(f"✅ Server restoration completed! {len(operations)} changes applied.")
+
+
+async def setup(bot):
+    await bot.add_cog(Backups(bot))
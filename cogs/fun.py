@@ -0,0 +1,105 @@
+import asyncio
+import random
+
+import discord
+from discord.ext import commands
+
+from dice import DiceError, parse_dice
+
+# Rolls of more dice than this run in a thread instead of blocking the event loop
+BACKGROUND_DICE = 10_000
+
+
+class Fun(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.hybrid_command(name="8ball", description="Ask the magic 8ball a question", extras={"category": "fun"})
+    async def eightball(self, ctx, *, question: str):
+        responses = [
+            "It is certain.", "Without a doubt.", "Yes definitely.",
+            "You may rely on it.", "As I see it, yes.", "Most likely.",
+            "Reply hazy, try again.", "Ask again later.", "Better not tell you now.",
+            "Cannot predict now.", "Don't count on it.", "My sources say no.",
+            "Very doubtful."
+        ]
+        embed = discord.Embed(title="🎱 Magic 8-Ball", color=discord.Color.purple())
+        embed.add_field(name="Question", value=question)
+        embed.add_field(name="Answer", value=random.choice(responses))
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="coinflip", description="Flip a coin", extras={"category": "fun"})
+    async def coinflip(self, ctx):
+        result = random.choice(["Heads", "Tails"])
+        embed = discord.Embed(
+            title="🪙 Coin Flip",
+            description=f"The coin landed on: **{result}**",
+            color=discord.Color.gold()
+        )
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="roll", description="Roll dice, e.g. 2d6, 4d6kh3+2d8+5 or 3d6!", extras={"category": "fun", "limits": "user=5/10"})
+    async def roll(self, ctx, *, dice: str):
+        try:
+            expression = parse_dice(dice)
+            # Bulk rolls take tens of milliseconds per million dice
+            if expression.dice > BACKGROUND_DICE:
+                result = await asyncio.to_thread(expression.roll)
+            else:
+                result = expression.roll()
+        except DiceError as e:
+            embed = discord.Embed(
+                title="❌ Invalid Format",
+                description=f"{e}\nTry e.g. `2d6`, `4d6kh3+2d8+5` or `3d6!`",
+                color=discord.Color.red()
+            )
+            await ctx.send(embed=embed)
+            return
+
+        lines = []
+        for i, group in enumerate(result.groups):
+            line = group.describe()
+            if sum(map(len, lines)) + len(lines) + len(line) > 980:
+                lines.append(f"… and {len(result.groups) - i} more")
+                break
+            lines.append(line)
+        embed = discord.Embed(
+            title="🎲 Dice Roll",
+            description=f"Rolling `{expression.text}`",
+            color=discord.Color.blue()
+        )
+        if lines:
+            embed.add_field(name="Results", value="\n".join(lines), inline=False)
+        embed.add_field(name="Total", value=f"{result.total:,}")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="random", description="Generate a random number", extras={"category": "fun"})
+    async def random_number(self, ctx, start: int = 1, end: int = 100):
+        number = random.randint(start, end)
+        embed = discord.Embed(
+            title="🎲 Random Number",
+            description=f"Generated number between {start} and {end}:",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Result", value=str(number))
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="joke", description="Tells a random joke", extras={"category": "fun"})
+    async def joke(self, ctx):
+        jokes = [
+            "Why don't programmers like nature? It has too many bugs.",
+            "What do you call a bear with no teeth? A gummy bear!",
+            "Why don't scientists trust atoms? Because they make up everything!",
+            "What did the grape say when it got stepped on? Nothing, it just let out a little wine!",
+            "Why did the scarecrow win an award? Because he was outstanding in his field!"
+        ]
+        embed = discord.Embed(
+            title="😄 Random Joke",
+            description=random.choice(jokes),
+            color=discord.Color.gold()
+        )
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(Fun(bot))
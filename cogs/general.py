@@ -0,0 +1,204 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from catalog import CatalogPaginator
+from httpclient import DownloadError, sniff_image
+
+ICON_MAX_BYTES = 10 * 1024 * 1024
+
+
+class General(commands.Cog):
+    """Help, information and server utility commands"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.hybrid_command(name="ping", description="Shows the bot's latency", extras={"category": "utility"})
+    async def ping(self, ctx):
+        embed = discord.Embed(
+            title="🏓 Pong!",
+            description=f"Latency: {round(self.bot.latency * 1000)}ms",
+            color=discord.Color.green()
+        )
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="serverinfo", description="Shows server information", extras={"category": "statistics"})
+    async def serverinfo(self, ctx):
+        guild = ctx.guild
+        embed = discord.Embed(title=f"{guild.name} Info", color=discord.Color.blue())
+        embed.set_thumbnail(url=guild.icon.url if guild.icon else None)
+        embed.add_field(name="Owner", value=guild.owner.mention)
+        embed.add_field(name="Created At", value=guild.created_at.strftime("%Y-%m-%d"))
+        embed.add_field(name="Member Count", value=guild.member_count)
+        embed.add_field(name="Boost Level", value=guild.premium_tier)
+        embed.add_field(name="Roles", value=len(guild.roles))
+        embed.add_field(name="Channels", value=len(guild.channels))
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="userinfo", description="Shows info about a user", extras={"category": "statistics"})
+    async def userinfo(self, ctx, member: discord.Member = None):
+        member = member or ctx.author
+        roles = [role.mention for role in member.roles[1:]]
+        embed = discord.Embed(title="User Information", color=member.color)
+        embed.set_thumbnail(url=member.avatar.url if member.avatar else member.default_avatar.url)
+        embed.add_field(name="Username", value=member.name)
+        embed.add_field(name="Joined Server", value=member.joined_at.strftime("%Y-%m-%d"))
+        embed.add_field(name="Account Created", value=member.created_at.strftime("%Y-%m-%d"))
+        embed.add_field(name="Roles", value=" ".join(roles) if roles else "No roles")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="commands", description="Shows all available commands", extras={"category": "utility"})
+    async def command_list(self, ctx, command: str = None, page: int = 1):
+        if command and command.isdigit():
+            page = int(command)
+        elif command:
+            embed = self.bot.catalog.detail(command)
+            if embed:
+                await ctx.send(embed=embed)
+                return
+
+        catalog_pages = self.bot.catalog.pages
+        if len(catalog_pages) > 1:
+            await ctx.send(embed=self.bot.catalog.page(page), view=CatalogPaginator(self.bot.catalog, ctx.author.id, page))
+        else:
+            await ctx.send(embed=catalog_pages[0])
+
+    @commands.hybrid_command(name="avatar", description="Shows a user's avatar", extras={"category": "utility"})
+    async def avatar(self, ctx, member: discord.Member = None):
+        member = member or ctx.author
+        embed = discord.Embed(title=f"{member.name}'s Avatar", color=member.color)
+        embed.set_image(url=member.avatar.url if member.avatar else member.default_avatar.url)
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="showicon", description="Shows the server's icon", extras={"category": "utility"})
+    async def showicon(self, ctx):
+        if not ctx.guild.icon:
+            await ctx.send("This server has no icon!")
+            return
+
+        embed = discord.Embed(title=f"{ctx.guild.name}'s Icon", color=discord.Color.blue())
+        embed.set_image(url=ctx.guild.icon.url)
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="serveremojis", description="Shows all server emojis", extras={"category": "server"})
+    async def serveremojis(self, ctx):
+        emojis = [str(emoji) for emoji in ctx.guild.emojis]
+        if not emojis:
+            await ctx.send("This server has no custom emojis!")
+            return
+
+        embed = discord.Embed(
+            title="😀 Server Emojis",
+            description=" ".join(emojis),
+            color=discord.Color.blue()
+        )
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="say", description="Make the bot say something", extras={"category": "fun", "limits": "user=3/10,channel=5/10"})
+    @app_commands.default_permissions(manage_messages=True)
+    async def say(self, ctx, *, message: str):
+        await ctx.message.delete()
+        embed = discord.Embed(
+            description=message,
+            color=discord.Color.blue()
+        )
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="roles", description="Lists all server roles", extras={"category": "server"})
+    async def roles(self, ctx):
+        roles = [role.mention for role in ctx.guild.roles[1:]]  # Skip @everyone
+        embed = discord.Embed(
+            title="📋 Server Roles",
+            description="\n".join(reversed(roles)),
+            color=discord.Color.blue()
+        )
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="channelinfo", description="Get information about a channel", extras={"category": "utility"})
+    async def channelinfo(self, ctx, channel: discord.TextChannel = None):
+        channel = channel or ctx.channel
+        embed = discord.Embed(
+            title="📺 Channel Information",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Name", value=channel.name)
+        embed.add_field(name="Category", value=channel.category.name if channel.category else "None")
+        embed.add_field(name="Created At", value=channel.created_at.strftime("%Y-%m-%d"))
+        embed.add_field(name="NSFW", value=channel.is_nsfw())
+        embed.add_field(name="News Channel", value=channel.is_news())
+        embed.add_field(name="Slowmode", value=f"{channel.slowmode_delay}s")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="embed", description="Create a custom embed message", extras={"category": "utility", "limits": "user=3/10,channel=5/10"})
+    @app_commands.default_permissions(manage_messages=True)
+    async def embed(self, ctx, title: str, *, description: str):
+        embed = discord.Embed(title=title, description=description, color=discord.Color.blue())
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="servericon", description="Change the server icon", extras={"category": "utility"})
+    @app_commands.default_permissions(manage_guild=True)
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def servericon(self, ctx, url: str = None, image: discord.Attachment = None):
+        if not url and not image:
+            await ctx.send("Please provide a URL or attach an image!")
+            return
+
+        try:
+            if url:
+                image_data = (await self.bot.http_client.fetch(url, max_bytes=ICON_MAX_BYTES, image=True)).data
+            else:
+                if image.size > ICON_MAX_BYTES:
+                    raise DownloadError(f"The file is larger than {ICON_MAX_BYTES // 1024} KiB")
+                image_data = await image.read()
+                if sniff_image(image_data) is None:
+                    raise DownloadError("The attachment is not a PNG, JPEG, GIF or WebP image")
+
+            await ctx.guild.edit(icon=image_data)
+            await ctx.send("✅ Server icon updated successfully!")
+        except (DownloadError, discord.HTTPException, ValueError) as e:
+            await ctx.send(f"❌ Failed to update server icon: {str(e)}")
+
+    @commands.hybrid_command(name="urban", description="Look up a word in the Urban Dictionary", extras={"category": "utility"})
+    async def urban(self, ctx, *, word: str):
+        embed = discord.Embed(title=f"📚 Urban Dictionary: {word}", color=discord.Color.blue())
+        embed.add_field(name="Note", value="This is a placeholder. Add Urban Dictionary API integration for real definitions.")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="serveremotes", description="List all available server emotes with IDs", extras={"category": "server"})
+    async def serveremotes(self, ctx):
+        emotes = [f"{emote} - `{emote.id}`" for emote in ctx.guild.emojis]
+        if not emotes:
+            await ctx.send("This server has no custom emotes!")
+            return
+
+        embed = discord.Embed(title="Server Emotes", color=discord.Color.blue())
+        # Split into chunks of 10 emotes per field
+        chunks = [emotes[i:i + 10] for i in range(0, len(emotes), 10)]
+        for i, chunk in enumerate(chunks, 1):
+            embed.add_field(name=f"Page {i}", value="\n".join(chunk), inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="firstmessage", description="Find the first message in the channel", extras={"category": "server"})
+    async def firstmessage(self, ctx, channel: discord.TextChannel = None):
+        channel = channel or ctx.channel
+        first_message = None
+
+        async for message in channel.history(limit=1, oldest_first=True):
+            first_message = message
+
+        if first_message:
+            embed = discord.Embed(title="First Message", color=discord.Color.gold())
+            embed.add_field(name="Content", value=first_message.content or "[No content]")
+            embed.add_field(name="Author", value=first_message.author.mention)
+            embed.add_field(name="Date", value=first_message.created_at.strftime("%Y-%m-%d %H:%M:%S"))
+            embed.add_field(name="Jump to Message", value=f"[Click Here]({first_message.jump_url})")
+        else:
+            embed = discord.Embed(title="Error", description="No messages found!", color=discord.Color.red())
+
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(General(bot))
@@ -0,0 +1,90 @@
+import datetime
+import typing
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from giveaways import GIVEAWAY_EMOJI, Giveaway, GiveawayManager, GiveawayStore
+
+
+class Giveaways(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.manager = GiveawayManager(GiveawayStore(bot.db_path), self.announce_giveaway)
+
+    async def cog_load(self):
+        self.manager.resume()
+
+    async def cog_unload(self):
+        await self.manager.stop()
+        self.manager.store.close()
+
+    async def announce_giveaway(self, giveaway, winner_ids):
+        await self.bot.wait_until_ready()
+        channel = self.bot.get_partial_messageable(giveaway.channel_id)
+        if winner_ids:
+            mentions = ", ".join(f"<@{user_id}>" for user_id in winner_ids)
+            self.bot.outbound.send(channel, content=f"🎉 Congratulations {mentions}! You won: {giveaway.prize}")
+        else:
+            self.bot.outbound.send(channel, content="No one entered the giveaway 😔")
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        if str(payload.emoji) != GIVEAWAY_EMOJI or not self.manager.is_active(payload.message_id):
+            return
+        if payload.user_id == self.bot.user.id or (payload.member and payload.member.bot):
+            return
+        self.manager.add_entry(payload.message_id, payload.user_id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload):
+        if str(payload.emoji) == GIVEAWAY_EMOJI and self.manager.is_active(payload.message_id):
+            self.manager.remove_entry(payload.message_id, payload.user_id)
+
+    @commands.hybrid_command(name="giveaway", description="Start a giveaway", extras={"category": "fun"})
+    @app_commands.default_permissions(manage_guild=True)
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def giveaway(self, ctx, duration: int, winners: typing.Optional[int] = 1, *, prize: str):
+        winners = max(1, winners)
+        end_time = datetime.datetime.utcnow() + datetime.timedelta(minutes=duration)
+        embed = discord.Embed(title="🎉 Giveaway!", description=f"Prize: {prize}", color=discord.Color.gold())
+        embed.add_field(name="Duration", value=f"{duration} minutes")
+        embed.add_field(name="Winners", value=str(winners))
+        embed.add_field(name="Ends At", value=end_time.strftime("%Y-%m-%d %H:%M UTC"))
+        embed.set_footer(text=f"React with {GIVEAWAY_EMOJI} to enter!")
+        message = await ctx.send(embed=embed)
+        await message.add_reaction(GIVEAWAY_EMOJI)
+        self.manager.start(Giveaway(
+            message.id, ctx.guild.id, ctx.channel.id, ctx.author.id, prize, winners,
+            end_time.replace(tzinfo=datetime.timezone.utc).timestamp()
+        ))
+
+    @commands.hybrid_command(name="endgiveaway", description="End a running giveaway early", extras={"category": "fun"})
+    @app_commands.default_permissions(manage_guild=True)
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def endgiveaway(self, ctx, message_id: str):
+        if not message_id.isdigit() or not await self.manager.end(int(message_id), guild_id=ctx.guild.id):
+            await ctx.send("❌ No running giveaway found with that message ID!")
+            return
+        await ctx.send("✅ Giveaway ended!", ephemeral=True)
+
+    @commands.hybrid_command(name="reroll", description="Pick new winners for an ended giveaway", extras={"category": "fun"})
+    @app_commands.default_permissions(manage_guild=True)
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def reroll(self, ctx, message_id: str, winners: int = 1):
+        ended, new_winners = self.manager.reroll(int(message_id), max(1, winners), guild_id=ctx.guild.id) if message_id.isdigit() else (None, [])
+        if ended is None:
+            await ctx.send("❌ No ended giveaway found with that message ID!")
+        elif new_winners:
+            mentions = ", ".join(f"<@{user_id}>" for user_id in new_winners)
+            await ctx.send(f"🎉 New winner(s): {mentions}! You won: {ended.prize}")
+        else:
+            await ctx.send("No other entrants left to reroll 😔")
+
+
+async def setup(bot):
+    await bot.add_cog(Giveaways(bot))
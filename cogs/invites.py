@@ -0,0 +1,88 @@
+import asyncio
+
+import discord
+from discord.ext import commands
+
+from invites import InviteTracker
+
+
+class Invites(commands.Cog):
+    """Invite tracking and join attribution"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.tracker = InviteTracker(bot.db_path)
+        self.warming = set()
+
+    def warm(self, guilds):
+        task = asyncio.create_task(self.tracker.warm(guilds))
+        self.warming.add(task)
+        task.add_done_callback(self.warming.discard)
+
+    async def cog_load(self):
+        # Loaded into a running bot, e.g. by a reload, there will be no on_ready to warm the cache
+        if self.bot.is_ready():
+            self.warm(self.bot.guilds)
+
+    async def cog_unload(self):
+        for task in self.warming:
+            task.cancel()
+        self.tracker.close()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self.warm(self.bot.guilds)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        try:
+            await self.tracker.attribute_join(member)
+        except discord.HTTPException as e:
+            print(f"Failed to attribute invite for {member}: {e}")
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.warm([guild])
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.tracker.drop(guild.id)
+
+    @commands.Cog.listener()
+    async def on_invite_create(self, invite):
+        self.tracker.add(invite)
+
+    @commands.Cog.listener()
+    async def on_invite_delete(self, invite):
+        self.tracker.remove(invite)
+
+    @commands.hybrid_command(name="invites", description="Show your invite statistics", extras={"category": "utility"})
+    async def invites(self, ctx, member: discord.Member = None):
+        member = member or ctx.author
+        if not await self.tracker.load(ctx.guild):
+            return await ctx.send("❌ I need the Manage Server permission to track invites!")
+
+        embed = discord.Embed(title="📨 Invite Statistics", color=member.color)
+        embed.add_field(name="Member", value=member.mention)
+        embed.add_field(name="Total Invites", value=str(self.tracker.uses_by(ctx.guild.id, member.id)))
+        embed.add_field(name="Tracked Joins", value=str(self.tracker.joins_by(ctx.guild.id, member.id)))
+        joined = self.tracker.invited_by(ctx.guild.id, member.id)
+        if joined:
+            inviter_id, code, _ = joined
+            embed.add_field(name="Invited By", value=f"<@{inviter_id}> (`{code}`)" if inviter_id else f"`{code}`")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="inviteleaderboard", description="Show the members with the most invite uses", extras={"category": "utility"})
+    async def inviteleaderboard(self, ctx):
+        if not await self.tracker.load(ctx.guild):
+            return await ctx.send("❌ I need the Manage Server permission to track invites!")
+        top = self.tracker.leaderboard(ctx.guild.id)
+        if not top:
+            return await ctx.send("No invites have been used yet!")
+        lines = [f"**{rank}.** <@{inviter_id}> — {uses} uses" for rank, (inviter_id, uses) in enumerate(top, 1)]
+        embed = discord.Embed(title="📨 Invite Leaderboard", description="\n".join(lines), color=discord.Color.blue())
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(Invites(bot))
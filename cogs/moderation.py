@@ -0,0 +1,249 @@
+import asyncio
+import datetime
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from bulkmod import BulkExecutor, SelectionFlags, can_moderate, parse_ids, select_members
+from purge import PurgeFlags, PurgeJob, PurgeQueue, parse_channels
+from progress import ThrottledProgress
+
+
+class Moderation(commands.Cog):
+    """Single and bulk moderation actions and message purges"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.purge_queue = PurgeQueue(bot.db_path, self.delete_old_message)
+        self.clearing = set()
+
+    async def cog_load(self):
+        self.purge_queue.start()
+
+    async def cog_unload(self):
+        for task in self.clearing:
+            task.cancel()
+        self.purge_queue.close()
+
+    def clear_done(self, task):
+        self.clearing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Clear failed: {task.exception()!r}")
+
+    async def delete_old_message(self, channel_id, message_id):
+        await self.bot.get_partial_messageable(channel_id).get_partial_message(message_id).delete()
+
+    @commands.hybrid_command(name="clear", description="Clear messages in a channel", extras={"category": "moderation"})
+    @app_commands.default_permissions(manage_messages=True)
+    @app_commands.describe(amount="How many recent messages to scan in each channel")
+    @commands.guild_only()
+    @commands.has_permissions(manage_messages=True)
+    async def clear(self, ctx, amount: commands.Range[int, 1, 10000], *, flags: PurgeFlags):
+        channels = [ctx.channel] + [channel for channel in parse_channels(ctx.guild, flags.channels) if channel != ctx.channel]
+        for channel in channels[1:]:
+            if not channel.permissions_for(ctx.author).manage_messages:
+                return await ctx.send(f"❌ You cannot manage messages in {channel.mention}!")
+        if ctx.interaction is None:
+            # The command message itself is not one of the messages to clear
+            await ctx.message.delete()
+        progress_msg = await ctx.send(f"🧹 Clearing messages in {len(channels)} channel(s)...")
+        progress = ThrottledProgress(progress_msg, template="🧹 Scanned {done}/{total} messages...")
+        # Run in the background so the command returns right away
+        task = asyncio.create_task(self.finish_clear(PurgeJob(self.purge_queue, flags.check, progress), progress, channels, amount))
+        self.clearing.add(task)
+        task.add_done_callback(self.clear_done)
+
+    async def finish_clear(self, job, progress, channels, amount):
+        try:
+            await job.run(channels, amount, before=progress.message)
+        except Exception as e:
+            await progress.finish(f"❌ Clearing failed after {job.deleted} messages: {e}")
+            raise
+        summary = f"🧹 Cleared {job.deleted} messages"
+        if job.queued:
+            summary += f", {job.queued} older than 14 days are being deleted in the background"
+        if job.failures:
+            summary += f" ({len(job.failures)} channel(s) failed: {job.failures[0][1].text or job.failures[0][1].status})"
+        await progress.finish(summary)
+        self.bot.outbound.delete_later(progress.message, 5)
+
+    @commands.hybrid_command(name="kick", description="Kick a member", extras={"category": "moderation"})
+    @app_commands.default_permissions(kick_members=True)
+    async def kick(self, ctx, member: discord.Member, *, reason: str = "No reason provided"):
+        if member.top_role >= ctx.author.top_role:
+            embed = discord.Embed(
+                title="❌ Error",
+                description="You cannot kick someone with a higher or equal role!",
+                color=discord.Color.red()
+            )
+            await ctx.send(embed=embed)
+            return
+
+        await member.kick(reason=reason)
+        embed = discord.Embed(title="👢 Member Kicked", color=discord.Color.red())
+        embed.add_field(name="Member", value=member.mention)
+        embed.add_field(name="Reason", value=reason)
+        embed.add_field(name="Moderator", value=ctx.author.mention)
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="ban", description="Ban a member", extras={"category": "moderation"})
+    @app_commands.default_permissions(ban_members=True)
+    async def ban(self, ctx, member: discord.Member, *, reason: str = "No reason provided"):
+        if member.top_role >= ctx.author.top_role:
+            embed = discord.Embed(
+                title="❌ Error",
+                description="You cannot ban someone with a higher or equal role!",
+                color=discord.Color.red()
+            )
+            await ctx.send(embed=embed)
+            return
+
+        await member.ban(reason=reason)
+        embed = discord.Embed(title="🔨 Member Banned", color=discord.Color.red())
+        embed.add_field(name="Member", value=member.mention)
+        embed.add_field(name="Reason", value=reason)
+        embed.add_field(name="Moderator", value=ctx.author.mention)
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="timeout", description="Timeout a member", extras={"category": "moderation"})
+    @app_commands.default_permissions(moderate_members=True)
+    async def timeout(self, ctx, member: discord.Member, minutes: int, *, reason: str = "No reason provided"):
+        if member.top_role >= ctx.author.top_role:
+            embed = discord.Embed(
+                title="❌ Error",
+                description="You cannot timeout someone with a higher or equal role!",
+                color=discord.Color.red()
+            )
+            await ctx.send(embed=embed)
+            return
+
+        duration = datetime.timedelta(minutes=minutes)
+        await member.timeout(duration, reason=reason)
+        embed = discord.Embed(title="⏰ Member Timed Out", color=discord.Color.orange())
+        embed.add_field(name="Member", value=member.mention)
+        embed.add_field(name="Duration", value=f"{minutes} minutes")
+        embed.add_field(name="Reason", value=reason)
+        embed.add_field(name="Moderator", value=ctx.author.mention)
+        await ctx.send(embed=embed)
+
+    async def run_bulk_action(self, ctx, flags, verb, allow_missing, apply):
+        """Select targets from `flags`, then preview them or run `apply(executor, targets)`"""
+        if not flags.has_criteria():
+            await ctx.send("❌ Select members with at least one of `members:`, `joined:`, `age:` or `name:`!")
+            return
+        await ctx.defer()
+        ids = parse_ids(flags.members)
+        candidates = await self.bot.member_cache.members(ctx.guild, ids or None)
+        members, missing = select_members(ctx.guild, ids, flags.joined, flags.age, flags.name, members=candidates)
+        allowed = [member for member in members if can_moderate(ctx.author, ctx.guild.me, member)]
+        skipped = len(members) - len(allowed)
+        unresolved = [discord.Object(id=user_id) for user_id in missing] if allow_missing else []
+        targets = allowed + unresolved
+        if not targets:
+            await ctx.send(f"❌ No members to {verb}!" + (f" {skipped} skipped by role hierarchy." if skipped else ""))
+            return
+
+        if flags.dry_run:
+            def preview(users):
+                text = "\n".join(f"<@{user.id}>" for user in users[:20])
+                return text + (f"\n...and {len(users) - 20} more" if len(users) > 20 else "")
+
+            embed = discord.Embed(title=f"📑 Would {verb} {len(targets)} members", color=discord.Color.blue())
+            embed.description = preview(allowed) if allowed else None
+            if unresolved:
+                embed.add_field(name=f"Not in the server ({len(unresolved)})", value=preview(unresolved), inline=False)
+            if skipped:
+                embed.set_footer(text=f"{skipped} skipped by role hierarchy")
+            await ctx.send(embed=embed)
+            return
+
+        progress_msg = await ctx.send(f"🔄 Starting to {verb} {len(targets)} members...")
+        progress = ThrottledProgress(progress_msg, template=f"🔄 {verb.title()}: {{done}}/{{total}} members")
+        executor = BulkExecutor(on_progress=progress)
+        await apply(executor, targets)
+
+        summary = f"✅ {verb.title()}: {len(executor.succeeded)}/{len(targets)} members"
+        if executor.failures:
+            summary += f", {len(executor.failures)} failed"
+        if skipped:
+            summary += f", {skipped} skipped by role hierarchy"
+        await progress.finish(summary)
+
+    @commands.hybrid_command(name="massban", description="Ban many members at once", extras={"category": "moderation"})
+    @app_commands.default_permissions(ban_members=True)
+    @commands.has_permissions(ban_members=True)
+    async def massban(self, ctx, *, flags: SelectionFlags):
+        async def apply(executor, targets):
+            await executor.bulk_ban(ctx.guild, targets, reason=flags.reason)
+
+        await self.run_bulk_action(ctx, flags, "ban", True, apply)
+
+    @commands.hybrid_command(name="masskick", description="Kick many members at once", extras={"category": "moderation"})
+    @app_commands.default_permissions(kick_members=True)
+    @commands.has_permissions(kick_members=True)
+    async def masskick(self, ctx, *, flags: SelectionFlags):
+        async def apply(executor, targets):
+            await executor.run(targets, lambda member: member.kick(reason=flags.reason))
+
+        await self.run_bulk_action(ctx, flags, "kick", False, apply)
+
+    @commands.hybrid_command(name="masstimeout", description="Timeout many members at once", extras={"category": "moderation"})
+    @app_commands.default_permissions(moderate_members=True)
+    @commands.has_permissions(moderate_members=True)
+    async def masstimeout(self, ctx, minutes: commands.Range[int, 1, 40320], *, flags: SelectionFlags):
+        duration = datetime.timedelta(minutes=minutes)
+
+        async def apply(executor, targets):
+            await executor.run(targets, lambda member: member.timeout(duration, reason=flags.reason))
+
+        await self.run_bulk_action(ctx, flags, "timeout", False, apply)
+
+    @commands.hybrid_command(name="unmute", description="Unmute a member", extras={"category": "moderation"})
+    @app_commands.default_permissions(moderate_members=True)
+    async def unmute(self, ctx, member: discord.Member):
+        if not member.is_timed_out():
+            embed = discord.Embed(title="❌ Error", description=f"{member.mention} is not muted!", color=discord.Color.red())
+        else:
+            await member.timeout(None)
+            embed = discord.Embed(title="🔊 Member Unmuted", color=discord.Color.green())
+            embed.add_field(name="Member", value=member.mention)
+            embed.add_field(name="Moderator", value=ctx.author.mention)
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="slowmode", description="Set slowmode in the channel", extras={"category": "moderation"})
+    @app_commands.default_permissions(manage_channels=True)
+    async def slowmode(self, ctx, seconds: int):
+        await ctx.channel.edit(slowmode_delay=seconds)
+        embed = discord.Embed(
+            title="⏱️ Slowmode Set",
+            description=f"Slowmode set to {seconds} seconds",
+            color=discord.Color.blue()
+        )
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="nickname", description="Change a member's nickname", extras={"category": "moderation"})
+    @app_commands.default_permissions(manage_nicknames=True)
+    async def nickname(self, ctx, member: discord.Member, *, new_nickname: str = None):
+        try:
+            await member.edit(nick=new_nickname)
+            await ctx.send(f"✅ Changed {member.name}'s nickname to: {new_nickname or 'Reset to default'}")
+        except Exception as e:
+            await ctx.send(f"❌ Failed to change nickname: {str(e)}")
+
+    @commands.hybrid_command(name="report", description="Report a user", extras={"category": "moderation"})
+    async def report(self, ctx, member: discord.Member, *, reason: str):
+        # Send to a mod-log channel
+        mod_log = discord.utils.get(ctx.guild.channels, name="mod-log")
+        if mod_log:
+            embed = discord.Embed(title="⚠️ User Report", color=discord.Color.orange())
+            embed.add_field(name="Reported User", value=member.mention)
+            embed.add_field(name="Reported By", value=ctx.author.mention)
+            embed.add_field(name="Reason", value=reason)
+            embed.add_field(name="Channel", value=ctx.channel.mention)
+            await mod_log.send(embed=embed)
+        await ctx.send("✅ Report submitted to moderators", ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(Moderation(bot))
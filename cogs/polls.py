@@ -0,0 +1,73 @@
+import discord
+from discord.ext import commands
+
+from polls import PollManager, PollStore, PollView, poll_embed
+
+
+class Polls(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.manager = PollManager(PollStore(bot.db_path), self.edit_poll)
+
+    async def cog_load(self):
+        # Re-registering replaces the views of a previous load, so buttons reach the new manager
+        for open_poll in self.manager.resume():
+            self.bot.add_view(PollView(self.manager, open_poll), message_id=open_poll.message_id)
+
+    async def cog_unload(self):
+        # Publish votes still waiting on their debounce timer
+        await self.manager.stop()
+        self.manager.store.close()
+
+    async def edit_poll(self, poll, final):
+        message = self.bot.get_partial_messageable(poll.channel_id).get_partial_message(poll.message_id)
+        if final:
+            self.bot.outbound.edit(message, embed=poll_embed(poll), view=PollView(self.manager, poll))
+        else:
+            self.bot.outbound.edit(message, embed=poll_embed(poll))
+
+    async def send_poll(self, ctx, question, options, emojis=None):
+        poll = self.manager.create(ctx.guild.id if ctx.guild else None, ctx.channel.id, ctx.author.id, question, options, emojis)
+        try:
+            poll_msg = await ctx.send(embed=poll_embed(poll), view=PollView(self.manager, poll))
+        except discord.HTTPException:
+            self.manager.discard(poll)
+            raise
+        self.manager.attach(poll, poll_msg.id)
+
+    @commands.hybrid_command(name="poll", description="Create a simple poll", extras={"category": "utility", "limits": "user=2/30,channel=3/30"})
+    async def poll(self, ctx, question: str, options: str):
+        option_list = [option.strip() for option in options.split(",") if option.strip()]
+        if len(option_list) < 2:
+            await ctx.send("You need at least 2 options! Separate them with commas.")
+            return
+        if len(option_list) > 10:
+            await ctx.send("You can only have up to 10 options!")
+            return
+
+        await self.send_poll(ctx, question, option_list)
+
+    @commands.hybrid_command(name="endpoll", description="Close a poll and show the final results", extras={"category": "utility"})
+    async def endpoll(self, ctx, message_id: str):
+        found = self.manager.store.by_message(int(message_id)) if message_id.isdigit() else None
+        # Polls of other guilds, or of other DMs, are treated as missing
+        if ctx.guild is not None:
+            here = found is not None and found.guild_id == ctx.guild.id
+        else:
+            here = found is not None and found.guild_id is None and found.channel_id == ctx.channel.id
+        if not here or found.closed or self.manager.get(found.id) is None:
+            return await ctx.send("❌ No open poll found with that message ID!")
+        poll_channel = self.bot.get_channel(found.channel_id) if ctx.guild is not None else None
+        is_moderator = poll_channel is not None and poll_channel.permissions_for(ctx.author).manage_messages
+        if found.author_id != ctx.author.id and not is_moderator:
+            return await ctx.send("❌ Only the poll creator or a moderator can end this poll!")
+        closed = await self.manager.close_poll(found.id)
+        await ctx.send(f"📊 Poll closed with {closed.total} votes.")
+
+    @commands.hybrid_command(name="quickpoll", description="Create a quick yes/no poll", extras={"category": "fun", "limits": "user=2/30,channel=3/30"})
+    async def quickpoll(self, ctx, *, question: str):
+        await self.send_poll(ctx, question, ["Yes", "No"], ["👍", "👎"])
+
+
+async def setup(bot):
+    await bot.add_cog(Polls(bot))
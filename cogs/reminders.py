@@ -0,0 +1,76 @@
+import discord
+from discord.ext import commands
+
+from reminders import ReminderScheduler, ReminderStore
+
+
+class Reminders(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.scheduler = ReminderScheduler(ReminderStore(bot.db_path), self.deliver_reminder)
+
+    async def cog_load(self):
+        self.scheduler.start()
+
+    async def cog_unload(self):
+        self.scheduler.stop()
+        self.scheduler.store.close()
+
+    async def deliver_reminder(self, row):
+        reminder_id, user_id, channel_id, due_at, message = row
+        await self.bot.wait_until_ready()
+        user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+        remind_embed = discord.Embed(title="⏰ Reminder!", description=message, color=discord.Color.green())
+        try:
+            await user.send(embed=remind_embed)
+        except discord.Forbidden:
+            # DMs are closed, so remind them in the channel the reminder was set in
+            if channel_id is None:
+                raise
+            channel = self.bot.get_partial_messageable(channel_id)
+            await channel.send(f"<@{user_id}>", embed=remind_embed, allowed_mentions=discord.AllowedMentions(users=True))
+
+    @commands.hybrid_command(name="remind", description="Sets a reminder", extras={"category": "utility"})
+    async def remind(self, ctx, time: int, *, reminder: str):
+        reminder_id = self.scheduler.schedule(ctx.author.id, ctx.channel.id, time * 60, reminder)
+        embed = discord.Embed(title="⏰ Reminder Set", color=discord.Color.blue())
+        embed.add_field(name="Reminder", value=reminder)
+        embed.add_field(name="Time", value=f"{time} minutes")
+        embed.set_footer(text=f"Reminder ID: {reminder_id}")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="reminders", description="List your pending reminders", extras={"category": "utility"})
+    async def reminders(self, ctx):
+        pending = self.scheduler.pending(ctx.author.id)
+        if not pending:
+            await ctx.send("You have no pending reminders!")
+            return
+
+        embed = discord.Embed(title="⏰ Your Reminders", color=discord.Color.blue())
+        for reminder_id, due_at, message in pending:
+            embed.add_field(name=f"#{reminder_id}", value=f"{message[:1000]}\nDue <t:{int(due_at)}:R>", inline=False)
+        total = self.scheduler.pending_count(ctx.author.id)
+        if total > len(pending):
+            embed.set_footer(text=f"Showing {len(pending)} of {total} reminders")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="cancelreminder", description="Cancel one of your pending reminders", extras={"category": "utility"})
+    async def cancelreminder(self, ctx, reminder_id: int):
+        if self.scheduler.cancel(reminder_id, ctx.author.id):
+            embed = discord.Embed(title="⏰ Reminder Cancelled", description=f"Reminder #{reminder_id} has been cancelled.", color=discord.Color.green())
+        else:
+            embed = discord.Embed(title="❌ Error", description=f"You have no pending reminder #{reminder_id}.", color=discord.Color.red())
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="remindme", description="Set a reminder with a custom message", extras={"category": "utility"})
+    async def remindme(self, ctx, time: int, *, message: str):
+        reminder_id = self.scheduler.schedule(ctx.author.id, ctx.channel.id, time * 60, message)
+        embed = discord.Embed(title="⏰ Reminder Set", color=discord.Color.blue())
+        embed.add_field(name="Message", value=message)
+        embed.add_field(name="Time", value=f"{time} minutes")
+        embed.set_footer(text=f"Reminder ID: {reminder_id}")
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(Reminders(bot))
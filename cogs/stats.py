@@ -0,0 +1,206 @@
+import asyncio
+import platform
+import typing
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from activity import WINDOWS, ActivityIndex
+from cluster import fetch_peer_stats
+
+
+class Stats(commands.Cog):
+    """Server, member, channel and bot statistics"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.activity = ActivityIndex(bot.db_path)
+        self._loading = {}
+
+    async def cog_load(self):
+        self.activity.start()
+
+    async def cog_unload(self):
+        self.activity.close()
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        if message.guild:
+            self.activity.record(message.channel.id, message.author.id, message.created_at.timestamp(), message.id)
+
+    async def human_bot_counts(self, ctx):
+        """Humans and bots in the guild, loading its member list once if the counters have not seen it"""
+        counters = self.bot.member_counters
+        if not counters.known(ctx.guild.id):
+            await ctx.defer()
+            # Concurrent invocations share one load of the member list
+            loading = self._loading.get(ctx.guild.id)
+            if loading is None:
+                loading = self._loading[ctx.guild.id] = asyncio.ensure_future(self.bot.member_cache.members(ctx.guild))
+                loading.add_done_callback(lambda _, guild_id=ctx.guild.id: self._loading.pop(guild_id, None))
+            members = await asyncio.shield(loading)
+            # The first invocation to resume, or on_ready, may already have seeded it
+            if not counters.known(ctx.guild.id):
+                counters.add_guild(ctx.guild, members)
+        return counters.counts(ctx.guild.id)
+
+    @commands.hybrid_command(name="membercount", description="Shows server member count", extras={"category": "statistics"})
+    async def membercount(self, ctx):
+        humans, bots = await self.human_bot_counts(ctx)
+        embed = discord.Embed(
+            title="👥 Member Count",
+            description=f"Total Members: {ctx.guild.member_count}",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Humans", value=humans)
+        embed.add_field(name="Bots", value=bots)
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="serverstats", description="Shows detailed server statistics", extras={"category": "statistics"})
+    async def serverstats(self, ctx):
+        guild = ctx.guild
+        total_text_channels = len(guild.text_channels)
+        total_voice_channels = len(guild.voice_channels)
+        total_categories = len(guild.categories)
+        total_roles = len(guild.roles)
+        total_emojis = len(guild.emojis)
+
+        humans, bots = await self.human_bot_counts(ctx)
+        embed = discord.Embed(
+            title=f"📊 {guild.name} Statistics",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="👥 Total Members", value=guild.member_count)
+        embed.add_field(name="🧑 Humans", value=humans)
+        embed.add_field(name="🤖 Bots", value=bots)
+        embed.add_field(name="💬 Text Channels", value=total_text_channels)
+        embed.add_field(name="🔊 Voice Channels", value=total_voice_channels)
+        embed.add_field(name="📁 Categories", value=total_categories)
+        embed.add_field(name="👑 Roles", value=total_roles)
+        embed.add_field(name="😀 Emojis", value=total_emojis)
+        embed.add_field(name="🚀 Boost Level", value=guild.premium_tier)
+        embed.add_field(name="💎 Boosts", value=guild.premium_subscription_count)
+        embed.set_thumbnail(url=guild.icon.url if guild.icon else None)
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="botstats", description="Shows bot statistics", extras={"category": "statistics"})
+    async def botstats(self, ctx):
+        stats = self.bot.local_stats()
+        clusters = 1
+        if self.bot.cluster_peers:
+            for peer in await fetch_peer_stats(self.bot.peer_session, self.bot.cluster_peers):
+                if peer:
+                    clusters += 1
+                    for key in ("guilds", "users", "shards"):
+                        stats[key] += peer[key]
+
+        embed = discord.Embed(
+            title="🤖 Bot Statistics",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Servers", value=stats["guilds"])
+        embed.add_field(name="Users", value=stats["users"])
+        embed.add_field(name="Commands", value=len(self.bot.commands))
+        embed.add_field(name="Latency", value=f"{round(self.bot.latency * 1000)}ms")
+        embed.add_field(name="Python Version", value=platform.python_version())
+        embed.add_field(name="Discord.py Version", value=discord.__version__)
+        if self.bot.cluster_peers:
+            embed.add_field(name="Clusters", value=f"{clusters}/{len(self.bot.cluster_peers) + 1} reachable")
+            embed.add_field(name="Shards", value=stats["shards"])
+            embed.set_footer(text=f"Cluster {self.bot.cluster_id} | Users are summed per cluster and may count someone twice")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="countercheck", description="Compare member counters against a full recount", extras={"category": "statistics"})
+    @app_commands.default_permissions(administrator=True)
+    # Checks and reseeds the counters of every guild, and lists them by name
+    @commands.is_owner()
+    async def countercheck(self, ctx, fix: bool = False):
+        # Only guilds with their whole member list in the cache can be recounted
+        guilds = self.bot.guilds if self.bot.member_cache.complete else [guild for guild in self.bot.guilds if guild.chunked and self.bot.member_counters.known(guild.id)]
+        mismatches = self.bot.member_counters.verify(guilds)
+        if not mismatches:
+            embed = discord.Embed(title="✅ Counters Consistent", description=f"Checked {len(guilds)} servers.", color=discord.Color.green())
+            await ctx.send(embed=embed)
+            return
+
+        embed = discord.Embed(title="⚠️ Counter Mismatch", color=discord.Color.orange())
+        for guild, counted, recounted in mismatches[:10]:
+            embed.add_field(
+                name=guild.name if guild else "Unique Users",
+                value=f"Counters: {counted}\nRecount: {recounted}",
+                inline=False
+            )
+        if fix:
+            self.bot.member_counters.seed(guilds)
+            embed.set_footer(text="Counters have been reseeded from the member cache")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="channelstats", description="Show detailed statistics about a channel", extras={"category": "statistics", "limits": "user=2/10,guild=10/60"})
+    async def channelstats(self, ctx, channel: typing.Optional[discord.TextChannel] = None, window: typing.Literal["day", "week", "month", "all"] = "week"):
+        channel = channel or ctx.channel
+        embed = discord.Embed(title=f"📊 Channel Statistics: #{channel.name}", color=discord.Color.blue())
+
+        embed.add_field(name="Channel Type", value=str(channel.type))
+        embed.add_field(name="Created On", value=channel.created_at.strftime("%Y-%m-%d"))
+        embed.add_field(name="Category", value=channel.category.name if channel.category else "None")
+        embed.add_field(name="Position", value=str(channel.position))
+        embed.add_field(name="NSFW", value="Yes" if channel.is_nsfw() else "No")
+        embed.add_field(name="Slowmode", value=f"{channel.slowmode_delay}s")
+
+        # Add top 5 active users
+        top_users = self.activity.top_users(channel.id, WINDOWS[window])
+        if top_users:
+            period = "All Time" if window == "all" else f"Last {window.title()}"
+            embed.add_field(name=f"Most Active Users ({period})",
+                           value="\n".join(f"<@{user_id}>: {count} messages" for user_id, count in top_users),
+                           inline=False)
+
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="channelbackfill", description="Index older messages of a channel for channelstats", extras={"category": "statistics", "limits": "guild=2/300"})
+    @app_commands.default_permissions(manage_guild=True)
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def channelbackfill(self, ctx, channel: typing.Optional[discord.TextChannel] = None, limit: int = 1000):
+        channel = channel or ctx.channel
+        permissions = channel.permissions_for(ctx.author)
+        if not (permissions.read_messages and permissions.read_message_history):
+            await ctx.send(f"❌ You can't read the message history of {channel.mention}!")
+            return
+        progress_msg = await ctx.send(f"🔄 Indexing message history of {channel.mention}...")
+        indexed, finished = await self.activity.backfill(channel, limit=max(1, min(limit, 10000)))
+        if finished:
+            await progress_msg.edit(content=f"✅ Indexed {indexed} messages, the history of {channel.mention} is fully indexed!")
+        else:
+            await progress_msg.edit(content=f"✅ Indexed {indexed} messages, run the command again to continue.")
+
+    @commands.hybrid_command(name="roleinfo", description="Get detailed information about a role", extras={"category": "statistics"})
+    async def roleinfo(self, ctx, role: discord.Role):
+        embed = discord.Embed(title=f"Role Information: {role.name}", color=role.color)
+
+        permissions = [perm[0].replace('_', ' ').title() for perm, value in role.permissions if value]
+        if role.is_default():
+            member_count = ctx.guild.member_count
+        elif self.bot.member_cache.complete or ctx.guild.chunked:
+            member_count = len(role.members)
+        else:
+            await ctx.defer()
+            member_count = sum(1 for member in await self.bot.member_cache.members(ctx.guild) if member.get_role(role.id))
+
+        embed.add_field(name="Role ID", value=str(role.id))
+        embed.add_field(name="Color", value=str(role.color))
+        embed.add_field(name="Position", value=str(role.position))
+        embed.add_field(name="Mentionable", value="Yes" if role.mentionable else "No")
+        embed.add_field(name="Hoisted", value="Yes" if role.hoist else "No")
+        embed.add_field(name="Members", value=str(member_count))
+        if permissions:
+            embed.add_field(name="Key Permissions", value="\n".join(permissions[:10]) + 
+                           (f"\n...and {len(permissions)-10} more" if len(permissions) > 10 else ""),
+                           inline=False)
+
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(Stats(bot))
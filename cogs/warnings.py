@@ -0,0 +1,137 @@
+import datetime
+import os
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from warning_ledger import WarningLedger
+
+WARNING_EXPIRY_DAYS = int(os.getenv('WARNING_EXPIRY_DAYS', '30'))
+SYNC_WARNING_ROLES = os.getenv('SYNC_WARNING_ROLES', '0') == '1'
+WARNING_ROLES = {1: ("First Warning", discord.Color.gold()), 2: ("Second Warning", discord.Color.orange()), 3: ("Final Warning", discord.Color.red())}
+
+
+class Warnings(commands.Cog):
+    """Warnings that expire, with optional warning roles kept in sync"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.ledger = WarningLedger(bot.db_path, on_expire=self.on_warnings_expired)
+
+    async def cog_load(self):
+        self.ledger.start()
+
+    async def cog_unload(self):
+        self.ledger.close()
+
+    async def sync_warning_roles(self, member, warning_count):
+        # Give the member the role matching their active warning count and drop the others
+        wanted_name = WARNING_ROLES[warning_count][0] if warning_count in WARNING_ROLES else None
+        to_remove = [role for role in member.roles if role.name in {name for name, _ in WARNING_ROLES.values()} and role.name != wanted_name]
+        if to_remove:
+            await member.remove_roles(*to_remove)
+        if wanted_name and not discord.utils.get(member.roles, name=wanted_name):
+            role = discord.utils.get(member.guild.roles, name=wanted_name) or await member.guild.create_role(
+                name=wanted_name, color=WARNING_ROLES[warning_count][1]
+            )
+            await member.add_roles(role)
+
+    async def on_warnings_expired(self, affected):
+        if not SYNC_WARNING_ROLES:
+            return
+        await self.bot.wait_until_ready()
+        for guild_id, user_id in affected:
+            guild = self.bot.get_guild(guild_id)
+            member = guild and guild.get_member(user_id)
+            if member:
+                await self.sync_warning_roles(member, self.ledger.active_count(guild_id, user_id))
+
+    @commands.hybrid_command(name="warn", description="Warn a member", extras={"category": "moderation"})
+    @app_commands.default_permissions(kick_members=True)
+    @commands.guild_only()
+    @commands.has_permissions(kick_members=True)
+    async def warn(self, ctx, member: discord.Member, *, reason: str):
+        # Check for role hierarchy
+        if member.top_role >= ctx.author.top_role:
+            embed = discord.Embed(title="❌ Error", description="You cannot warn someone with a higher or equal role!", color=discord.Color.red())
+            await ctx.send(embed=embed)
+            return
+
+        warning_id, warning_count = self.ledger.add(
+            ctx.guild.id, member.id, ctx.author.id, reason,
+            expires_in=WARNING_EXPIRY_DAYS * 86400 if WARNING_EXPIRY_DAYS > 0 else None
+        )
+
+        if warning_count <= 3:
+            action = f"Received Warning #{warning_count}"
+        else:
+            # Fourth warning results in timeout
+            await member.timeout(datetime.timedelta(minutes=10), reason="Exceeded warning limit")
+            action = "Timed out for 10 minutes (Warning limit exceeded)"
+        if SYNC_WARNING_ROLES:
+            await self.sync_warning_roles(member, min(warning_count, 3))
+
+        embed = discord.Embed(title="⚠️ Warning System", color=discord.Color.yellow())
+        embed.add_field(name="Member", value=member.mention)
+        embed.add_field(name="Warning #", value=str(warning_count))
+        embed.add_field(name="Action", value=action)
+        embed.add_field(name="Reason", value=reason)
+        embed.add_field(name="Moderator", value=ctx.author.mention)
+        embed.set_footer(text=f"Warning ID: {warning_id}")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="unwarn", description="Remove a warning from a member", extras={"category": "moderation"})
+    @app_commands.default_permissions(kick_members=True)
+    @commands.guild_only()
+    @commands.has_permissions(kick_members=True)
+    async def unwarn(self, ctx, member: discord.Member):
+        removed = self.ledger.remove_latest(ctx.guild.id, member.id)
+
+        if removed:
+            warning_id, reason, remaining = removed
+            if SYNC_WARNING_ROLES:
+                await self.sync_warning_roles(member, min(remaining, 3))
+            embed = discord.Embed(title="Warning Removed", color=discord.Color.green())
+            embed.add_field(name="Member", value=member.mention)
+            embed.add_field(name="Removed Warning", value=f"#{warning_id}: {reason}"[:1024])
+            embed.add_field(name="Remaining Warnings", value=str(remaining))
+            embed.add_field(name="Moderator", value=ctx.author.mention)
+        else:
+            embed = discord.Embed(title="No Warnings", color=discord.Color.blue())
+            embed.description = f"{member.mention} has no warnings to remove."
+
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="warnings", description="Show a member's warning history", extras={"category": "moderation"})
+    @app_commands.default_permissions(kick_members=True)
+    @commands.guild_only()
+    @commands.has_permissions(kick_members=True)
+    async def warnings_history(self, ctx, member: discord.Member, page: int = 1):
+        rows, total = self.ledger.history(ctx.guild.id, member.id, page)
+        pages = max(1, (total + 4) // 5)
+        if not rows:
+            embed = discord.Embed(title="No Warnings", color=discord.Color.blue())
+            embed.description = f"{member.mention} has no warnings on page {page}." if total else f"{member.mention} has no warnings."
+            await ctx.send(embed=embed)
+            return
+
+        embed = discord.Embed(title=f"⚠️ Warnings for {member.name}", color=discord.Color.yellow())
+        for warning_id, moderator_id, reason, created_at, expires_at, active in rows:
+            if not active:
+                status = "Removed or expired"
+            elif expires_at:
+                status = f"Expires <t:{int(expires_at)}:R>"
+            else:
+                status = "Active"
+            embed.add_field(
+                name=f"#{warning_id} - {datetime.datetime.utcfromtimestamp(created_at).strftime('%Y-%m-%d')}",
+                value=f"{reason}\nModerator: <@{moderator_id}>\n{status}"[:1024],
+                inline=False
+            )
+        embed.set_footer(text=f"Page {min(page, pages)}/{pages} | Active warnings: {self.ledger.active_count(ctx.guild.id, member.id)}")
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(Warnings(bot))
@@ -0,0 +1,49 @@
+import os
+
+import discord
+from discord.ext import commands
+
+from weather import FORECAST_URL, GEOCODE_URL, OpenMeteoBackend, WeatherService, WeatherUnavailable
+
+
+class Weather(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.service = WeatherService(OpenMeteoBackend(
+            bot.http_client,
+            os.getenv('WEATHER_GEOCODE_URL', GEOCODE_URL),
+            os.getenv('WEATHER_FORECAST_URL', FORECAST_URL)
+        ))
+
+    async def cog_load(self):
+        self.bot.metrics.add_collector(self.service.render_metrics)
+
+    async def cog_unload(self):
+        self.bot.metrics.remove_collector(self.service.render_metrics)
+
+    @commands.hybrid_command(name="weather", description="Get current weather info", extras={"category": "server"})
+    async def weather(self, ctx, *, location: str):
+        try:
+            report, age = await self.service.get(location)
+        except WeatherUnavailable:
+            await ctx.send("❌ The weather service is unavailable right now, try again later!")
+            return
+        if report is None:
+            await ctx.send(f"❌ Couldn't find a place called `{location}`!")
+            return
+
+        embed = discord.Embed(
+            title=f"{report.emoji} Weather in {report.place}",
+            description=report.description,
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Temperature", value=f"{report.temperature:.1f}°C")
+        embed.add_field(name="Feels Like", value=f"{report.feels_like:.1f}°C")
+        embed.add_field(name="Humidity", value=f"{report.humidity}%")
+        embed.add_field(name="Wind", value=f"{report.wind_speed:.1f} km/h")
+        embed.set_footer(text=f"Open-Meteo • updated {int(age // 60)} min ago" if age >= 60 else "Open-Meteo • live")
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(Weather(bot))
@@ -0,0 +1,92 @@
+class MemberCounters:
+    """Running human/bot counts per guild and unique users across all guilds
+
+    Seeded once from the member cache and then maintained from member join and
+    remove events, so reading a count never walks a member list. Guilds that
+    were never seeded, because their member list has not been loaded yet, are
+    not counted at all. The ids counted per guild are kept, so duplicate events
+    are ignored and removing a guild releases exactly the users it counted,
+    whether or not they are still in the member cache.
+    """
+
+    def __init__(self):
+        self.humans = {}
+        self.bots = {}
+        self._members = {}
+        self._guilds_per_user = {}
+
+    @property
+    def unique_users(self):
+        return len(self._guilds_per_user)
+
+    def known(self, guild_id):
+        return guild_id in self._members
+
+    def counts(self, guild_id):
+        return self.humans.get(guild_id, 0), self.bots.get(guild_id, 0)
+
+    def seed(self, guilds):
+        self.humans.clear()
+        self.bots.clear()
+        self._members.clear()
+        self._guilds_per_user.clear()
+        for guild in guilds:
+            self.add_guild(guild)
+
+    def add_guild(self, guild, members=None):
+        """Seed a guild from `members`, by default its member cache"""
+        self.humans.setdefault(guild.id, 0)
+        self.bots.setdefault(guild.id, 0)
+        self._members.setdefault(guild.id, set())
+        for member in guild.members if members is None else members:
+            self.add_member(guild.id, member)
+
+    def remove_guild(self, guild):
+        for user_id in self._members.pop(guild.id, ()):
+            self._release_user(user_id)
+        self.humans.pop(guild.id, None)
+        self.bots.pop(guild.id, None)
+
+    def add_member(self, guild_id, member):
+        ids = self._members.get(guild_id)
+        if ids is None or member.id in ids:
+            return
+        ids.add(member.id)
+        counter = self.bots if member.bot else self.humans
+        counter[guild_id] = counter.get(guild_id, 0) + 1
+        self._guilds_per_user[member.id] = self._guilds_per_user.get(member.id, 0) + 1
+
+    def remove_member(self, guild_id, member):
+        ids = self._members.get(guild_id)
+        if ids is None or member.id not in ids:
+            return
+        ids.remove(member.id)
+        counter = self.bots if member.bot else self.humans
+        counter[guild_id] = max(0, counter.get(guild_id, 0) - 1)
+        self._release_user(member.id)
+
+    def _release_user(self, user_id):
+        remaining = self._guilds_per_user.get(user_id, 0) - 1
+        if remaining > 0:
+            self._guilds_per_user[user_id] = remaining
+        else:
+            self._guilds_per_user.pop(user_id, None)
+
+    def verify(self, guilds):
+        """Recount everything from the member cache and return any mismatches"""
+        mismatches = []
+        users = set()
+        for guild in guilds:
+            humans = bots = 0
+            for member in guild.members:
+                users.add(member.id)
+                if member.bot:
+                    bots += 1
+                else:
+                    humans += 1
+            if (humans, bots) != self.counts(guild.id):
+                mismatches.append((guild, self.counts(guild.id), (humans, bots)))
+        # Unique users can only be recounted when every counted guild was checked
+        if len(guilds) == len(self.humans) and len(users) != self.unique_users:
+            mismatches.append((None, self.unique_users, len(users)))
+        return mismatches
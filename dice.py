@@ -0,0 +1,290 @@
+import functools
+import random
+import re
+from collections import Counter
+
+MAX_LENGTH = 100
+MAX_DICE = 1_000_000
+MAX_SIDES = 1_000_000
+# Rounds of rerolls per group before exploding dice stop; a d2 keeps exploding for a while
+MAX_EXPLOSIONS = 100
+# Groups of up to this many dice list every die, larger ones are summarised
+SHOWN_DICE = 30
+# Up to this many sides, bulk rolls come from random bytes counted per face;
+# above it random.choices plus a Counter is cheaper than one count per face
+BYTE_SIDES = 100
+
+TOKEN = re.compile(r"(?P<dice>(?P<count>\d*)d(?P<sides>\d+|%)(?P<mods>(?:!|[kd][hl]?\d+)*))|(?P<number>\d+)|(?P<op>[-+*/()])")
+MODIFIER = re.compile(r"(!)|([kd][hl]?)(\d+)")
+KEEP_MODES = {"k": "kh", "d": "dl", "kh": "kh", "kl": "kl", "dh": "dh", "dl": "dl"}
+
+
+class DiceError(ValueError):
+    pass
+
+
+class Group:
+    """One NdS term of an expression, with its keep/drop and explode modifiers"""
+
+    __slots__ = ("notation", "count", "sides", "keep", "explode")
+
+    def __init__(self, notation, count, sides, keep, explode):
+        self.notation = notation
+        self.count = count
+        self.sides = sides
+        self.keep = keep
+        self.explode = explode
+
+    def roll(self, rng):
+        if self.count <= SHOWN_DICE:
+            return self._roll_each(rng)
+        return self._roll_bulk(rng)
+
+    def _roll_each(self, rng):
+        values = rng.choices(range(1, self.sides + 1), k=self.count)
+        if self.explode:
+            for i, value in enumerate(values):
+                rolled, rounds = value, 0
+                while rolled == self.sides and rounds < MAX_EXPLOSIONS:
+                    rolled = rng.randint(1, self.sides)
+                    value += rolled
+                    rounds += 1
+                values[i] = value
+        dropped = set()
+        if self.keep:
+            mode, n = self.keep
+            order = sorted(range(len(values)), key=values.__getitem__, reverse=mode in ("kh", "dh"))
+            dropped = set(order[n:] if mode in ("kh", "kl") else order[:n])
+        total = sum(value for i, value in enumerate(values) if i not in dropped)
+        return GroupRoll(self.notation, total, len(values), values=values, dropped=dropped)
+
+    def _roll_bulk(self, rng):
+        tally = _tally(self.count, self.sides, rng)
+        if self.explode:
+            pending, base = tally.pop(self.sides, 0), self.sides
+            for _ in range(MAX_EXPLOSIONS):
+                if not pending:
+                    break
+                rerolled = _tally(pending, self.sides, rng)
+                pending = rerolled.pop(self.sides, 0)
+                for face, n in rerolled.items():
+                    tally[base + face] += n
+                base += self.sides
+            if pending:
+                tally[base] += pending
+        if self.keep:
+            mode, n = self.keep
+            tally = _keep(tally, n if mode in ("kh", "kl") else self.count - n, highest=mode in ("kh", "dl"))
+        total = sum(value * n for value, n in tally.items())
+        return GroupRoll(self.notation, total, self.count, tally=tally)
+
+
+class GroupRoll:
+    """The outcome of rolling a Group: every die for small groups, a {value: dice} tally for bulk ones"""
+
+    __slots__ = ("notation", "total", "rolled", "values", "dropped", "tally")
+
+    def __init__(self, notation, total, rolled, values=None, dropped=(), tally=None):
+        self.notation = notation
+        self.total = total
+        self.rolled = rolled
+        self.values = values
+        self.dropped = dropped
+        self.tally = tally
+
+    def describe(self):
+        if self.values is not None:
+            dice = ", ".join(f"~~{value}~~" if i in self.dropped else str(value) for i, value in enumerate(self.values))
+            return f"{self.notation}: {dice} = **{self.total:,}**"
+        kept = sum(self.tally.values())
+        low, high = min(self.tally), max(self.tally)
+        return (f"{self.notation}: {self.rolled:,} dice, {kept:,} kept, "
+                f"min {low}, max {high}, mean {self.total / kept:.2f} = **{self.total:,}**")
+
+
+class DiceRoll:
+    __slots__ = ("expression", "total", "groups")
+
+    def __init__(self, expression, total, groups):
+        self.expression = expression
+        self.total = total
+        self.groups = groups
+
+
+class DiceExpression:
+    """A parsed expression such as 4d6kh3+2d8+5, rolled again on every roll() call
+
+    Dice groups are NdS (N defaults to 1, d% is d100) followed by any of kh/k,
+    kl, dh and dl/d with a number to keep or drop the highest or lowest dice,
+    and ! to reroll and add every die that shows its highest face. Groups and
+    numbers combine with + - * / and parentheses; / rounds down.
+    """
+
+    __slots__ = ("text", "tree", "dice")
+
+    def __init__(self, text, tree, dice):
+        self.text = text
+        self.tree = tree
+        self.dice = dice
+
+    def roll(self, rng=random):
+        groups = []
+        total = _evaluate(self.tree, rng, groups)
+        return DiceRoll(self.text, total, groups)
+
+
+def parse_dice(expression):
+    """Parse a dice expression, raising DiceError if it is invalid or too large"""
+    text = "".join(expression.lower().split())
+    if not text:
+        raise DiceError("Empty dice expression")
+    if len(text) > MAX_LENGTH:
+        raise DiceError(f"Dice expressions are limited to {MAX_LENGTH} characters")
+    return _parse(text)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse(text):
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        if match is None:
+            raise DiceError(f"Unexpected `{text[position:]}` in `{text}`")
+        tokens.append(match)
+        position = match.end()
+    parser = _Parser(text, tokens)
+    tree = parser.expression()
+    if parser.position < len(tokens):
+        raise DiceError(f"Unexpected `{tokens[parser.position].group()}` in `{text}`")
+    if parser.dice > MAX_DICE:
+        raise DiceError(f"At most {MAX_DICE:,} dice can be rolled at once")
+    return DiceExpression(text, tree, parser.dice)
+
+
+class _Parser:
+    # expression := term (("+" | "-") term)*
+    # term := factor (("*" | "/") factor)*
+    # factor := "-" factor | "(" expression ")" | number | dice
+
+    def __init__(self, text, tokens):
+        self.text = text
+        self.tokens = tokens
+        self.position = 0
+        self.dice = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]["op"]
+        return None
+
+    def expression(self):
+        tree = self.term()
+        while self.peek() in ("+", "-"):
+            self.position += 1
+            tree = (self.tokens[self.position - 1]["op"], tree, self.term())
+        return tree
+
+    def term(self):
+        tree = self.factor()
+        while self.peek() in ("*", "/"):
+            self.position += 1
+            tree = (self.tokens[self.position - 1]["op"], tree, self.factor())
+        return tree
+
+    def factor(self):
+        if self.position >= len(self.tokens):
+            raise DiceError(f"`{self.text}` ends unexpectedly")
+        token = self.tokens[self.position]
+        self.position += 1
+        if token["op"] == "-":
+            return ("neg", self.factor())
+        if token["op"] == "(":
+            tree = self.expression()
+            if self.peek() != ")":
+                raise DiceError(f"Missing `)` in `{self.text}`")
+            self.position += 1
+            return tree
+        if token["number"]:
+            return int(token["number"])
+        if token["dice"]:
+            return self.group(token)
+        raise DiceError(f"Unexpected `{token.group()}` in `{self.text}`")
+
+    def group(self, token):
+        count = int(token["count"] or 1)
+        sides = 100 if token["sides"] == "%" else int(token["sides"])
+        if count < 1 or sides < 1:
+            raise DiceError(f"`{token.group()}` needs at least one die with at least one side")
+        if sides > MAX_SIDES:
+            raise DiceError(f"Dice have at most {MAX_SIDES:,} sides")
+        keep, explode = None, False
+        for modifier in MODIFIER.finditer(token["mods"]):
+            if modifier[1]:
+                if sides == 1:
+                    raise DiceError("A d1 would explode forever")
+                explode = True
+                continue
+            if keep:
+                raise DiceError(f"`{token.group()}` can only keep or drop once")
+            mode, n = KEEP_MODES[modifier[2]], int(modifier[3])
+            if not 0 < (n if mode in ("kh", "kl") else count - n) <= count:
+                raise DiceError(f"`{token.group()}` has to keep between 1 and {count} dice")
+            keep = (mode, n)
+        self.dice += count
+        return Group(token.group(), count, sides, keep, explode)
+
+
+def _evaluate(tree, rng, groups):
+    if isinstance(tree, int):
+        return tree
+    if isinstance(tree, Group):
+        rolled = tree.roll(rng)
+        groups.append(rolled)
+        return rolled.total
+    if tree[0] == "neg":
+        return -_evaluate(tree[1], rng, groups)
+    op, left, right = tree
+    left, right = _evaluate(left, rng, groups), _evaluate(right, rng, groups)
+    if op == "+":
+        return left + right
+    if op == "-":
+        return left - right
+    if op == "*":
+        return left * right
+    if right == 0:
+        raise DiceError("Division by zero")
+    return left // right
+
+
+@functools.lru_cache(maxsize=BYTE_SIDES)
+def _byte_table(sides):
+    # Maps a random byte to face - 1, or to 255 for the top 256 % sides bytes, which would bias the low faces
+    accepted = 256 - 256 % sides
+    return bytes(byte % sides if byte < accepted else 255 for byte in range(256))
+
+
+def _tally(count, sides, rng):
+    """Roll `count` dice in bulk, as a Counter of face -> dice showing it"""
+    if sides > BYTE_SIDES:
+        return Counter(rng.choices(range(1, sides + 1), k=count))
+    table = _byte_table(sides)
+    tally = Counter()
+    while count:
+        data = rng.randbytes(count).translate(table)
+        for face in range(sides):
+            n = data.count(face)
+            if n:
+                tally[face + 1] += n
+                count -= n
+    return tally
+
+
+def _keep(tally, n, highest):
+    kept = Counter()
+    for value in sorted(tally, reverse=highest):
+        if n <= 0:
+            break
+        kept[value] = min(tally[value], n)
+        n -= kept[value]
+    return kept
@@ -0,0 +1,40 @@
+import json
+import time
+
+# Session bookkeeping, and member chunks answering the bot's own requests, which the replaying gateway sends itself
+SKIPPED_EVENTS = frozenset({"READY", "RESUMED", "GUILD_MEMBERS_CHUNK"})
+
+
+class GatewayRecorder:
+    """Appends the gateway dispatches the bot receives to a JSON lines file
+
+    Each line is {"at": seconds since recording started, "t": event name,
+    "d": payload}, the format benchmarks/bench_gateway.py replays. Recordings
+    hold message content and member data, so keep them private.
+    """
+
+    def __init__(self, path, events=None):
+        self.path = path
+        self.events = frozenset(events) if events else None
+        self.recorded = 0
+        self.started = time.monotonic()
+        self._file = open(path, "a", buffering=1, encoding="utf-8")
+
+    def record(self, raw):
+        """Record one raw gateway message, as passed to on_socket_raw_receive"""
+        payload = json.loads(raw)
+        event = payload.get("t")
+        if payload.get("op") != 0 or event in SKIPPED_EVENTS or (self.events and event not in self.events):
+            return
+        at = round(time.monotonic() - self.started, 4)
+        self._file.write(json.dumps({"at": at, "t": event, "d": payload["d"]}, separators=(",", ":")) + "\n")
+        self.recorded += 1
+
+    def close(self):
+        self._file.close()
+
+
+def load_recording(path):
+    """Read a recording back as a list of (event name, payload) pairs in recorded order"""
+    with open(path, encoding="utf-8") as f:
+        return [(entry["t"], entry["d"]) for entry in map(json.loads, f) if entry.get("t")]
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import random
+import sqlite3
+import time
+
+log = logging.getLogger(__name__)
+
+GIVEAWAY_EMOJI = "🎉"
+
+
+class EntrantSet:
+    """Set of user ids with O(1) add, remove and random pick"""
+
+    def __init__(self, user_ids=()):
+        self._users = []
+        self._index = {}
+        for user_id in user_ids:
+            self.add(user_id)
+
+    def __len__(self):
+        return len(self._users)
+
+    def __contains__(self, user_id):
+        return user_id in self._index
+
+    def add(self, user_id):
+        if user_id in self._index:
+            return False
+        self._index[user_id] = len(self._users)
+        self._users.append(user_id)
+        return True
+
+    def remove(self, user_id):
+        i = self._index.pop(user_id, None)
+        if i is None:
+            return False
+        last = self._users.pop()
+        if last != user_id:
+            self._users[i] = last
+            self._index[last] = i
+        return True
+
+    def draw(self, count, exclude=()):
+        """Pick up to `count` distinct users that are not in `exclude`"""
+        exclude = set(exclude)
+        available = len(self._users) - sum(1 for user_id in exclude if user_id in self._index)
+        count = min(count, available)
+        # Rejection sampling stays O(count) while the pool is much larger than the draw
+        if count * 2 < available:
+            picked = set()
+            while len(picked) < count:
+                user_id = self._users[random.randrange(len(self._users))]
+                if user_id not in exclude:
+                    picked.add(user_id)
+            return list(picked)
+        return random.sample([u for u in self._users if u not in exclude], count)
+
+
+class Giveaway:
+    __slots__ = ("message_id", "guild_id", "channel_id", "host_id", "prize", "winners", "ends_at", "ended", "winner_ids")
+
+    def __init__(self, message_id, guild_id, channel_id, host_id, prize, winners, ends_at, ended=False, winner_ids=""):
+        self.message_id = message_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.host_id = host_id
+        self.prize = prize
+        self.winners = winners
+        self.ends_at = ends_at
+        self.ended = bool(ended)
+        self.winner_ids = [int(i) for i in winner_ids.split(",") if i] if isinstance(winner_ids, str) else list(winner_ids)
+
+
+class GiveawayStore:
+    """SQLite backed storage for giveaways and their entrants"""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS giveaways ("
+            "message_id INTEGER PRIMARY KEY, guild_id INTEGER, channel_id INTEGER NOT NULL, "
+            "host_id INTEGER, prize TEXT NOT NULL, winners INTEGER NOT NULL, ends_at REAL NOT NULL, "
+            "ended INTEGER NOT NULL DEFAULT 0, winner_ids TEXT NOT NULL DEFAULT '')"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS giveaway_entries ("
+            "message_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+            "PRIMARY KEY (message_id, user_id)) WITHOUT ROWID"
+        )
+        self.db.commit()
+
+    def add(self, giveaway):
+        self.db.execute(
+            "INSERT INTO giveaways (message_id, guild_id, channel_id, host_id, prize, winners, ends_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (giveaway.message_id, giveaway.guild_id, giveaway.channel_id, giveaway.host_id,
+             giveaway.prize, giveaway.winners, giveaway.ends_at)
+        )
+        self.db.commit()
+
+    def get(self, message_id):
+        row = self.db.execute(
+            "SELECT message_id, guild_id, channel_id, host_id, prize, winners, ends_at, ended, winner_ids "
+            "FROM giveaways WHERE message_id = ?", (message_id,)
+        ).fetchone()
+        return Giveaway(*row) if row else None
+
+    def active(self):
+        rows = self.db.execute(
+            "SELECT message_id, guild_id, channel_id, host_id, prize, winners, ends_at, ended, winner_ids "
+            "FROM giveaways WHERE ended = 0"
+        ).fetchall()
+        return [Giveaway(*row) for row in rows]
+
+    def entrants(self, message_id):
+        return [row[0] for row in self.db.execute("SELECT user_id FROM giveaway_entries WHERE message_id = ?", (message_id,))]
+
+    def add_entry(self, message_id, user_id):
+        self.db.execute("INSERT OR IGNORE INTO giveaway_entries (message_id, user_id) VALUES (?, ?)", (message_id, user_id))
+        self.db.commit()
+
+    def remove_entry(self, message_id, user_id):
+        self.db.execute("DELETE FROM giveaway_entries WHERE message_id = ? AND user_id = ?", (message_id, user_id))
+        self.db.commit()
+
+    def finish(self, message_id, winner_ids):
+        self.db.execute(
+            "UPDATE giveaways SET ended = 1, winner_ids = ? WHERE message_id = ?",
+            (",".join(map(str, winner_ids)), message_id)
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+class GiveawayManager:
+    """Tracks giveaway entrants from reaction events and draws winners locally
+
+    Entrants of running giveaways are kept in memory and mirrored to the store,
+    so ending or rerolling a giveaway never needs to fetch reactions from Discord.
+    Each running giveaway holds a single loop timer rather than a sleeping task.
+    """
+
+    def __init__(self, store, announce):
+        self.store = store
+        self.announce = announce
+        self._active = {}
+        self._entrants = {}
+        self._timers = {}
+        self._ending = set()
+
+    def is_active(self, message_id):
+        return message_id in self._active
+
+    def resume(self):
+        """Reload running giveaways after a restart and re-arm their timers"""
+        for giveaway in self.store.active():
+            self._track(giveaway, self.store.entrants(giveaway.message_id))
+
+    def start(self, giveaway):
+        self.store.add(giveaway)
+        self._track(giveaway, ())
+
+    def _track(self, giveaway, entrants):
+        self._active[giveaway.message_id] = giveaway
+        self._entrants[giveaway.message_id] = EntrantSet(entrants)
+        loop = asyncio.get_running_loop()
+        delay = max(0, giveaway.ends_at - time.time())
+        self._timers[giveaway.message_id] = loop.call_later(delay, self._end_later, giveaway.message_id)
+
+    def _end_later(self, message_id):
+        task = asyncio.create_task(self.end(message_id))
+        self._ending.add(task)
+        task.add_done_callback(self._ending.discard)
+
+    def add_entry(self, message_id, user_id):
+        entrants = self._entrants.get(message_id)
+        if entrants is not None and entrants.add(user_id):
+            self.store.add_entry(message_id, user_id)
+
+    def remove_entry(self, message_id, user_id):
+        entrants = self._entrants.get(message_id)
+        if entrants is not None and entrants.remove(user_id):
+            self.store.remove_entry(message_id, user_id)
+
+    def entry_count(self, message_id):
+        entrants = self._entrants.get(message_id)
+        return len(entrants) if entrants is not None else len(self.store.entrants(message_id))
+
+    async def end(self, message_id, guild_id=None):
+        """End a running giveaway; with `guild_id`, only one that was started in that guild"""
+        giveaway = self._active.get(message_id)
+        if giveaway is None or (guild_id is not None and giveaway.guild_id != guild_id):
+            return None
+        del self._active[message_id]
+        timer = self._timers.pop(message_id, None)
+        if timer:
+            timer.cancel()
+        entrants = self._entrants.pop(message_id)
+        giveaway.winner_ids = entrants.draw(giveaway.winners)
+        giveaway.ended = True
+        self.store.finish(message_id, giveaway.winner_ids)
+        try:
+            await self.announce(giveaway, giveaway.winner_ids)
+        except Exception as e:
+            log.warning("Failed to announce giveaway %s: %s", message_id, e)
+        return giveaway
+
+    def reroll(self, message_id, count=1, guild_id=None):
+        """Draw new winners for an ended giveaway, skipping everyone who already won"""
+        giveaway = self.store.get(message_id)
+        if giveaway is None or not giveaway.ended or (guild_id is not None and giveaway.guild_id != guild_id):
+            return None, []
+        entrants = EntrantSet(self.store.entrants(message_id))
+        new_winners = entrants.draw(count, exclude=giveaway.winner_ids)
+        giveaway.winner_ids += new_winners
+        self.store.finish(message_id, giveaway.winner_ids)
+        return giveaway, new_winners
+
+    async def stop(self):
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        # Giveaways that are already ending still record their winners before the store closes
+        if self._ending:
+            await asyncio.gather(*self._ending, return_exceptions=True)
@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+import ipaddress
+import socket
+import time
+from collections import OrderedDict
+from urllib.parse import urljoin, urlsplit
+
+import aiohttp
+
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+class DownloadError(Exception):
+    """A URL could not be fetched within the client's limits; the message is safe to show users"""
+
+
+def sniff_image(data):
+    """Return the image type from the file's magic bytes, or None"""
+    for signature, content_type in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return content_type
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def _checked(data, content_type, max_bytes, image):
+    """Apply one fetch's limits to a body, whether it was just downloaded or cached"""
+    if len(data) > max_bytes:
+        raise DownloadError(f"The file is larger than {max_bytes // 1024} KiB")
+    if image:
+        content_type = sniff_image(data)
+        if content_type is None:
+            raise DownloadError("The URL does not point to a PNG, JPEG, GIF or WebP image")
+    return content_type
+
+
+def _is_public(host):
+    try:
+        return ipaddress.ip_address(host).is_global
+    except ValueError:
+        return True
+
+
+class PublicResolver(aiohttp.ThreadedResolver):
+    """Drops private, loopback and link-local addresses so user URLs cannot reach internal services"""
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        hosts = [entry for entry in await super().resolve(host, port, family) if _is_public(entry["host"])]
+        if not hosts:
+            raise OSError(f"{host} does not resolve to a public address")
+        return hosts
+
+
+class Download:
+    __slots__ = ("url", "data", "content_type", "digest", "cached")
+
+    def __init__(self, url, data, content_type, digest, cached=False):
+        self.url = url
+        self.data = data
+        self.content_type = content_type
+        self.digest = digest
+        self.cached = cached
+
+
+class CacheEntry:
+    __slots__ = ("digest", "content_type", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, digest, content_type, etag, last_modified, fetched_at):
+        self.digest = digest
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+
+class HttpClient:
+    """One pooled aiohttp session for every outbound fetch of user-supplied URLs
+
+    `fetch` streams the body and aborts as soon as it passes `max_bytes`, so a
+    huge or endless response never sits in memory. Bodies are kept in a small
+    LRU keyed by their sha256; URLs point at digests, so a URL fetched again
+    within `fresh_for` seconds costs nothing, after that it is revalidated with
+    ETag/Last-Modified, and different URLs serving the same file share one copy.
+    Cached bodies are checked against each call's `max_bytes` and `image` again.
+    """
+
+    def __init__(self, timeout=10, max_bytes=8 * 1024 * 1024, cache_bytes=32 * 1024 * 1024,
+                 cache_urls=256, fresh_for=300, max_redirects=3, allow_private=False):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.cache_bytes = cache_bytes
+        self.cache_urls = cache_urls
+        self.fresh_for = fresh_for
+        self.max_redirects = max_redirects
+        self.allow_private = allow_private
+        self.session = None
+        self._blobs = OrderedDict()
+        self._blob_bytes = 0
+        self._urls = OrderedDict()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    async def start(self):
+        if self.session is None or self.session.closed:
+            resolver = None if self.allow_private else PublicResolver()
+            connector = aiohttp.TCPConnector(limit=100, limit_per_host=10, ttl_dns_cache=300, resolver=resolver)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": "DiscordBot (aiohttp)"}
+            )
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _cached(self, url, entry, max_bytes, image):
+        data = self._blobs.get(entry.digest)
+        if data is None:
+            return None
+        content_type = _checked(data, entry.content_type, max_bytes, image)
+        self._blobs.move_to_end(entry.digest)
+        self._urls.move_to_end(url)
+        return Download(url, data, content_type, entry.digest, cached=True)
+
+    def _store(self, url, data, content_type, etag, last_modified):
+        digest = hashlib.sha256(data).hexdigest()
+        if len(data) <= self.cache_bytes // 4:
+            if digest not in self._blobs:
+                self._blobs[digest] = data
+                self._blob_bytes += len(data)
+            self._blobs.move_to_end(digest)
+            while self._blob_bytes > self.cache_bytes:
+                _, evicted = self._blobs.popitem(last=False)
+                self._blob_bytes -= len(evicted)
+            self._urls[url] = CacheEntry(digest, content_type, etag, last_modified, time.monotonic())
+            self._urls.move_to_end(url)
+            while len(self._urls) > self.cache_urls:
+                self._urls.popitem(last=False)
+        return Download(url, data, content_type, digest)
+
+    async def fetch(self, url, max_bytes=None, image=False):
+        """Download `url`, raising DownloadError if it is too big, too slow or (with `image`) not an image"""
+        max_bytes = max_bytes or self.max_bytes
+        entry = self._urls.get(url)
+        if entry is not None and time.monotonic() - entry.fetched_at < self.fresh_for:
+            cached = self._cached(url, entry, max_bytes, image)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+        headers = {}
+        if entry is not None and entry.digest in self._blobs:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        session = await self.start()
+        target = url
+        try:
+            for _ in range(self.max_redirects + 1):
+                parts = urlsplit(target)
+                if parts.scheme not in ("http", "https") or not parts.hostname:
+                    raise DownloadError("Only http and https URLs are supported")
+                if not self.allow_private and not _is_public(parts.hostname):
+                    raise DownloadError("That URL points to a private address")
+                async with session.get(target, headers=headers, allow_redirects=False) as resp:
+                    if resp.status in REDIRECT_STATUSES and "Location" in resp.headers:
+                        target = urljoin(target, resp.headers["Location"])
+                        continue
+                    if resp.status == 304 and entry is not None:
+                        entry.fetched_at = time.monotonic()
+                        cached = self._cached(url, entry, max_bytes, image)
+                        if cached is not None:
+                            self.revalidated += 1
+                            return cached
+                    if resp.status != 200:
+                        raise DownloadError(f"The server answered with HTTP {resp.status}")
+                    if resp.content_length is not None and resp.content_length > max_bytes:
+                        raise DownloadError(f"The file is larger than {max_bytes // 1024} KiB")
+                    data = bytearray()
+                    async for chunk in resp.content.iter_chunked(64 * 1024):
+                        data += chunk
+                        if len(data) > max_bytes:
+                            raise DownloadError(f"The file is larger than {max_bytes // 1024} KiB")
+                    data = bytes(data)
+                    content_type = _checked(data, resp.content_type, max_bytes, image)
+                    self.misses += 1
+                    return self._store(url, data, content_type, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+            raise DownloadError("Too many redirects")
+        except asyncio.TimeoutError:
+            raise DownloadError(f"The download took longer than {self.timeout}s") from None
+        except (aiohttp.ClientError, OSError) as e:
+            raise DownloadError(f"Could not download the file: {e}") from None
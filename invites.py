@@ -0,0 +1,217 @@
+import asyncio
+import heapq
+import logging
+import sqlite3
+import time
+
+import discord
+
+log = logging.getLogger(__name__)
+
+
+class CachedInvite:
+    __slots__ = ("code", "inviter_id", "uses", "max_uses")
+
+    def __init__(self, code, inviter_id, uses, max_uses):
+        self.code = code
+        self.inviter_id = inviter_id
+        self.uses = uses
+        self.max_uses = max_uses
+
+    @classmethod
+    def from_invite(cls, invite):
+        return cls(invite.code, invite.inviter.id if invite.inviter else None, invite.uses or 0, invite.max_uses or 0)
+
+
+class InviteTracker:
+    """Per-guild invite cache with a per-inviter use index and join attribution
+
+    Each guild's invites are fetched once, then kept current from invite
+    create/delete events and from a use-count diff after member joins. Joins
+    within `join_window` seconds of each other share one fetch and one diff, so
+    a raid costs one REST call per window instead of one per member; a batch is
+    only attributed when a single invite accounts for all of its joins.
+    `uses_by` and `leaderboard` read the in-memory index and never hit the API.
+    Attributed joins are stored in SQLite so "who invited whom" survives restarts.
+    """
+
+    def __init__(self, path, deleted_grace=30, join_window=1.0):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS invite_joins ("
+            "guild_id INTEGER NOT NULL, member_id INTEGER NOT NULL, inviter_id INTEGER, "
+            "code TEXT NOT NULL, joined_at REAL NOT NULL, PRIMARY KEY (guild_id, member_id))"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS invite_joins_inviter ON invite_joins (guild_id, inviter_id)")
+        self.db.commit()
+        self.deleted_grace = deleted_grace
+        self.join_window = join_window
+        self._joins = {}
+        self._invites = {}
+        self._uses = {}
+        self._deleted = {}
+        self._locks = {}
+        self._unavailable = set()
+
+    def is_loaded(self, guild_id):
+        return guild_id in self._invites
+
+    def is_unavailable(self, guild_id):
+        return guild_id in self._unavailable
+
+    def _lock(self, guild_id):
+        lock = self._locks.get(guild_id)
+        if lock is None:
+            lock = self._locks[guild_id] = asyncio.Lock()
+        return lock
+
+    async def _fetch(self, guild):
+        try:
+            invites = [CachedInvite.from_invite(invite) for invite in await guild.invites()]
+        except discord.Forbidden:
+            # Without Manage Server the guild's invites are invisible to us
+            self._unavailable.add(guild.id)
+            return None
+        self._unavailable.discard(guild.id)
+        return {invite.code: invite for invite in invites}
+
+    def _replace(self, guild_id, invites):
+        self._invites[guild_id] = invites
+        uses = self._uses[guild_id] = {}
+        for invite in invites.values():
+            if invite.inviter_id is not None:
+                uses[invite.inviter_id] = uses.get(invite.inviter_id, 0) + invite.uses
+
+    def _adjust(self, guild_id, inviter_id, delta):
+        if inviter_id is None or not delta:
+            return
+        uses = self._uses.setdefault(guild_id, {})
+        total = uses.get(inviter_id, 0) + delta
+        if total > 0:
+            uses[inviter_id] = total
+        else:
+            uses.pop(inviter_id, None)
+
+    async def load(self, guild):
+        """Fetch the guild's invites unless they are already cached"""
+        async with self._lock(guild.id):
+            if guild.id in self._invites:
+                return True
+            invites = await self._fetch(guild)
+            if invites is None:
+                return False
+            self._replace(guild.id, invites)
+            return True
+
+    async def warm(self, guilds):
+        """Load every guild one after another, keeping REST traffic at startup low"""
+        for guild in guilds:
+            try:
+                await self.load(guild)
+            except discord.HTTPException as e:
+                log.warning("Failed to load invites for guild %s: %s", guild.id, e)
+
+    def drop(self, guild_id):
+        self._invites.pop(guild_id, None)
+        self._uses.pop(guild_id, None)
+        self._deleted.pop(guild_id, None)
+        self._locks.pop(guild_id, None)
+        self._unavailable.discard(guild_id)
+
+    def add(self, invite):
+        invites = self._invites.get(invite.guild.id)
+        if invites is None:
+            return
+        cached = CachedInvite.from_invite(invite)
+        previous = invites.get(cached.code)
+        if previous is not None:
+            self._adjust(invite.guild.id, previous.inviter_id, -previous.uses)
+        invites[cached.code] = cached
+        self._adjust(invite.guild.id, cached.inviter_id, cached.uses)
+
+    def remove(self, invite):
+        invites = self._invites.get(invite.guild.id)
+        if invites is None:
+            return
+        cached = invites.pop(invite.code, None)
+        if cached is None:
+            return
+        # Discord deletes an invite when it hits max_uses, possibly before the join arrives
+        self._deleted.setdefault(invite.guild.id, {})[cached.code] = (cached, time.monotonic())
+        self._adjust(invite.guild.id, cached.inviter_id, -cached.uses)
+
+    async def attribute_join(self, member):
+        """Work out which invite `member` used, record it and return the CachedInvite or None"""
+        batch = self._joins.get(member.guild.id)
+        if batch is None:
+            members = [member]
+            batch = self._joins[member.guild.id] = (members, asyncio.create_task(self._attribute_batch(member.guild, members)))
+        else:
+            batch[0].append(member)
+        return (await asyncio.shield(batch[1])).get(member.id)
+
+    async def _attribute_batch(self, guild, members):
+        await asyncio.sleep(self.join_window)
+        # Joins from here on start the next batch
+        self._joins.pop(guild.id, None)
+        async with self._lock(guild.id):
+            before = self._invites.get(guild.id)
+            after = await self._fetch(guild)
+            if after is None:
+                return {}
+            self._replace(guild.id, after)
+            if before is None:
+                # No baseline yet: this fetch becomes it, the joins stay unattributed
+                return {}
+
+            deleted = self._deleted.pop(guild.id, {})
+            used = {
+                code: invite.uses - (before[code].uses if code in before else 0)
+                for code, invite in after.items() if invite.uses > (before[code].uses if code in before else 0)
+            }
+            candidates = [after[code] for code, uses in used.items() if len(members) == 1 or uses == len(members)]
+            if not used and len(members) == 1:
+                now = time.monotonic()
+                vanished = [invite for code, invite in before.items() if code not in after]
+                vanished += [invite for invite, at in deleted.values() if now - at < self.deleted_grace]
+                candidates = [invite for invite in vanished if invite.max_uses and invite.uses + 1 >= invite.max_uses]
+            if len(used) > 1 or len(candidates) != 1:
+                # Zero or several possible invites: guessing would credit the wrong member
+                return {}
+
+            invite = candidates[0]
+            joined_at = time.time()
+            self.db.executemany(
+                "INSERT OR REPLACE INTO invite_joins (guild_id, member_id, inviter_id, code, joined_at) VALUES (?, ?, ?, ?, ?)",
+                [(guild.id, member.id, invite.inviter_id, invite.code, joined_at) for member in members]
+            )
+            self.db.commit()
+            return {member.id: invite for member in members}
+
+    def uses_by(self, guild_id, inviter_id):
+        return self._uses.get(guild_id, {}).get(inviter_id, 0)
+
+    def leaderboard(self, guild_id, limit=10):
+        """Return [(inviter_id, uses)] for the top inviters by current invite uses"""
+        return heapq.nlargest(limit, self._uses.get(guild_id, {}).items(), key=lambda item: item[1])
+
+    def invited_by(self, guild_id, member_id):
+        """Return (inviter_id, code, joined_at) for an attributed join, or None"""
+        return self.db.execute(
+            "SELECT inviter_id, code, joined_at FROM invite_joins WHERE guild_id = ? AND member_id = ?",
+            (guild_id, member_id)
+        ).fetchone()
+
+    def joins_by(self, guild_id, inviter_id):
+        return self.db.execute(
+            "SELECT COUNT(*) FROM invite_joins WHERE guild_id = ? AND inviter_id = ?",
+            (guild_id, inviter_id)
+        ).fetchone()[0]
+
+    def close(self):
+        for _, task in self._joins.values():
+            task.cancel()
+        self._joins.clear()
+        self.db.close()
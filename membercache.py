@@ -0,0 +1,115 @@
+import logging
+from collections import OrderedDict
+
+import discord
+
+log = logging.getLogger(__name__)
+
+POLICIES = ("full", "lazy", "recent")
+QUERY_LIMIT = 100
+
+
+class BoundedMembers(OrderedDict):
+    """A guild's member store that keeps only the `limit` most recently active members
+
+    It replaces Guild._members, so every way a member gets cached, gateway
+    events and converter lookups included, is bounded the same way. The bot's
+    own member (`pinned`) is never evicted. discord.py has no public API to add
+    or evict cached members, so this relies on its internals; requirements.txt
+    pins the minor version and tests/test_membercache.py runs the policy
+    against benchmarks/fake_gateway.py.
+    """
+
+    def __init__(self, limit, pinned, members=()):
+        self.limit = limit
+        self.pinned = pinned
+        self.evicted = 0
+        super().__init__()
+        self.update(members)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.limit:
+            oldest = next(iter(self))
+            if oldest == self.pinned:
+                self.move_to_end(oldest)
+                oldest = next(iter(self))
+            del self[oldest]
+            self.evicted += 1
+
+    def touch(self, member):
+        if member.id in self:
+            self.move_to_end(member.id)
+        else:
+            self[member.id] = member
+
+
+class MemberCachePolicy:
+    """How much of each guild's member list is kept in memory
+
+    full:   chunk every guild at startup and cache every member, discord.py's default
+    lazy:   chunk a guild the first time something needs its complete member list
+    recent: never chunk; cache the last `max_members` active members per guild
+            and fetch complete lists over the gateway without caching them
+    """
+
+    def __init__(self, mode="full", max_members=1000):
+        if mode not in POLICIES:
+            raise ValueError(f"Unknown member cache policy {mode!r}, expected one of: {', '.join(POLICIES)}")
+        self.mode = mode
+        self.max_members = max_members
+        self.fetches = 0
+
+    @property
+    def complete(self):
+        """Whether every guild's member cache is complete from startup on"""
+        return self.mode == "full"
+
+    def client_options(self, intents):
+        flags = discord.MemberCacheFlags.from_intents(intents)
+        if self.mode == "recent":
+            # Joins are cached through seen() instead, where they count towards the bound
+            flags.joined = False
+        return {"chunk_guilds_at_startup": self.mode == "full", "member_cache_flags": flags}
+
+    def install(self, guild):
+        """Put a guild's member store under the policy; call whenever a guild becomes available"""
+        if self.mode != "recent":
+            return
+        members = getattr(guild, "_members", None)
+        if not isinstance(members, dict):
+            raise RuntimeError(f"discord.py {discord.__version__} no longer stores members in Guild._members, "
+                               "which the recent member cache policy replaces")
+        if not isinstance(members, BoundedMembers):
+            guild._members = BoundedMembers(self.max_members, guild._state.self_id, members)
+
+    def seen(self, member):
+        """Note activity from a member, which caches it under the recent policy"""
+        if self.mode == "recent" and isinstance(member, discord.Member):
+            members = member.guild._members
+            if not isinstance(members, BoundedMembers):
+                # Something inside discord.py swapped the store back; bound it again rather than grow without limit
+                log.warning("Member store of guild %s was replaced, reinstalling the recent policy", member.guild.id)
+                self.install(member.guild)
+                members = member.guild._members
+            members.touch(member)
+
+    async def members(self, guild, ids=None):
+        """Members of `guild`, all of them or those in `ids`, fetched when the cache cannot answer"""
+        if ids is not None:
+            found = [member for member in map(guild.get_member, ids) if member is not None]
+            missing = sorted(set(ids) - {member.id for member in found})
+            if missing and not (self.complete or guild.chunked):
+                for start in range(0, len(missing), QUERY_LIMIT):
+                    self.fetches += 1
+                    found += await guild.query_members(
+                        user_ids=missing[start:start + QUERY_LIMIT], limit=QUERY_LIMIT, cache=self.mode == "lazy"
+                    )
+            return found
+        if self.complete or guild.chunked:
+            return list(guild.members)
+        self.fetches += 1
+        if self.mode == "lazy":
+            return await guild.chunk()
+        return await guild.chunk(cache=False)
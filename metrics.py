@@ -0,0 +1,127 @@
+import asyncio
+import time
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _number(value):
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """In-memory command counters, latency histograms and gauges
+
+    Everything is updated from the event loop thread only, so plain ints and
+    lists are enough and no locking is needed. `render` produces the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self, lag_interval=0.5):
+        self.latency = {}
+        self.errors = {}
+        self.untimed = {}
+        self.gauges = {}
+        self.collectors = []
+        self.lag_interval = lag_interval
+        self.loop_lag = 0.0
+        self.loop_lag_max = 0.0
+        self._task = None
+
+    def observe(self, command, seconds):
+        histogram = self.latency.get(command)
+        if histogram is None:
+            histogram = self.latency[command] = Histogram()
+        histogram.observe(seconds)
+
+    def count(self, command):
+        """Count an invocation whose start time is unknown, such as a plain app command"""
+        self.untimed[command] = self.untimed.get(command, 0) + 1
+
+    def error(self, command, error):
+        key = (command, type(error).__name__)
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+    def set_gauge(self, name, value):
+        self.gauges[name] = value
+
+    def add_collector(self, collector):
+        """Register a callable returning extra exposition lines for every render"""
+        self.collectors.append(collector)
+
+    def remove_collector(self, collector):
+        if collector in self.collectors:
+            self.collectors.remove(collector)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.measure_loop_lag())
+        return self._task
+
+    async def measure_loop_lag(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            self.loop_lag = max(0.0, time.perf_counter() - start - self.lag_interval)
+            self.loop_lag_max = max(self.loop_lag_max, self.loop_lag)
+
+    def render(self):
+        lines = [
+            "# HELP bot_command_invocations_total Completed command invocations.",
+            "# TYPE bot_command_invocations_total counter"
+        ]
+        for command, histogram in self.latency.items():
+            lines.append(f'bot_command_invocations_total{{command="{_escape(command)}"}} {histogram.count}')
+        for command, count in self.untimed.items():
+            lines.append(f'bot_command_invocations_total{{command="{_escape(command)}"}} {count}')
+
+        lines += [
+            "# HELP bot_command_errors_total Command invocations that raised, by error type.",
+            "# TYPE bot_command_errors_total counter"
+        ]
+        for (command, error), count in self.errors.items():
+            lines.append(f'bot_command_errors_total{{command="{_escape(command)}",error="{error}"}} {count}')
+
+        lines += [
+            "# HELP bot_command_latency_seconds Command handler latency.",
+            "# TYPE bot_command_latency_seconds histogram"
+        ]
+        for command, histogram in self.latency.items():
+            label = _escape(command)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), histogram.counts):
+                cumulative += count
+                lines.append(f'bot_command_latency_seconds_bucket{{command="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'bot_command_latency_seconds_sum{{command="{label}"}} {histogram.sum}')
+            lines.append(f'bot_command_latency_seconds_count{{command="{label}"}} {histogram.count}')
+
+        for collector in self.collectors:
+            lines += collector()
+
+        gauges = dict(self.gauges, event_loop_lag_seconds=self.loop_lag, event_loop_lag_max_seconds=self.loop_lag_max)
+        for name, value in gauges.items():
+            lines.append(f"# TYPE bot_{name} gauge")
+            lines.append(f"bot_{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
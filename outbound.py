@@ -0,0 +1,260 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+import discord
+
+from metrics import LATENCY_BUCKETS, Histogram
+
+log = logging.getLogger(__name__)
+
+HIGH, NORMAL, LOW = 0, 1, 2
+BULK_DELETE_LIMIT = 100
+
+
+class OutboundJob:
+    __slots__ = ("priority", "seq", "kind", "target", "kwargs", "future", "enqueued_at", "cleanup_after")
+
+    def __init__(self, priority, seq, kind, target, kwargs, future, cleanup_after=None):
+        self.priority = priority
+        self.seq = seq
+        self.kind = kind
+        self.target = target
+        self.kwargs = kwargs
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.cleanup_after = cleanup_after
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class ChannelBucket:
+    """Local model of a channel's rate limit
+
+    Discord allows `rate` message operations per `per` second window in a
+    channel, after which the window resets. Spending from this model before
+    each call keeps the worker inside the limit, so discord.py never has to sit
+    out a 429 inline. `margin` pads each window, since ours starts slightly
+    before Discord's does.
+    """
+
+    def __init__(self, rate=5, per=5.0, margin=0.25):
+        self.rate = rate
+        self.per = per + margin
+        self.remaining = rate
+        self.window_start = 0.0
+
+    def delay(self):
+        """Seconds until a call may be made, 0 when one can go out now"""
+        now = time.monotonic()
+        if now - self.window_start >= self.per:
+            self.window_start = now
+            self.remaining = self.rate
+        return 0.0 if self.remaining > 0 else self.window_start + self.per - now
+
+    def spend(self):
+        self.remaining -= 1
+
+
+class ChannelQueue:
+    __slots__ = ("channel", "heap", "edits", "deletes", "bucket", "wakeup", "task")
+
+    def __init__(self, channel, bucket):
+        self.channel = channel
+        self.heap = []
+        self.edits = {}
+        self.deletes = []
+        self.bucket = bucket
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def __len__(self):
+        return len(self.heap) + len(self.deletes)
+
+
+class OutboundDispatcher:
+    """Per-channel outbound queues for sends, coalesced edits and batched cleanup deletes
+
+    Callers enqueue and get a future back instead of awaiting the HTTP call.
+    Each channel with queued work has one worker that drains its priority
+    queue at the pace of its ChannelBucket. An edit to a message that already
+    has an edit queued is merged into it, and cleanup deletes that fall due
+    together go out as one bulk delete.
+    """
+
+    def __init__(self, rate=5, per=5.0, delete_window=2.0, max_delete_delay=10.0):
+        self.rate = rate
+        self.per = per
+        self.delete_window = delete_window
+        self.max_delete_delay = max_delete_delay
+        self._queues = {}
+        self._seq = itertools.count()
+        self.wait_time = Histogram()
+        self.sent = 0
+        self.edited = 0
+        self.coalesced = 0
+        self.deleted = 0
+        self.delete_calls = 0
+        self.failed = 0
+        self._inflight = 0
+
+    @property
+    def depth(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _queue(self, channel):
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            queue = self._queues[channel.id] = ChannelQueue(channel, ChannelBucket(self.rate, self.per))
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._worker(queue))
+        queue.wakeup.set()
+        return queue
+
+    def send(self, channel, priority=NORMAL, cleanup_after=None, **kwargs):
+        """Queue a message; the future resolves to the sent message"""
+        future = asyncio.get_running_loop().create_future()
+        job = OutboundJob(priority, next(self._seq), "send", None, kwargs, future, cleanup_after)
+        heapq.heappush(self._queue(channel).heap, job)
+        return future
+
+    def edit(self, message, priority=NORMAL, **kwargs):
+        """Queue an edit, merged into any edit of the same message that has not gone out yet"""
+        queue = self._queue(message.channel)
+        job = queue.edits.get(message.id)
+        if job is not None:
+            job.kwargs.update(kwargs)
+            if priority < job.priority:
+                job.priority = priority
+                heapq.heapify(queue.heap)
+            self.coalesced += 1
+            return job.future
+        future = asyncio.get_running_loop().create_future()
+        job = OutboundJob(priority, next(self._seq), "edit", message, kwargs, future)
+        queue.edits[message.id] = job
+        heapq.heappush(queue.heap, job)
+        return future
+
+    def delete_later(self, message, delay=0.0):
+        """Queue a cleanup delete `delay` seconds from now"""
+        queue = self._queue(message.channel)
+        heapq.heappush(queue.deletes, (time.monotonic() + delay, message.id, message))
+
+    async def drain(self, timeout=5.0):
+        """Wait for queued work to go out, e.g. before shutting down"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while (self.depth or self._inflight) and (deadline is None or time.monotonic() < deadline):
+            await asyncio.sleep(0.05)
+
+    async def _worker(self, queue):
+        while True:
+            now = time.monotonic()
+            if not len(queue):
+                # Linger until the window ends so the bucket's state is not lost
+                linger = queue.bucket.window_start + queue.bucket.per - now
+                if linger <= 0:
+                    break
+                queue.wakeup.clear()
+                try:
+                    await asyncio.wait_for(queue.wakeup.wait(), timeout=linger)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            due_at = queue.deletes[0][0] if queue.deletes else None
+            overdue = due_at is not None and now - due_at > self.max_delete_delay
+            if not queue.heap and due_at > now:
+                queue.wakeup.clear()
+                try:
+                    await asyncio.wait_for(queue.wakeup.wait(), timeout=due_at - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            delay = queue.bucket.delay()
+            if delay:
+                await asyncio.sleep(delay)
+                continue
+            queue.bucket.spend()
+            self._inflight += 1
+            try:
+                if queue.heap and not overdue:
+                    await self._run(queue, heapq.heappop(queue.heap))
+                else:
+                    await self._delete_due(queue)
+            finally:
+                self._inflight -= 1
+        if self._queues.get(queue.channel.id) is queue:
+            del self._queues[queue.channel.id]
+
+    async def _run(self, queue, job):
+        if job.kind == "edit":
+            queue.edits.pop(job.target.id, None)
+        self.wait_time.observe(time.monotonic() - job.enqueued_at)
+        try:
+            if job.kind == "send":
+                result = await queue.channel.send(**job.kwargs)
+                self.sent += 1
+                if job.cleanup_after is not None:
+                    self.delete_later(result, job.cleanup_after)
+            else:
+                result = await job.target.edit(**job.kwargs)
+                self.edited += 1
+        except discord.HTTPException as e:
+            self.failed += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+                # Fire-and-forget callers never retrieve it
+                job.future.exception()
+            return
+        if not job.future.done():
+            job.future.set_result(result)
+
+    async def _delete_due(self, queue):
+        # Take everything due within the window so nearby cleanups share one call
+        limit = time.monotonic() + self.delete_window
+        batch = []
+        while queue.deletes and queue.deletes[0][0] <= limit and len(batch) < BULK_DELETE_LIMIT:
+            batch.append(heapq.heappop(queue.deletes)[2])
+        try:
+            if len(batch) > 1 and hasattr(queue.channel, "delete_messages"):
+                try:
+                    await queue.channel.delete_messages(batch)
+                    self.delete_calls += 1
+                    self.deleted += len(batch)
+                    return
+                except discord.Forbidden:
+                    # Bulk delete needs Manage Messages; our own messages can still go one by one
+                    pass
+            for message in batch:
+                try:
+                    await message.delete()
+                    self.deleted += 1
+                except discord.NotFound:
+                    pass
+                self.delete_calls += 1
+        except discord.HTTPException as e:
+            self.failed += 1
+            log.warning("Failed to clean up messages in %s: %s", queue.channel.id, e)
+
+    def render_metrics(self):
+        lines = [
+            "# TYPE bot_outbound_queue_depth gauge",
+            f"bot_outbound_queue_depth {self.depth}",
+            "# TYPE bot_outbound_channels_active gauge",
+            f"bot_outbound_channels_active {len(self._queues)}",
+            "# TYPE bot_outbound_operations_total counter",
+        ]
+        for operation, count in (("send", self.sent), ("edit", self.edited), ("edit_coalesced", self.coalesced),
+                                 ("delete", self.deleted), ("delete_call", self.delete_calls), ("failed", self.failed)):
+            lines.append(f'bot_outbound_operations_total{{operation="{operation}"}} {count}')
+        lines.append("# TYPE bot_outbound_wait_seconds histogram")
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), self.wait_time.counts):
+            cumulative += count
+            lines.append(f'bot_outbound_wait_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f"bot_outbound_wait_seconds_sum {self.wait_time.sum}")
+        lines.append(f"bot_outbound_wait_seconds_count {self.wait_time.count}")
+        return lines
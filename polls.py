@@ -0,0 +1,265 @@
+import asyncio
+import json
+import logging
+import sqlite3
+
+import discord
+
+log = logging.getLogger(__name__)
+
+NUMBER_EMOJIS = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣', '🔟']
+BAR_WIDTH = 12
+
+
+class Poll:
+    __slots__ = ("id", "guild_id", "channel_id", "message_id", "author_id", "question", "options",
+                 "emojis", "closed", "tallies", "votes")
+
+    def __init__(self, id, guild_id, channel_id, message_id, author_id, question, options, emojis, closed=False):
+        self.id = id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.author_id = author_id
+        self.question = question
+        self.options = json.loads(options) if isinstance(options, str) else list(options)
+        self.emojis = json.loads(emojis) if isinstance(emojis, str) else list(emojis)
+        self.closed = bool(closed)
+        self.tallies = [0] * len(self.options)
+        self.votes = {}
+
+    @property
+    def total(self):
+        return len(self.votes)
+
+
+def poll_embed(poll, title="📊 Poll"):
+    embed = discord.Embed(title=title, description=poll.question, color=discord.Color.blue())
+    total = poll.total
+    for i, (option, emoji) in enumerate(zip(poll.options, poll.emojis)):
+        share = poll.tallies[i] / total if total else 0
+        bar = "█" * round(share * BAR_WIDTH) + "░" * (BAR_WIDTH - round(share * BAR_WIDTH))
+        embed.add_field(name=f"{emoji} {option}", value=f"`{bar}` {poll.tallies[i]} ({share:.0%})", inline=False)
+    embed.set_footer(text=f"{total} votes" + (" • Poll closed" if poll.closed else ""))
+    return embed
+
+
+class PollStore:
+    """SQLite backed storage for polls and one vote row per voter"""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS polls ("
+            "id INTEGER PRIMARY KEY, guild_id INTEGER, channel_id INTEGER NOT NULL, message_id INTEGER, "
+            "author_id INTEGER NOT NULL, question TEXT NOT NULL, options TEXT NOT NULL, emojis TEXT NOT NULL, "
+            "closed INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS poll_votes ("
+            "poll_id INTEGER NOT NULL, user_id INTEGER NOT NULL, option INTEGER NOT NULL, "
+            "PRIMARY KEY (poll_id, user_id)) WITHOUT ROWID"
+        )
+        self.db.commit()
+
+    def add(self, guild_id, channel_id, author_id, question, options, emojis):
+        cur = self.db.execute(
+            "INSERT INTO polls (guild_id, channel_id, author_id, question, options, emojis) VALUES (?, ?, ?, ?, ?, ?)",
+            (guild_id, channel_id, author_id, question, json.dumps(options), json.dumps(emojis))
+        )
+        self.db.commit()
+        return cur.lastrowid
+
+    def set_message(self, poll_id, message_id):
+        self.db.execute("UPDATE polls SET message_id = ? WHERE id = ?", (message_id, poll_id))
+        self.db.commit()
+
+    def delete(self, poll_id):
+        self.db.execute("DELETE FROM polls WHERE id = ?", (poll_id,))
+        self.db.execute("DELETE FROM poll_votes WHERE poll_id = ?", (poll_id,))
+        self.db.commit()
+
+    def open_polls(self):
+        rows = self.db.execute(
+            "SELECT id, guild_id, channel_id, message_id, author_id, question, options, emojis, closed "
+            "FROM polls WHERE closed = 0 AND message_id IS NOT NULL"
+        ).fetchall()
+        return [Poll(*row) for row in rows]
+
+    def by_message(self, message_id):
+        row = self.db.execute(
+            "SELECT id, guild_id, channel_id, message_id, author_id, question, options, emojis, closed "
+            "FROM polls WHERE message_id = ?", (message_id,)
+        ).fetchone()
+        return Poll(*row) if row else None
+
+    def votes(self, poll_id):
+        return self.db.execute("SELECT user_id, option FROM poll_votes WHERE poll_id = ?", (poll_id,)).fetchall()
+
+    def save_votes(self, poll_id, changes):
+        """Write a batch of {user_id: option or None} in one transaction"""
+        self.db.executemany(
+            "INSERT OR REPLACE INTO poll_votes (poll_id, user_id, option) VALUES (?, ?, ?)",
+            ((poll_id, user_id, option) for user_id, option in changes.items() if option is not None)
+        )
+        self.db.executemany(
+            "DELETE FROM poll_votes WHERE poll_id = ? AND user_id = ?",
+            ((poll_id, user_id) for user_id, option in changes.items() if option is None)
+        )
+        self.db.commit()
+
+    def close_poll(self, poll_id):
+        self.db.execute("UPDATE polls SET closed = 1 WHERE id = ?", (poll_id,))
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+class PollManager:
+    """Counts button votes in memory and publishes them with debounced edits
+
+    Each poll keeps voter -> option and per-option tallies, so a vote is O(1)
+    and a voter can only hold one option at a time. Votes mark the poll dirty;
+    a single timer per poll then writes the changed votes in one transaction
+    and edits the results embed once, however many votes came in meanwhile.
+    """
+
+    def __init__(self, store, edit, debounce=3.0):
+        self.store = store
+        self.edit = edit
+        self.debounce = debounce
+        self._polls = {}
+        self._changes = {}
+        self._timers = {}
+        self._flushing = set()
+
+    def get(self, poll_id):
+        return self._polls.get(poll_id)
+
+    def resume(self):
+        """Reload open polls with their votes after a restart and return them"""
+        for poll in self.store.open_polls():
+            for user_id, option in self.store.votes(poll.id):
+                if option < len(poll.tallies):
+                    poll.votes[user_id] = option
+                    poll.tallies[option] += 1
+            self._polls[poll.id] = poll
+        return list(self._polls.values())
+
+    def create(self, guild_id, channel_id, author_id, question, options, emojis=None):
+        emojis = emojis or NUMBER_EMOJIS[:len(options)]
+        poll_id = self.store.add(guild_id, channel_id, author_id, question, options, emojis)
+        poll = Poll(poll_id, guild_id, channel_id, None, author_id, question, options, emojis)
+        self._polls[poll_id] = poll
+        return poll
+
+    def attach(self, poll, message_id):
+        poll.message_id = message_id
+        self.store.set_message(poll.id, message_id)
+
+    def discard(self, poll):
+        """Forget a poll whose message could not be sent"""
+        self._polls.pop(poll.id, None)
+        self.store.delete(poll.id)
+
+    def vote(self, poll_id, user_id, option):
+        """Record a vote and return the option the user now holds, None after retracting"""
+        poll = self._polls.get(poll_id)
+        if poll is None or poll.closed or not 0 <= option < len(poll.options):
+            raise KeyError(poll_id)
+        previous = poll.votes.get(user_id)
+        if previous is not None:
+            poll.tallies[previous] -= 1
+        if previous == option:
+            # Clicking your current choice again takes the vote back
+            del poll.votes[user_id]
+            current = None
+        else:
+            poll.votes[user_id] = option
+            poll.tallies[option] += 1
+            current = option
+        self._changes.setdefault(poll_id, {})[user_id] = current
+        if poll_id not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[poll_id] = loop.call_later(self.debounce, self._flush_later, poll_id)
+        return current
+
+    def _flush_later(self, poll_id):
+        # Keep a reference, the loop only holds tasks weakly
+        task = asyncio.create_task(self.flush(poll_id))
+        self._flushing.add(task)
+        task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task):
+        self._flushing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.warning("Failed to flush poll votes: %r", task.exception())
+
+    async def flush(self, poll_id, final=False):
+        timer = self._timers.pop(poll_id, None)
+        if timer:
+            timer.cancel()
+        poll = self._polls.get(poll_id)
+        changes = self._changes.pop(poll_id, None)
+        if poll is None:
+            return
+        if changes:
+            self.store.save_votes(poll_id, changes)
+        if changes or final:
+            try:
+                await self.edit(poll, final)
+            except discord.HTTPException as e:
+                log.warning("Failed to update poll %s: %s", poll_id, e)
+
+    async def close_poll(self, poll_id):
+        poll = self._polls.get(poll_id)
+        if poll is None:
+            return None
+        poll.closed = True
+        self.store.close_poll(poll_id)
+        await self.flush(poll_id, final=True)
+        self._polls.pop(poll_id, None)
+        return poll
+
+    async def stop(self):
+        """Write and publish everything still waiting on a timer or already being flushed"""
+        for poll_id in list(self._timers):
+            await self.flush(poll_id)
+        await asyncio.gather(*self._flushing, return_exceptions=True)
+
+
+class PollButton(discord.ui.Button):
+    def __init__(self, manager, poll, option):
+        super().__init__(
+            label=poll.options[option][:80], emoji=poll.emojis[option],
+            style=discord.ButtonStyle.secondary, custom_id=f"poll:{poll.id}:{option}"
+        )
+        self.manager = manager
+        self.poll_id = poll.id
+        self.option = option
+
+    async def callback(self, interaction):
+        try:
+            current = self.manager.vote(self.poll_id, interaction.user.id, self.option)
+        except KeyError:
+            await interaction.response.send_message("❌ This poll is closed!", ephemeral=True)
+            return
+        poll = self.manager.get(self.poll_id)
+        if current is None:
+            await interaction.response.send_message("🗑️ Your vote was removed.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"✅ You voted for **{poll.options[current]}**", ephemeral=True)
+
+
+class PollView(discord.ui.View):
+    """Persistent vote buttons, one per option, surviving restarts via fixed custom ids"""
+
+    def __init__(self, manager, poll):
+        super().__init__(timeout=None)
+        for option in range(len(poll.options)):
+            button = PollButton(manager, poll, option)
+            button.disabled = poll.closed
+            self.add_item(button)
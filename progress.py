@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+import discord
+
+
+class ThrottledProgress:
+    """Edits a progress message at most once every `interval` seconds"""
+
+    def __init__(self, message, interval=2.0, template="🔄 Restoring server... {done}/{total} changes applied"):
+        self.message = message
+        self.interval = interval
+        self.template = template
+        self._last = 0
+        self._pending = None
+
+    def __call__(self, done, total):
+        now = time.monotonic()
+        if now - self._last < self.interval or (self._pending and not self._pending.done()):
+            return
+        self._last = now
+        self._pending = asyncio.create_task(self._edit(self.template.format(done=done, total=total)))
+
+    async def _edit(self, content):
+        try:
+            await self.message.edit(content=content)
+        except discord.HTTPException:
+            pass
+
+    async def finish(self, content):
+        if self._pending:
+            await self._pending
+        await self._edit(content)
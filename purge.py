@@ -0,0 +1,200 @@
+import asyncio
+import datetime
+import logging
+import re
+import sqlite3
+
+import discord
+from discord.ext import commands
+
+log = logging.getLogger(__name__)
+
+BULK_DELETE_LIMIT = 100
+# Discord rejects bulk deletes of messages older than 14 days; keep a margin for clock skew
+BULK_DELETE_MAX_AGE = datetime.timedelta(days=14) - datetime.timedelta(minutes=5)
+CHANNEL_PATTERN = re.compile(r"\d{15,20}")
+
+
+class PurgeFlags(commands.FlagConverter):
+    """Message filters for clear, e.g. `user:@spammer attachments:true`"""
+
+    user: discord.User = commands.flag(default=None, description="Only messages from this user")
+    bots: bool = commands.flag(default=False, description="Only messages from bots")
+    contains: str = commands.flag(default=None, description="Only messages containing this text")
+    attachments: bool = commands.flag(default=False, description="Only messages with attachments")
+    channels: str = commands.flag(default=None, description="Other channels to clear as well")
+
+    def check(self, message):
+        if self.user and message.author.id != self.user.id:
+            return False
+        if self.bots and not message.author.bot:
+            return False
+        if self.contains and self.contains.lower() not in message.content.lower():
+            return False
+        if self.attachments and not message.attachments:
+            return False
+        return True
+
+
+def parse_channels(guild, text):
+    channels = (guild.get_channel(int(match)) for match in CHANNEL_PATTERN.findall(text or ""))
+    return [channel for channel in channels if isinstance(channel, discord.TextChannel)]
+
+
+class PurgeJob:
+    """Scans the last `limit` messages of several channels and deletes the matching ones
+
+    Recent matches are bulk deleted in batches of up to 100 while history is
+    still being paged; matches too old for bulk delete go to the PurgeQueue.
+    Channels are scanned concurrently since each has its own delete bucket.
+    """
+
+    def __init__(self, queue, check=None, on_progress=None):
+        self.queue = queue
+        self.check = check
+        self.on_progress = on_progress
+        self.scanned = 0
+        self.deleted = 0
+        self.queued = 0
+        self.total = 0
+        self.failures = []
+
+    def _report(self):
+        if self.on_progress:
+            self.on_progress(self.scanned, self.total)
+
+    async def _delete_batch(self, channel, batch):
+        try:
+            await channel.delete_messages(batch)
+            self.deleted += len(batch)
+        except discord.NotFound:
+            # Someone else deleted one of them; fall back to the survivors one by one
+            for message in batch:
+                try:
+                    await message.delete()
+                    self.deleted += 1
+                except discord.NotFound:
+                    pass
+        except discord.HTTPException as e:
+            self.failures.append((channel, e))
+
+    async def purge_channel(self, channel, limit, before=None):
+        cutoff = discord.utils.time_snowflake(discord.utils.utcnow() - BULK_DELETE_MAX_AGE)
+        batch = []
+        old_ids = []
+        try:
+            async for message in channel.history(limit=limit, before=before):
+                self.scanned += 1
+                if self.check is None or self.check(message):
+                    if message.id < cutoff:
+                        old_ids.append(message.id)
+                    else:
+                        batch.append(message)
+                        if len(batch) == BULK_DELETE_LIMIT:
+                            await self._delete_batch(channel, batch)
+                            batch = []
+                if self.scanned % BULK_DELETE_LIMIT == 0:
+                    self._report()
+        except discord.HTTPException as e:
+            self.failures.append((channel, e))
+        if batch:
+            await self._delete_batch(channel, batch)
+        if old_ids:
+            self.queued += self.queue.enqueue(channel.id, old_ids)
+        self._report()
+
+    async def run(self, channels, limit, before=None):
+        """`before` applies to the first channel, the one the command was used in"""
+        self.total = limit * len(channels)
+        await asyncio.gather(*(
+            self.purge_channel(channel, limit, before if i == 0 else None)
+            for i, channel in enumerate(channels)
+        ))
+        return self
+
+
+class PurgeQueue:
+    """Persistent queue of messages too old for bulk delete
+
+    A background loop deletes one message per channel every `interval` seconds,
+    working on all channels side by side. The queue lives in SQLite, so a
+    restart resumes where it stopped.
+    """
+
+    def __init__(self, path, delete, interval=1.0):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS purge_queue ("
+            "channel_id INTEGER NOT NULL, message_id INTEGER NOT NULL, PRIMARY KEY (channel_id, message_id))"
+        )
+        self.db.commit()
+        self.delete = delete
+        self.interval = interval
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def enqueue(self, channel_id, message_ids):
+        before = self.db.total_changes
+        self.db.executemany(
+            "INSERT OR IGNORE INTO purge_queue (channel_id, message_id) VALUES (?, ?)",
+            ((channel_id, message_id) for message_id in message_ids)
+        )
+        self.db.commit()
+        self._wakeup.set()
+        return self.db.total_changes - before
+
+    def pending(self, channel_id=None):
+        if channel_id is None:
+            return self.db.execute("SELECT COUNT(*) FROM purge_queue").fetchone()[0]
+        return self.db.execute("SELECT COUNT(*) FROM purge_queue WHERE channel_id = ?", (channel_id,)).fetchone()[0]
+
+    def cancel(self, channel_id):
+        cur = self.db.execute("DELETE FROM purge_queue WHERE channel_id = ?", (channel_id,))
+        self.db.commit()
+        return cur.rowcount
+
+    def _next_per_channel(self):
+        # Newest first, so the most visible spam disappears first
+        return self.db.execute("SELECT channel_id, MAX(message_id) FROM purge_queue GROUP BY channel_id").fetchall()
+
+    async def _delete_one(self, channel_id, message_id):
+        try:
+            await self.delete(channel_id, message_id)
+        except discord.NotFound:
+            pass
+        except discord.Forbidden:
+            # Lost access to the channel, nothing else queued there can be deleted either
+            log.warning("Dropping purge queue for channel %s: missing permissions", channel_id)
+            self.cancel(channel_id)
+            return
+        except discord.HTTPException as e:
+            log.warning("Failed to delete message %s in %s: %s", message_id, channel_id, e)
+            return
+        self.db.execute("DELETE FROM purge_queue WHERE channel_id = ? AND message_id = ?", (channel_id, message_id))
+
+    async def process_once(self):
+        """Delete the next message of every channel and return how many were attempted"""
+        rows = self._next_per_channel()
+        await asyncio.gather(*(self._delete_one(channel_id, message_id) for channel_id, message_id in rows))
+        self.db.commit()
+        return len(rows)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def run(self):
+        while True:
+            self._wakeup.clear()
+            if await self.process_once():
+                await asyncio.sleep(self.interval)
+                continue
+            await self._wakeup.wait()
+
+    def close(self):
+        if self._task:
+            self._task.cancel()
+        self.db.close()
@@ -0,0 +1,157 @@
+import time
+from collections import Counter, OrderedDict
+
+from discord.ext import commands
+
+SCOPES = ("user", "channel", "guild")
+
+
+class Limit:
+    __slots__ = ("rate", "per")
+
+    def __init__(self, rate, per):
+        if rate < 1 or per <= 0:
+            raise ValueError("A rate limit needs at least 1 use per a positive number of seconds")
+        self.rate = rate
+        self.per = per
+
+    def __repr__(self):
+        return f"{self.rate}/{self.per:g}"
+
+
+def parse_limits(spec):
+    """Parse "user=5/10,guild=60/10" (5 uses per 10 seconds per user, ...) into {scope: Limit}"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        scope, _, value = item.partition("=")
+        rate, _, per = value.partition("/")
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown rate limit scope {scope!r}, expected one of: {', '.join(SCOPES)}")
+        limits[scope] = Limit(int(rate), float(per or 1))
+    return limits
+
+
+class RateLimited(commands.CheckFailure):
+    """An invocation went over one of its token buckets
+
+    `notify` is only set for the first rejection in a row, so repeated
+    attempts can be dropped without answering each one.
+    """
+
+    def __init__(self, command, scope, retry_after, notify):
+        self.command = command
+        self.scope = scope
+        self.retry_after = retry_after
+        self.notify = notify
+        super().__init__(f"You're using `{command}` too often, try again in {retry_after:.1f}s")
+
+
+class TokenBuckets:
+    """Token buckets for any number of keys in one LRU-bounded dict
+
+    A bucket is [tokens, last update, rejected since last success] and is only
+    refilled when it is looked at. A key that was never seen, or was evicted as
+    least recently used, starts with a full bucket.
+    """
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self.evicted = 0
+        self._buckets = OrderedDict()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def take(self, wanted, now=None):
+        """Take a token from every (key, Limit) in `wanted`, or from none of them
+
+        Returns None on success, else (key, retry_after, first rejection in a row)
+        for the bucket that takes longest to refill.
+        """
+        now = time.monotonic() if now is None else now
+        refilled = []
+        worst = None
+        for key, limit in wanted:
+            bucket = self._buckets.get(key)
+            tokens = limit.rate if bucket is None else min(limit.rate, bucket[0] + (now - bucket[1]) * limit.rate / limit.per)
+            if tokens < 1:
+                retry_after = (1 - tokens) * limit.per / limit.rate
+                if worst is None or retry_after > worst[1]:
+                    worst = (key, retry_after, bucket)
+            refilled.append((key, tokens, bucket))
+        if worst is not None:
+            key, retry_after, bucket = worst
+            first = not bucket[2]
+            bucket[2] = True
+            return key, retry_after, first
+
+        for key, tokens, bucket in refilled:
+            if bucket is None:
+                self._buckets[key] = [tokens - 1, now, False]
+            else:
+                bucket[0], bucket[1], bucket[2] = tokens - 1, now, False
+                self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            self.evicted += 1
+        return None
+
+
+class CommandLimiter:
+    """Per-user, per-channel and per-guild token buckets checked before a command runs
+
+    `defaults` is one budget shared by every command, so neither a user nor a
+    guild can crowd out everyone else by cycling through commands. A command
+    can add buckets of its own with extras={"limits": "user=3/10"}. Either way
+    an invocation only goes ahead if every bucket it touches has a token.
+    """
+
+    def __init__(self, defaults="", max_keys=100_000):
+        self.defaults = parse_limits(defaults)
+        self.buckets = TokenBuckets(max_keys)
+        self.allowed = 0
+        self.rejected = Counter()
+        self._parsed = {}
+
+    def command_limits(self, command):
+        spec = command.extras.get("limits")
+        if not spec:
+            return {}
+        limits = self._parsed.get(spec)
+        if limits is None:
+            limits = self._parsed[spec] = parse_limits(spec)
+        return limits
+
+    def check(self, ctx):
+        """Global check: raise RateLimited if the invocation is over a limit"""
+        command = ctx.command
+        ids = {"user": ctx.author.id, "channel": ctx.channel.id, "guild": ctx.guild.id if ctx.guild else None}
+        wanted = [((scope, ids[scope]), limit) for scope, limit in self.defaults.items() if ids[scope] is not None]
+        wanted += [
+            ((command.qualified_name, scope, ids[scope]), limit)
+            for scope, limit in self.command_limits(command).items() if ids[scope] is not None
+        ]
+        rejection = self.buckets.take(wanted)
+        if rejection is None:
+            self.allowed += 1
+            return True
+        key, retry_after, first = rejection
+        scope = key[-2]
+        self.rejected[command.qualified_name, scope] += 1
+        raise RateLimited(command.qualified_name, scope, retry_after, first)
+
+    def render_metrics(self):
+        lines = [
+            "# TYPE bot_rate_limit_allowed_total counter",
+            f"bot_rate_limit_allowed_total {self.allowed}",
+            "# TYPE bot_rate_limit_rejected_total counter",
+        ]
+        for (command, scope), count in self.rejected.items():
+            lines.append(f'bot_rate_limit_rejected_total{{command="{command}",scope="{scope}"}} {count}')
+        lines += [
+            "# TYPE bot_rate_limit_buckets gauge",
+            f"bot_rate_limit_buckets {len(self.buckets)}",
+            "# TYPE bot_rate_limit_evictions_total counter",
+            f"bot_rate_limit_evictions_total {self.buckets.evicted}",
+        ]
+        return lines
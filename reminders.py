@@ -0,0 +1,160 @@
+import asyncio
+import heapq
+import logging
+import sqlite3
+import time
+
+log = logging.getLogger(__name__)
+
+
+class ReminderStore:
+    """SQLite backed storage for pending reminders"""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS reminders ("
+            "id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, channel_id INTEGER, "
+            "due_at REAL NOT NULL, message TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS reminders_due ON reminders (due_at)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS reminders_user ON reminders (user_id, due_at)")
+        self.db.commit()
+
+    def add(self, user_id, channel_id, due_at, message):
+        cur = self.db.execute(
+            "INSERT INTO reminders (user_id, channel_id, due_at, message, created_at) VALUES (?, ?, ?, ?, ?)",
+            (user_id, channel_id, due_at, message, time.time())
+        )
+        self.db.commit()
+        return cur.lastrowid
+
+    def due_before(self, horizon):
+        return self.db.execute(
+            "SELECT due_at, id FROM reminders WHERE due_at <= ? ORDER BY due_at", (horizon,)
+        ).fetchall()
+
+    def get_many(self, ids):
+        rows = []
+        # Stay well below SQLite's bound parameter limit
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows += self.db.execute(
+                f"SELECT id, user_id, channel_id, due_at, message FROM reminders WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+        return rows
+
+    def for_user(self, user_id, limit=10):
+        return self.db.execute(
+            "SELECT id, due_at, message FROM reminders WHERE user_id = ? ORDER BY due_at LIMIT ?",
+            (user_id, limit)
+        ).fetchall()
+
+    def count_for_user(self, user_id):
+        return self.db.execute("SELECT COUNT(*) FROM reminders WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+    def delete(self, reminder_id, user_id):
+        cur = self.db.execute("DELETE FROM reminders WHERE id = ? AND user_id = ?", (reminder_id, user_id))
+        self.db.commit()
+        return cur.rowcount > 0
+
+    def close(self):
+        self.db.close()
+
+
+class ReminderScheduler:
+    """Fires stored reminders from a single timer loop
+
+    Only reminders due within the next `window` seconds are held in memory, as
+    (due_at, id) pairs on a min-heap. Everything further out stays on disk until
+    the loop reaches the end of the current window and loads the next one.
+    """
+
+    def __init__(self, store, deliver, window=3600, batch_size=100):
+        self.store = store
+        self.deliver = deliver
+        self.window = window
+        self.batch_size = batch_size
+        self._heap = []
+        self._horizon = 0
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def load_window(self, now=None):
+        now = time.time() if now is None else now
+        self._horizon = now + self.window
+        self._heap = self.store.due_before(self._horizon)
+        heapq.heapify(self._heap)
+
+    def schedule(self, user_id, channel_id, delay, message):
+        due_at = time.time() + delay
+        reminder_id = self.store.add(user_id, channel_id, due_at, message)
+        if due_at <= self._horizon:
+            heapq.heappush(self._heap, (due_at, reminder_id))
+            if self._heap[0][1] == reminder_id:
+                self._wakeup.set()
+        return reminder_id
+
+    def cancel(self, reminder_id, user_id):
+        # The heap entry is left behind and skipped when its row is gone
+        return self.store.delete(reminder_id, user_id)
+
+    def pending(self, user_id, limit=10):
+        return self.store.for_user(user_id, limit)
+
+    def pending_count(self, user_id):
+        return self.store.count_for_user(user_id)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self.load_window()
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _pop_due(self, now):
+        ids = []
+        while self._heap and self._heap[0][0] <= now and len(ids) < self.batch_size:
+            ids.append(heapq.heappop(self._heap)[1])
+        return ids
+
+    async def fire_due(self, now=None):
+        """Deliver one batch of due reminders and return how many were sent"""
+        ids = self._pop_due(time.time() if now is None else now)
+        if not ids:
+            return 0
+        rows = self.store.get_many(ids)
+
+        async def fire(row):
+            try:
+                await self.deliver(row)
+            except Exception as e:
+                log.warning("Failed to deliver reminder %s: %s", row[0], e)
+            # Deleted one by one, so stopping the loop mid-batch never sends a reminder twice
+            self.store.delete(row[0], row[1])
+
+        await asyncio.gather(*(fire(row) for row in rows))
+        return len(rows)
+
+    async def run(self):
+        while True:
+            now = time.time()
+            if now >= self._horizon:
+                self.load_window(now)
+            if self._heap and self._heap[0][0] <= now:
+                await self.fire_due(now)
+                continue
+
+            next_due = self._heap[0][0] if self._heap else self._horizon
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0, min(next_due, self._horizon) - now))
+            except asyncio.TimeoutError:
+                pass
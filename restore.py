@@ -0,0 +1,197 @@
+import asyncio
+from collections import Counter, defaultdict
+
+import discord
+
+CREATABLE_CHANNEL_TYPES = ("text", "voice")
+
+
+class Operation:
+    """One REST call of a restore plan"""
+
+    __slots__ = ("action", "kind", "name", "bucket", "run")
+
+    def __init__(self, action, kind, name, bucket, run):
+        self.action = action
+        self.kind = kind
+        self.name = name
+        self.bucket = bucket
+        self.run = run
+
+    def __str__(self):
+        return f"{self.action} {self.kind} {self.name}"
+
+
+def _pair(wanted, live, key):
+    """Match wanted entries to live objects sharing the same key, in order
+
+    Returns (pairs, unmatched wanted entries, unmatched live objects).
+    """
+    pool = defaultdict(list)
+    for obj in live:
+        pool[key(obj)].append(obj)
+    pairs, missing = [], []
+    for entry in wanted:
+        candidates = pool.get(entry[0])
+        if candidates:
+            pairs.append((entry[1], candidates.pop(0)))
+        else:
+            missing.append(entry[1])
+    leftover = [obj for objs in pool.values() for obj in objs]
+    return pairs, missing, leftover
+
+
+def _without(wanted, untouchable, key):
+    """Drop one wanted entry for each untouchable live object sharing its key
+
+    Those objects are left out of the live side of a diff, so leaving their
+    wanted entries in would create them a second time.
+    """
+    taken = Counter(key(obj) for obj in untouchable)
+    kept = []
+    for entry in wanted:
+        if taken[entry[0]]:
+            taken[entry[0]] -= 1
+        else:
+            kept.append(entry)
+    return kept
+
+
+def plan_restore(backup_data, guild, keep_channel=None):
+    """Diff a backup against the live guild and return the operations, grouped into phases
+
+    Phases run one after another so deletes free up slots before anything is created
+    and categories exist before the channels placed in them.
+    """
+    deletes, roles, categories, channels, settings = [], [], [], [], []
+    category_objects = {}
+
+    # Roles are matched by name; only unmanaged roles below the bot's top role can be touched
+    editable_roles, untouchable_roles = [], []
+    for role in guild.roles:
+        if not role.is_default():
+            editable = not role.managed and role < guild.me.top_role
+            (editable_roles if editable else untouchable_roles).append(role)
+    wanted_roles = _without([(data["name"], data) for data in backup_data["roles"]], untouchable_roles, lambda role: role.name)
+    role_pairs, missing_roles, extra_roles = _pair(wanted_roles, editable_roles, lambda role: role.name)
+    for data, role in role_pairs:
+        color = discord.Color(int(data["color"].replace("#", ""), 16))
+        permissions = discord.Permissions(int(data["permissions"]))
+        if role.color != color or role.permissions.value != permissions.value:
+            roles.append(Operation(
+                "edit", "role", role.name, ("PATCH /guilds/roles", guild.id),
+                lambda role=role, color=color, permissions=permissions: role.edit(color=color, permissions=permissions)
+            ))
+    # Create in reverse so the backup's top role ends up highest, as before
+    for data in reversed(missing_roles):
+        roles.append(Operation(
+            "create", "role", data["name"], ("POST /guilds/roles", guild.id),
+            lambda data=data: guild.create_role(
+                name=data["name"],
+                color=discord.Color(int(data["color"].replace("#", ""), 16)),
+                permissions=discord.Permissions(int(data["permissions"]))
+            )
+        ))
+    for role in extra_roles:
+        deletes.append(Operation("delete", "role", role.name, ("DELETE /guilds/roles", guild.id), role.delete))
+
+    # Categories, both listed ones and those only referenced by a channel
+    wanted_categories = []
+    for data in backup_data["channels"]:
+        name = data["name"] if data["type"] == "category" else data["category"]
+        if name and name not in wanted_categories:
+            wanted_categories.append(name)
+    category_pairs, missing_categories, extra_categories = _pair(
+        [(name, name) for name in wanted_categories], guild.categories, lambda category: category.name
+    )
+    for name, category in category_pairs:
+        category_objects[name] = category
+
+    async def create_category(name):
+        category_objects[name] = await guild.create_category(name=name)
+
+    for name in missing_categories:
+        categories.append(Operation(
+            "create", "category", name, ("POST /guilds/channels", guild.id),
+            lambda name=name: create_category(name)
+        ))
+
+    # Text and voice channels are matched by name and type, then moved if their category changed.
+    # Other channel types and keep_channel are left alone on both sides of the diff.
+    live_channels, untouchable_channels = [], []
+    for channel in guild.channels:
+        if str(channel.type) != "category":
+            editable = str(channel.type) in CREATABLE_CHANNEL_TYPES and channel != keep_channel
+            (live_channels if editable else untouchable_channels).append(channel)
+    wanted_channels = _without(
+        [((data["name"], data["type"]), data) for data in backup_data["channels"] if data["type"] in CREATABLE_CHANNEL_TYPES],
+        untouchable_channels, lambda channel: (channel.name, str(channel.type))
+    )
+    channel_pairs, missing_channels, extra_channels = _pair(
+        wanted_channels, live_channels, lambda channel: (channel.name, str(channel.type))
+    )
+    for data, channel in channel_pairs:
+        current = channel.category.name if channel.category else None
+        if current != data["category"]:
+            channels.append(Operation(
+                "edit", "channel", channel.name, ("PATCH /channels", channel.id),
+                lambda channel=channel, data=data: channel.edit(category=category_objects.get(data["category"]))
+            ))
+    for data in missing_channels:
+        create = guild.create_text_channel if data["type"] == "text" else guild.create_voice_channel
+        channels.append(Operation(
+            "create", "channel", data["name"], ("POST /guilds/channels", guild.id),
+            lambda data=data, create=create: create(name=data["name"], category=category_objects.get(data["category"]))
+        ))
+    for channel in extra_channels + extra_categories:
+        kind = "category" if str(channel.type) == "category" else "channel"
+        deletes.append(Operation("delete", kind, channel.name, ("DELETE /channels", channel.id), channel.delete))
+
+    changes = {}
+    if backup_data.get("name") and backup_data["name"] != guild.name:
+        changes["name"] = backup_data["name"]
+    if backup_data.get("description") and backup_data["description"] != guild.description:
+        changes["description"] = backup_data["description"]
+    if changes:
+        settings.append(Operation(
+            "edit", "server", ", ".join(changes), ("PATCH /guilds", guild.id), lambda: guild.edit(**changes)
+        ))
+
+    return [phase for phase in (deletes, roles, categories, channels, settings) if phase]
+
+
+class RestoreExecutor:
+    """Runs plan phases with bounded concurrency and one call at a time per rate-limit bucket
+
+    Calls sharing a route bucket are serialised, since they draw from the same
+    limit anyway, while calls on different buckets run side by side. Failures are
+    collected instead of aborting the restore.
+    """
+
+    def __init__(self, concurrency=5, on_progress=None):
+        self.concurrency = concurrency
+        self.on_progress = on_progress
+        self.failures = []
+        self.done = 0
+        self.total = 0
+
+    async def run(self, phases):
+        self.total = sum(len(phase) for phase in phases)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        buckets = defaultdict(asyncio.Lock)
+
+        async def run_op(op):
+            async with buckets[op.bucket]:
+                async with semaphore:
+                    try:
+                        await op.run()
+                    except discord.HTTPException as e:
+                        self.failures.append((op, e))
+            self.done += 1
+            if self.on_progress:
+                self.on_progress(self.done, self.total)
+
+        for phase in phases:
+            await asyncio.gather(*(run_op(op) for op in phase))
+        return self.failures
+
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+
+
+def levenshtein(a, b):
+    """Edit distance between two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def deletions(word, depth):
+    """Every string reachable from `word` by removing up to `depth` characters"""
+    results = frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results = results | frontier
+    return results
+
+
+class DeletionIndex:
+    """Symmetric-delete index for finding words within a small edit distance
+
+    Every word is stored under all of its variants with up to `max_distance`
+    characters deleted. A query only generates its own deletions and looks
+    them up, so no distance is computed against words that cannot match.
+    """
+
+    def __init__(self, words=(), max_distance=2):
+        self.max_distance = max_distance
+        self.longest = 0
+        self._index = {}
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        self.longest = max(self.longest, len(word))
+        for variant in deletions(word, self.max_distance):
+            self._index.setdefault(variant, set()).add(word)
+
+    def search(self, word, max_distance):
+        """Return [(distance, word)] for every word within `max_distance`, closest first"""
+        max_distance = min(max_distance, self.max_distance)
+        if len(word) > self.longest + max_distance:
+            return []
+        candidates = set()
+        for variant in deletions(word, max_distance):
+            candidates |= self._index.get(variant, set())
+        found = []
+        for candidate in candidates:
+            distance = levenshtein(word, candidate)
+            if distance <= max_distance:
+                found.append((distance, candidate))
+        found.sort()
+        return found
+
+
+class CommandSuggester:
+    """"Did you mean" lookups over command names and aliases
+
+    The deletion index is built lazily and dropped whenever commands change. Answers,
+    including empty ones, are kept in a small LRU so repeated junk input is a
+    dictionary hit.
+    """
+
+    def __init__(self, bot, cache_size=1024, max_length=32):
+        self.bot = bot
+        self.cache_size = cache_size
+        self.max_length = max_length
+        self._tree = None
+        self._names = None
+        self._cache = OrderedDict()
+
+    def invalidate(self):
+        self._tree = None
+        self._names = None
+        self._cache.clear()
+
+    def _build(self):
+        self._names = {}
+        for cmd in self.bot.commands:
+            if cmd.hidden:
+                continue
+            self._names[cmd.name] = cmd.name
+            for alias in cmd.aliases:
+                self._names[alias] = cmd.name
+        # Longest first so "roll2d6" splits on the most specific command
+        self._prefixes = sorted(self._names, key=len, reverse=True)
+        self._tree = DeletionIndex(self._names)
+
+    def suggest(self, invoked, n=3):
+        """Return up to `n` suggestions, as full invocations like "roll 2d6" or plain command names"""
+        key = invoked.lower()[:self.max_length]
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        if self._tree is None:
+            self._build()
+
+        suggestions = []
+        # A command glued to its first argument, e.g. "+roll2d6" or "+ban@user"
+        for name in self._prefixes:
+            if len(key) > len(name) and key.startswith(name) and not key[len(name)].isalpha():
+                argument = invoked[len(name):self.max_length].replace("`", "")
+                suggestions.append(f"{self._names[name]} {argument}")
+                break
+        max_distance = max(1, len(key) // 3)
+        for _, name in self._tree.search(key, max_distance):
+            command = self._names[name]
+            if command not in suggestions:
+                suggestions.append(command)
+        suggestions = suggestions[:n]
+
+        self._cache[key] = suggestions
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return suggestions
@@ -0,0 +1,71 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+from activity import DAY, HOUR, ActivityIndex
+
+NOW = 1_700_000_000
+
+
+class FakeChannel:
+    """A channel whose history is messages 1..n, one per minute, from users 1..4"""
+
+    def __init__(self, messages):
+        self.id = 42
+        self.messages = [
+            SimpleNamespace(
+                id=i, author=SimpleNamespace(id=i % 4 + 1),
+                created_at=datetime.datetime.fromtimestamp(NOW - (messages - i) * 60, datetime.timezone.utc)
+            ) for i in range(1, messages + 1)
+        ]
+        self.last_message_id = messages
+
+    async def history(self, limit, before=None):
+        older = [message for message in reversed(self.messages) if before is None or message.id < before.id]
+        for message in older[:limit]:
+            await asyncio.sleep(0)
+            yield message
+
+
+def total(index, channel_id):
+    return sum(count for _, count in index.top_users(channel_id, limit=100, now=NOW))
+
+
+def test_counts_are_bucketed_and_rolled_up(tmp_path):
+    index = ActivityIndex(str(tmp_path / "activity.db"), hourly_retention=DAY, daily_retention=7 * DAY)
+    for age in (0, HOUR, 2 * DAY, 30 * DAY):
+        index.record(1, 7, NOW - age)
+    index.record(1, 8, NOW)
+    assert index.top_users(1, DAY, now=NOW) == [(7, 2), (8, 1)]
+
+    index.rollup(now=NOW)
+    assert index.top_users(1, None, now=NOW) == [(7, 4), (8, 1)]
+    assert index.top_users(1, 7 * DAY, now=NOW) == [(7, 3), (8, 1)]
+    index.close()
+
+
+def test_backfill_resumes_and_stops_at_live_tracking(tmp_path):
+    index = ActivityIndex(str(tmp_path / "activity.db"))
+    channel = FakeChannel(250)
+    # Live tracking began at message 200, so the backfill covers 1..199
+    index.record(channel.id, 1, NOW, message_id=200)
+
+    assert asyncio.run(index.backfill(channel, limit=150, chunk_size=50)) == (150, False)
+    assert asyncio.run(index.backfill(channel, limit=150, chunk_size=50)) == (49, True)
+    assert asyncio.run(index.backfill(channel)) == (0, True)
+    assert total(index, channel.id) == 200
+    index.close()
+
+
+def test_concurrent_backfills_do_not_double_count(tmp_path):
+    index = ActivityIndex(str(tmp_path / "activity.db"))
+    channel = FakeChannel(300)
+
+    async def main():
+        return await asyncio.gather(*(index.backfill(channel, limit=100, chunk_size=20) for _ in range(4)))
+
+    results = asyncio.run(main())
+    assert sum(indexed for indexed, _ in results) == 300
+    assert total(index, channel.id) == 300
+    assert not index._backfill_locks
+    index.close()
@@ -0,0 +1,81 @@
+import asyncio
+import copy
+import json
+
+from backups import SnapshotStore, apply_delta, decode, diff_snapshots, encode
+
+
+def snapshot(version):
+    """A snapshot whose roles and channels change a little with every version"""
+    return {
+        "version": 2,
+        "created_at": 1_700_000_000 + version,
+        "guild_id": 1,
+        "name": f"Guild v{version}",
+        "roles": [{"id": i, "name": f"role-{i}", "position": i, "color": "#000000"} for i in range(version, version + 50)],
+        "channels": [{"id": 1000 + i, "name": f"chat-{i}-{version % 3}", "position": i} for i in range(40)],
+        "emojis": [],
+    }
+
+
+def test_deltas_rebuild_the_newer_snapshot():
+    old, new = snapshot(1), snapshot(2)
+    delta = diff_snapshots(old, new)
+    assert delta["settings"] == {"created_at": new["created_at"], "name": "Guild v2"}
+    assert delta["roles"]["removed"] == [1] and [role["id"] for role in delta["roles"]["upsert"]] == [51]
+    assert apply_delta(old, delta) == new
+    assert diff_snapshots(new, copy.deepcopy(new))["channels"] == {"upsert": [], "removed": []}
+
+
+def test_encoding_round_trips_and_reads_plain_json():
+    data = snapshot(1)
+    encoded = encode(data)
+    assert encoded[:2] == b"\x1f\x8b" and len(encoded) < len(json.dumps(data))
+    assert decode(encoded) == data
+    assert decode(json.dumps(data).encode()) == data
+
+
+def test_store_keeps_chains_of_deltas(tmp_path):
+    async def main():
+        store = SnapshotStore(str(tmp_path / "backups.db"), full_every=3)
+        saved = [await store.save(1, snapshot(version)) for version in range(7)]
+        assert [kind for _, kind, _ in saved] == ["full", "incremental", "incremental"] * 2 + ["full"]
+        assert saved[1][2] < saved[0][2]
+
+        # A fresh store rebuilds every snapshot from disk
+        store.close()
+        store = SnapshotStore(str(tmp_path / "backups.db"), full_every=3)
+        for version, (snapshot_id, _, _) in enumerate(saved):
+            assert store.load(snapshot_id) == snapshot(version)
+        assert store.guild_of(saved[0][0]) == 1 and store.load(999) is None
+        assert (await store.save(1, snapshot(7)))[1] == "incremental"
+        store.close()
+    asyncio.run(main())
+
+
+def test_prune_only_drops_whole_chains(tmp_path):
+    async def main():
+        store = SnapshotStore(str(tmp_path / "backups.db"), full_every=3)
+        ids = [(await store.save(1, snapshot(version)))[0] for version in range(8)]
+        await store.save(2, snapshot(0))
+        # The newest 4 are ids[4:8]; ids[4] needs its chain back to the full ids[3]
+        assert store.prune(1, keep=4) == 3
+        assert [row[0] for row in store.list(1)] == ids[:2:-1]
+        assert store.load(ids[4]) == snapshot(4)
+        assert store.prune(1, keep=10) == 0 and len(store.list(2)) == 1
+        store.close()
+    asyncio.run(main())
+
+
+def test_schedules(tmp_path):
+    store = SnapshotStore(str(tmp_path / "backups.db"))
+    store.set_schedule(1, 24, 7)
+    store.set_schedule(2, 1, 3)
+    start = 1_700_000_000
+    assert sorted(store.due_schedules(now=start)) == [(1, 7), (2, 3)]
+    store.mark_run(1, start)
+    store.mark_run(2, start)
+    assert store.due_schedules(now=start + 3600) == [(2, 3)]
+    store.set_schedule(2, 0, 3)
+    assert store.due_schedules(now=start + 86400) == [(1, 7)]
+    store.close()
@@ -0,0 +1,97 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import discord
+
+from bulkmod import BulkExecutor, can_moderate, parse_ids, select_members
+
+NOW = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def member(member_id, name, joined_minutes_ago, created_days_ago, role=1):
+    return SimpleNamespace(
+        id=member_id, name=name, display_name=name, top_role=role,
+        joined_at=NOW - datetime.timedelta(minutes=joined_minutes_ago),
+        created_at=NOW - datetime.timedelta(days=created_days_ago),
+        guild=SimpleNamespace(owner_id=1)
+    )
+
+
+MEMBERS = [
+    member(100000000000000001, "raider_1", 5, 1),
+    member(100000000000000002, "raider_2", 10, 3),
+    member(100000000000000003, "regular", 60 * 24 * 90, 400),
+    member(100000000000000004, "newbie", 20, 200),
+]
+GUILD = SimpleNamespace(members=MEMBERS, get_member=lambda member_id: next((m for m in MEMBERS if m.id == member_id), None))
+MISSING = 100000000000000099
+
+
+def ids(selected):
+    return [member.id for member in selected]
+
+
+def test_parse_ids_reads_mentions_and_raw_ids():
+    assert parse_ids(f"<@{MEMBERS[0].id}> {MEMBERS[1].id}, <@!{MISSING}> 42") == {MEMBERS[0].id, MEMBERS[1].id, MISSING}
+    assert parse_ids(None) == set()
+
+
+def test_filters_combine():
+    assert ids(select_members(GUILD, joined_within=30, now=NOW)[0]) == ids(MEMBERS[:2]) + [MEMBERS[3].id]
+    assert ids(select_members(GUILD, joined_within=30, account_age=7, now=NOW)[0]) == ids(MEMBERS[:2])
+    assert ids(select_members(GUILD, pattern="RAIDER_*", now=NOW)[0]) == ids(MEMBERS[:2])
+    assert select_members(GUILD, joined_within=1, now=NOW) == ([], [])
+
+
+def test_unresolved_ids_are_returned_only_for_id_selections():
+    requested = {MEMBERS[0].id, MEMBERS[2].id, MISSING}
+    assert select_members(GUILD, requested, now=NOW) == ([MEMBERS[0], MEMBERS[2]], [MISSING])
+    # Unresolved IDs can't be checked against other filters, so they are dropped
+    assert select_members(GUILD, requested, joined_within=30, now=NOW) == ([MEMBERS[0]], [])
+    assert select_members(GUILD, requested, pattern="raider*", now=NOW) == ([MEMBERS[0]], [])
+
+
+def test_can_moderate_follows_role_hierarchy():
+    actor, me = member(2, "mod", 0, 0, role=5), member(3, "bot", 0, 0, role=4)
+    assert can_moderate(actor, me, member(10, "user", 0, 0, role=3))
+    assert not can_moderate(actor, me, member(10, "user", 0, 0, role=4))
+    assert not can_moderate(actor, me, actor)
+    assert not can_moderate(actor, me, member(1, "owner", 0, 0, role=0))
+
+
+def http_error():
+    return discord.HTTPException(SimpleNamespace(status=403, reason="Forbidden"), "Missing Permissions")
+
+
+def test_executor_collects_failures_and_progress():
+    progress = []
+    executor = BulkExecutor(concurrency=3, on_progress=lambda done, total: progress.append((done, total)))
+
+    async def action(target):
+        await asyncio.sleep(0)
+        if target % 4 == 0:
+            raise http_error()
+
+    failures = asyncio.run(executor.run(range(10), action))
+    assert sorted(target for target, _ in failures) == [0, 4, 8]
+    assert sorted(executor.succeeded) == [1, 2, 3, 5, 6, 7, 9]
+    assert progress[-1] == (10, 10) and len(progress) == 10
+
+
+def test_bulk_ban_chunks_and_records_results():
+    calls = []
+
+    async def bulk_ban(users, reason=None, delete_message_seconds=0):
+        calls.append(len(users))
+        if len(calls) == 2:
+            raise http_error()
+        return SimpleNamespace(banned=users[1:], failed=users[:1])
+
+    targets = [discord.Object(id=i) for i in range(450)]
+    executor = BulkExecutor()
+    failures = asyncio.run(executor.bulk_ban(SimpleNamespace(bulk_ban=bulk_ban), targets))
+    assert calls == [200, 200, 50]
+    assert len(executor.succeeded) == 199 + 49
+    assert len(failures) == 1 + 200 + 1
+    assert executor.done == executor.total == 450
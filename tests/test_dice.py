@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from dice import MAX_DICE, DiceError, _byte_table, _keep, _tally, parse_dice
+
+
+class Scripted:
+    """An rng whose dice come from a fixed list, for both per-die and reroll calls"""
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def choices(self, population, k):
+        taken, self.values = self.values[:k], self.values[k:]
+        return taken
+
+    def randint(self, low, high):
+        return self.values.pop(0)
+
+
+def roll(expression, values):
+    return parse_dice(expression).roll(Scripted(values))
+
+
+def test_arithmetic_follows_precedence():
+    assert parse_dice("2+3*4").roll().total == 14
+    assert parse_dice("(2+3)*4").roll().total == 20
+    assert parse_dice("-7/2").roll().total == -4
+    assert parse_dice("10-2-3").roll().total == 5
+
+
+def test_groups_roll_every_die():
+    result = roll("3d6 + 2", [1, 5, 6])
+    assert result.total == 14
+    assert result.groups[0].describe() == "3d6: 1, 5, 6 = **12**"
+    assert parse_dice("d%").dice == 1 and parse_dice("d%").tree.sides == 100
+
+
+@pytest.mark.parametrize("expression, total, dropped", [
+    ("4d6kh3", 15, {0}),
+    ("4d6k3", 15, {0}),
+    ("4d6kl1", 2, {1, 2, 3}),
+    ("4d6dl1", 15, {0}),
+    ("4d6d1", 15, {0}),
+    ("4d6dh2", 6, {1, 2}),
+])
+def test_keep_and_drop(expression, total, dropped):
+    group = roll(expression, [2, 6, 5, 4]).groups[0]
+    assert (group.total, group.dropped) == (total, dropped)
+
+
+def test_exploding_dice_add_rerolls_of_the_top_face():
+    group = roll("3d6!", [6, 2, 6, 6, 1, 3]).groups[0]
+    assert group.values == [13, 2, 9]
+    assert roll("2d6!kh1", [6, 5, 4]).total == 10
+
+
+def test_bulk_rolls_stay_in_range_and_keep_counts():
+    rng = random.Random(1)
+    result = parse_dice("1000d6").roll(rng).groups[0]
+    assert result.values is None and sum(result.tally.values()) == 1000
+    assert set(result.tally) <= set(range(1, 7))
+    assert 3000 < result.total < 4000
+
+    kept = parse_dice("1000d20kh10").roll(rng).groups[0]
+    assert sum(kept.tally.values()) == 10 and min(kept.tally) >= 15
+    dropped = parse_dice("1000d1000dl990").roll(rng).groups[0]
+    assert sum(dropped.tally.values()) == 10
+    assert "1,000 dice, 10 kept" in dropped.describe()
+
+
+def test_bulk_explosions_only_come_from_top_faces():
+    result = parse_dice("10000d4!").roll(random.Random(2)).groups[0]
+    assert sum(result.tally.values()) == 10000
+    # A die showing 4 never stays at 4, it carries on into 5..8, then 9..12 and so on
+    assert 4 not in result.tally and 8 not in result.tally and max(result.tally) > 8
+
+
+def test_tally_is_unbiased():
+    tally = _tally(60000, 6, random.Random(3))
+    assert sum(tally.values()) == 60000
+    assert all(9000 < tally[face] < 11000 for face in range(1, 7))
+    assert _byte_table(6).count(255) == 256 % 6
+    assert sum(_tally(500, 1000, random.Random(4)).values()) == 500
+
+
+def test_keep_takes_from_either_end():
+    tally = {1: 5, 3: 2, 6: 4}
+    assert _keep(tally, 5, highest=True) == {6: 4, 3: 1}
+    assert _keep(tally, 6, highest=False) == {1: 5, 3: 1}
+
+
+@pytest.mark.parametrize("expression, message", [
+    ("", "Empty"),
+    ("2d6+", "ends unexpectedly"),
+    ("(2d6", "Missing `\\)`"),
+    ("2x6", "Unexpected"),
+    ("0d6", "at least one die"),
+    ("2d1000001", "at most"),
+    ("4d6kh5", "keep between 1 and 4"),
+    ("4d6dl4", "keep between 1 and 4"),
+    ("4d6kh1dl1", "only keep or drop once"),
+    ("d1!", "explode forever"),
+    (f"{MAX_DICE}d6+1d6", "At most"),
+    ("1" * 101, "limited to 100"),
+])
+def test_invalid_expressions(expression, message):
+    with pytest.raises(DiceError, match=message):
+        parse_dice(expression)
+
+
+def test_division_by_zero_is_a_dice_error():
+    with pytest.raises(DiceError, match="Division by zero"):
+        parse_dice("1d6/(1-1)").roll()
+
+
+def test_parses_are_cached_by_normalised_text():
+    assert parse_dice("4D6 kh3") is parse_dice("4d6kh3")
@@ -0,0 +1,47 @@
+import asyncio
+import json
+
+import discord
+
+import main
+from eventlog import GatewayRecorder, load_recording
+
+
+def raw(op, event=None, data=None):
+    return json.dumps({"op": op, "t": event, "s": 1, "d": data})
+
+
+def test_recordings_round_trip(tmp_path):
+    path = tmp_path / "gateway.jsonl"
+    recorder = GatewayRecorder(path)
+    recorder.record(raw(0, "MESSAGE_CREATE", {"id": "1"}))
+    recorder.record(raw(11))
+    recorder.record(raw(0, "GUILD_MEMBER_ADD", {"user": {"id": "2"}}))
+    recorder.close()
+    assert recorder.recorded == 2
+    assert load_recording(path) == [("MESSAGE_CREATE", {"id": "1"}), ("GUILD_MEMBER_ADD", {"user": {"id": "2"}})]
+
+
+def test_recordings_can_be_limited_to_some_events(tmp_path):
+    path = tmp_path / "gateway.jsonl"
+    recorder = GatewayRecorder(path, events=["GUILD_MEMBER_ADD"])
+    recorder.record(raw(0, "MESSAGE_CREATE", {"id": "1"}))
+    recorder.record(raw(0, "GUILD_MEMBER_ADD", {"user": {"id": "2"}}))
+    recorder.close()
+    assert [event for event, _ in load_recording(path)] == ["GUILD_MEMBER_ADD"]
+
+
+def test_closing_the_bot_closes_the_recording(tmp_path):
+    async def run():
+        bot = main.Bot(command_prefix="+", intents=discord.Intents(guilds=True), db_path=str(tmp_path / "bot.db"),
+                       member_cache=main.member_cache)
+        # What login() does before connecting, so close() has a loop and shard queue to shut down
+        await bot._async_setup_hook()
+        bot.gateway_recorder = GatewayRecorder(tmp_path / "gateway.jsonl")
+        bot.gateway_recorder.record(raw(0, "MESSAGE_CREATE", {"id": "1"}))
+        await bot.close()
+        return bot.gateway_recorder
+
+    recorder = asyncio.run(run())
+    assert recorder._file.closed
+    assert load_recording(tmp_path / "gateway.jsonl") == [("MESSAGE_CREATE", {"id": "1"})]
@@ -0,0 +1,36 @@
+import asyncio
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+from discord.ext import commands
+
+import main
+
+
+async def run_checks(command, author_id):
+    ctx = SimpleNamespace(bot=main.bot, author=SimpleNamespace(id=author_id))
+    for check in command.checks:
+        await check(ctx)
+
+
+@pytest.mark.parametrize("name", ["load", "unload", "reload"])
+def test_extension_subcommands_are_owner_only(name, monkeypatch):
+    monkeypatch.setattr(main.bot, "owner_id", 1)
+    command = main.extensions.get_command(name)
+    with pytest.raises(commands.NotOwner):
+        asyncio.run(run_checks(command, 999))
+    asyncio.run(run_checks(command, 1))
+
+
+def test_extension_names_default_to_cogs():
+    assert main.extension_name("general") == "cogs.general"
+    assert main.extension_name("cogs.stats") == "cogs.stats"
+
+
+def test_restore_planner_is_only_imported_by_restorebackup():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, cogs.backups, cogs.moderation; sys.exit('restore' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+from giveaways import EntrantSet, Giveaway, GiveawayManager, GiveawayStore
+
+
+def test_entrant_set_adds_removes_and_draws_distinct_users():
+    entrants = EntrantSet(range(10))
+    assert not entrants.add(3) and entrants.add(10)
+    assert entrants.remove(0) and not entrants.remove(0)
+    assert len(entrants) == 10 and 0 not in entrants and 10 in entrants
+
+    for count in (1, 3, 9, 20):
+        picked = entrants.draw(count, exclude=[1, 2])
+        assert len(picked) == len(set(picked)) == min(count, 8)
+        assert not {0, 1, 2} & set(picked)
+    assert EntrantSet().draw(3) == []
+
+
+class Announcements:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, giveaway, winner_ids):
+        self.calls.append((giveaway.message_id, sorted(winner_ids)))
+
+
+def giveaway(message_id, guild_id=1, winners=2, ends_in=3600):
+    return Giveaway(message_id, guild_id, 10, 99, "Nitro", winners, time.time() + ends_in)
+
+
+def test_giveaways_end_on_their_timer(tmp_path):
+    async def main():
+        announce = Announcements()
+        manager = GiveawayManager(GiveawayStore(str(tmp_path / "giveaways.db")), announce)
+        manager.start(giveaway(1, winners=5, ends_in=0.05))
+        for user_id in (7, 8, 9):
+            manager.add_entry(1, user_id)
+        manager.remove_entry(1, 8)
+        assert manager.entry_count(1) == 2
+        await asyncio.sleep(0.1)
+        assert announce.calls == [(1, [7, 9])]
+        assert not manager.is_active(1) and sorted(manager.store.get(1).winner_ids) == [7, 9]
+        await manager.stop()
+    asyncio.run(main())
+
+
+def test_entrants_survive_a_restart(tmp_path):
+    async def main():
+        path = str(tmp_path / "giveaways.db")
+        manager = GiveawayManager(GiveawayStore(path), Announcements())
+        manager.start(giveaway(1))
+        manager.add_entry(1, 7)
+        manager.add_entry(1, 7)
+        await manager.stop()
+        manager.store.close()
+
+        resumed = GiveawayManager(GiveawayStore(path), Announcements())
+        resumed.resume()
+        assert resumed.is_active(1) and resumed.entry_count(1) == 1
+        await resumed.stop()
+    asyncio.run(main())
+
+
+def test_end_and_reroll_are_scoped_to_the_guild(tmp_path):
+    async def main():
+        announce = Announcements()
+        manager = GiveawayManager(GiveawayStore(str(tmp_path / "giveaways.db")), announce)
+        manager.start(giveaway(1, guild_id=5, winners=1))
+        for user_id in range(10):
+            manager.add_entry(1, user_id)
+        assert await manager.end(1, guild_id=6) is None
+        ended = await manager.end(1, guild_id=5)
+        assert ended.ended and len(ended.winner_ids) == 1
+        assert await manager.end(1) is None
+
+        assert manager.reroll(1, guild_id=6) == (None, [])
+        winners = list(ended.winner_ids)
+        for _ in range(9):
+            _, new = manager.reroll(1, guild_id=5)
+            assert new and new[0] not in winners
+            winners += new
+        # Everyone has won once, nobody is left to draw
+        assert manager.reroll(1)[1] == []
+        assert sorted(manager.store.get(1).winner_ids) == list(range(10))
+        await manager.stop()
+    asyncio.run(main())
+
+
+def test_stop_lets_ending_giveaways_record_winners(tmp_path):
+    async def main():
+        async def slow_announce(giveaway, winner_ids):
+            await asyncio.sleep(0.05)
+
+        manager = GiveawayManager(GiveawayStore(str(tmp_path / "giveaways.db")), slow_announce)
+        manager.start(giveaway(1, ends_in=0))
+        manager.start(giveaway(2, ends_in=3600))
+        await asyncio.sleep(0.01)
+        await manager.stop()
+        assert not manager._ending
+        return manager.store
+
+    store = asyncio.run(main())
+    assert store.get(1).ended and not store.get(2).ended
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from httpclient import DownloadError, HttpClient, sniff_image
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 2048
+TEXT = b"not an image at all"
+
+
+class StandIn:
+    """Serves fixed files with ETags and counts the requests that reach it"""
+
+    def __init__(self):
+        self.calls = 0
+        self.app = web.Application()
+        self.app.router.add_get("/icon.png", self.file(PNG, "image/png"))
+        self.app.router.add_get("/copy.png", self.file(PNG, "image/png"))
+        self.app.router.add_get("/page.txt", self.file(TEXT, "text/plain"))
+        self.app.router.add_get("/moved", self.moved)
+
+    def file(self, body, content_type):
+        async def handler(request):
+            self.calls += 1
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.Response(body=body, content_type=content_type, headers={"ETag": '"v1"'})
+        return handler
+
+    async def moved(self, request):
+        self.calls += 1
+        raise web.HTTPFound("/icon.png")
+
+
+def run(test, **kwargs):
+    """Run `test(stand_in, client, base)` against a stand-in server on a free port"""
+    async def main():
+        stand_in = StandIn()
+        runner = web.AppRunner(stand_in.app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        client = HttpClient(allow_private=True, **kwargs)
+        try:
+            await test(stand_in, client, f"http://127.0.0.1:{runner.addresses[0][1]}")
+        finally:
+            await client.close()
+            await runner.cleanup()
+    asyncio.run(main())
+
+
+def test_sniff_image():
+    assert sniff_image(PNG) == "image/png"
+    assert sniff_image(b"GIF89a...") == "image/gif"
+    assert sniff_image(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert sniff_image(TEXT) is None
+
+
+def test_fresh_urls_are_served_from_cache():
+    async def test(stand_in, client, base):
+        first = await client.fetch(f"{base}/icon.png", image=True)
+        second = await client.fetch(f"{base}/icon.png", image=True)
+        assert first.data == second.data == PNG and second.cached
+        assert stand_in.calls == 1 and (client.misses, client.hits) == (1, 1)
+    run(test)
+
+
+def test_stale_urls_are_revalidated_and_share_bodies():
+    async def test(stand_in, client, base):
+        await client.fetch(f"{base}/icon.png")
+        revalidated = await client.fetch(f"{base}/icon.png")
+        assert revalidated.cached and client.revalidated == 1
+        copy = await client.fetch(f"{base}/copy.png")
+        assert copy.digest == revalidated.digest and len(client._blobs) == 1
+    run(test, fresh_for=0)
+
+
+def test_cache_hits_apply_the_current_limits():
+    async def test(stand_in, client, base):
+        await client.fetch(f"{base}/icon.png")
+        with pytest.raises(DownloadError, match="larger than 1 KiB"):
+            await client.fetch(f"{base}/icon.png", max_bytes=1024)
+
+        page = await client.fetch(f"{base}/page.txt")
+        assert page.content_type == "text/plain"
+        with pytest.raises(DownloadError, match="not point to a PNG"):
+            await client.fetch(f"{base}/page.txt", image=True)
+        assert stand_in.calls == 2
+    run(test)
+
+
+def test_revalidated_hits_apply_the_current_limits():
+    async def test(stand_in, client, base):
+        await client.fetch(f"{base}/page.txt")
+        with pytest.raises(DownloadError, match="not point to a PNG"):
+            await client.fetch(f"{base}/page.txt", image=True)
+        assert client.revalidated == 0
+    run(test, fresh_for=0)
+
+
+def test_redirects_and_size_limits():
+    async def test(stand_in, client, base):
+        assert (await client.fetch(f"{base}/moved", image=True)).content_type == "image/png"
+        with pytest.raises(DownloadError, match="larger than"):
+            await client.fetch(f"{base}/copy.png", max_bytes=1024)
+        with pytest.raises(DownloadError, match="Only http and https"):
+            await client.fetch("ftp://example.com/icon.png")
+    run(test)
+
+
+def test_private_addresses_are_refused():
+    async def main():
+        client = HttpClient()
+        try:
+            with pytest.raises(DownloadError, match="private address"):
+                await client.fetch("http://127.0.0.1:1/icon.png")
+        finally:
+            await client.close()
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from invites import InviteTracker
+
+WINDOW = 0.02
+
+
+def invite(code, inviter_id, uses=0, max_uses=0, guild=None):
+    return SimpleNamespace(code=code, inviter=SimpleNamespace(id=inviter_id), uses=uses, max_uses=max_uses, guild=guild)
+
+
+class Guild:
+    """Serves its current invites and counts fetches, like guild.invites()"""
+
+    def __init__(self, *invites, forbidden=False):
+        self.id = 1
+        self.live = {item.code: item for item in invites}
+        self.fetches = 0
+        self.forbidden = forbidden
+
+    async def invites(self):
+        self.fetches += 1
+        if self.forbidden:
+            raise discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "Missing Permissions")
+        return [invite(item.code, item.inviter.id, item.uses, item.max_uses) for item in self.live.values()]
+
+    def join(self, code, count=1):
+        self.live[code].uses += count
+        return [SimpleNamespace(id=100 + i, guild=self) for i in range(count)]
+
+
+def tracker(tmp_path):
+    return InviteTracker(str(tmp_path / "invites.db"), join_window=WINDOW)
+
+
+def test_uses_index_follows_invite_events(tmp_path):
+    async def main():
+        invites = tracker(tmp_path)
+        guild = Guild(invite("a", 7, uses=3), invite("b", 7, uses=2), invite("c", 8, uses=9))
+        assert await invites.load(guild) and await invites.load(guild) and guild.fetches == 1
+        assert invites.uses_by(1, 7) == 5 and invites.leaderboard(1) == [(8, 9), (7, 5)]
+
+        invites.add(invite("d", 7, uses=1, guild=guild))
+        invites.remove(invite("c", 8, guild=guild))
+        assert invites.uses_by(1, 7) == 6 and invites.uses_by(1, 8) == 0
+        assert invites.leaderboard(1, limit=1) == [(7, 6)]
+        invites.close()
+    asyncio.run(main())
+
+
+def test_a_join_burst_through_one_invite_is_attributed_with_one_fetch(tmp_path):
+    async def main():
+        invites = tracker(tmp_path)
+        guild = Guild(invite("a", 7, uses=3), invite("b", 8))
+        await invites.load(guild)
+        members = guild.join("a", 5)
+        results = await asyncio.gather(*(invites.attribute_join(member) for member in members))
+        assert [result.code for result in results] == ["a"] * 5
+        assert guild.fetches == 2
+        assert invites.joins_by(1, 7) == 5 and invites.invited_by(1, 100)[:2] == (7, "a")
+        assert invites.uses_by(1, 7) == 8
+        invites.close()
+    asyncio.run(main())
+
+
+def test_ambiguous_bursts_stay_unattributed(tmp_path):
+    async def main():
+        invites = tracker(tmp_path)
+        guild = Guild(invite("a", 7), invite("b", 8))
+        await invites.load(guild)
+        members = guild.join("a", 2) + guild.join("b", 1)
+        assert await asyncio.gather(*(invites.attribute_join(member) for member in members)) == [None] * 3
+        assert invites.joins_by(1, 7) == invites.joins_by(1, 8) == 0
+        invites.close()
+    asyncio.run(main())
+
+
+def test_a_join_through_a_used_up_invite_is_attributed(tmp_path):
+    async def main():
+        invites = tracker(tmp_path)
+        guild = Guild(invite("once", 7, max_uses=1), invite("b", 8))
+        await invites.load(guild)
+        # Discord deletes the invite when its last use is taken, before the join arrives
+        del guild.live["once"]
+        invites.remove(invite("once", 7, guild=guild))
+        result = await invites.attribute_join(SimpleNamespace(id=100, guild=guild))
+        assert result.code == "once" and invites.invited_by(1, 100)[0] == 7
+        invites.close()
+    asyncio.run(main())
+
+
+def test_guilds_without_manage_server_are_marked_unavailable(tmp_path):
+    async def main():
+        invites = tracker(tmp_path)
+        guild = Guild(forbidden=True)
+        assert not await invites.load(guild)
+        assert invites.is_unavailable(1) and not invites.is_loaded(1)
+        invites.drop(1)
+        assert not invites.is_unavailable(1)
+        invites.close()
+    asyncio.run(main())
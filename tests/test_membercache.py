@@ -0,0 +1,106 @@
+import asyncio
+import socket
+
+import discord
+
+from fake_gateway import APPLICATION_ID, FakeDiscord, guild_id, member_id, member_payload, message_payload, user_payload
+from membercache import BoundedMembers, MemberCachePolicy
+
+MEMBERS = 300
+CACHE_SIZE = 10
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def until(condition, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+def run_recent_policy(test, monkeypatch):
+    """Connect a client using the recent policy to the fake gateway, then run `test(client, fake, policy, guild)`"""
+    async def main():
+        port = free_port()
+        fake = FakeDiscord(guilds=1, members=MEMBERS, port=port)
+        await fake.start()
+        monkeypatch.setattr(discord.http.Route, "BASE", f"{fake.url}/api/v10")
+        monkeypatch.setattr(discord.gateway.DiscordWebSocket, "DEFAULT_GATEWAY", discord.gateway.yarl.URL(f"ws://127.0.0.1:{port}/gateway"))
+        policy = MemberCachePolicy("recent", CACHE_SIZE)
+        intents = discord.Intents(guilds=True, members=True, guild_messages=True)
+        client = discord.Client(intents=intents, **policy.client_options(intents))
+        client.messages = 0
+
+        @client.event
+        async def on_guild_available(guild):
+            policy.install(guild)
+
+        @client.event
+        async def on_message(message):
+            policy.seen(message.author)
+            client.messages += 1
+
+        await client.login("fake")
+        connection = asyncio.create_task(client.connect(reconnect=False))
+        try:
+            await asyncio.wait_for(client.wait_until_ready(), 10)
+            await test(client, fake, policy, client.get_guild(guild_id(0)))
+        finally:
+            await client.close()
+            connection.cancel()
+            await fake.stop()
+    asyncio.run(main())
+
+
+def test_recent_policy_bounds_the_member_cache(monkeypatch):
+    async def test(client, fake, policy, guild):
+        assert isinstance(guild._members, BoundedMembers)
+        assert [member.id for member in guild.members] == [APPLICATION_ID]
+        assert not guild.chunked
+
+        for i in range(40):
+            await fake.dispatch(0, "MESSAGE_CREATE", message_payload(i + 1, guild.id + 1, guild.id, member_id(0, i)))
+        await until(lambda: client.messages == 40)
+        assert isinstance(guild._members, BoundedMembers)
+        assert len(guild.members) == CACHE_SIZE
+        # The bot's own member is never evicted; the rest are the most recent authors
+        assert {member.id for member in guild.members} == {APPLICATION_ID} | {member_id(0, i) for i in range(31, 40)}
+    run_recent_policy(test, monkeypatch)
+
+
+def test_recent_policy_follows_member_events(monkeypatch):
+    async def test(client, fake, policy, guild):
+        await fake.dispatch(0, "MESSAGE_CREATE", message_payload(1, guild.id + 1, guild.id, member_id(0, 5)))
+        await until(lambda: guild.get_member(member_id(0, 5)) is not None)
+
+        await fake.dispatch(0, "GUILD_MEMBER_REMOVE", {"guild_id": str(guild.id), "user": user_payload(member_id(0, 5))})
+        await until(lambda: guild.get_member(member_id(0, 5)) is None)
+
+        # Joins are only cached once the member is active
+        joined = 10 ** 16
+        await fake.dispatch(0, "GUILD_MEMBER_ADD", dict(member_payload(joined), guild_id=str(guild.id)))
+        await until(lambda: guild.member_count == MEMBERS + 1)
+        assert guild.get_member(joined) is None
+        assert isinstance(guild._members, BoundedMembers)
+    run_recent_policy(test, monkeypatch)
+
+
+def test_recent_policy_fetches_full_lists_without_caching(monkeypatch):
+    async def test(client, fake, policy, guild):
+        members = await policy.members(guild)
+        assert len(members) == MEMBERS + 1
+        assert len(guild.members) <= CACHE_SIZE and not guild.chunked
+
+        wanted = [member_id(0, i) for i in range(100, 150)]
+        found = await policy.members(guild, ids=wanted)
+        assert sorted(member.id for member in found) == wanted
+        assert len(guild.members) <= CACHE_SIZE
+        assert policy.fetches == 2
+        assert isinstance(guild._members, BoundedMembers)
+    run_recent_policy(test, monkeypatch)
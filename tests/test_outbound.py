@@ -0,0 +1,174 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import discord
+
+from outbound import HIGH, LOW, ChannelBucket, OutboundDispatcher
+
+
+class Message:
+    def __init__(self, channel, id, **fields):
+        self.channel = channel
+        self.id = id
+        self.fields = fields
+
+    async def edit(self, **kwargs):
+        self.channel.calls.append(("edit", self.id, kwargs))
+        self.fields.update(kwargs)
+        return self
+
+    async def delete(self):
+        self.channel.calls.append(("delete", self.id))
+
+
+class PlainChannel:
+    """Records every call in order; without bulk delete, like a DM"""
+
+    def __init__(self, id=1):
+        self.id = id
+        self.calls = []
+        self.ids = iter(range(1000, 2000))
+
+    async def send(self, **kwargs):
+        if kwargs.get("content") == "boom":
+            raise discord.HTTPException(SimpleNamespace(status=400, reason="Bad Request"), "Invalid Form Body")
+        self.calls.append(("send", kwargs.get("content")))
+        return Message(self, next(self.ids), **kwargs)
+
+
+class Channel(PlainChannel):
+    async def delete_messages(self, messages):
+        self.calls.append(("delete_messages", [message.id for message in messages]))
+
+
+def test_bucket_paces_calls_per_window(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("outbound.time.monotonic", lambda: now[0])
+    bucket = ChannelBucket(rate=2, per=1.0, margin=0.0)
+    for _ in range(2):
+        assert bucket.delay() == 0.0
+        bucket.spend()
+    assert bucket.delay() == 1.0
+    now[0] += 0.25
+    assert bucket.delay() == 0.75
+    now[0] += 0.75
+    assert bucket.delay() == 0.0 and bucket.remaining == 2
+
+
+def test_sends_go_out_by_priority_then_order():
+    async def main():
+        dispatcher = OutboundDispatcher()
+        channel = Channel()
+        futures = [dispatcher.send(channel, content="low", priority=LOW), dispatcher.send(channel, content="a"),
+                   dispatcher.send(channel, content="b"), dispatcher.send(channel, content="urgent", priority=HIGH)]
+        messages = await asyncio.gather(*futures)
+        assert channel.calls == [("send", "urgent"), ("send", "a"), ("send", "b"), ("send", "low")]
+        assert [message.fields["content"] for message in messages] == ["low", "a", "b", "urgent"]
+        assert dispatcher.sent == 4 and dispatcher.wait_time.count == 4
+    asyncio.run(main())
+
+
+def test_edits_to_one_message_are_coalesced():
+    async def main():
+        dispatcher = OutboundDispatcher()
+        channel = Channel()
+        message = Message(channel, 5)
+        first = dispatcher.edit(message, content="1")
+        second = dispatcher.edit(message, content="2", embed="e")
+        assert first is second
+        assert await first is message
+        assert channel.calls == [("edit", 5, {"content": "2", "embed": "e"})]
+        assert dispatcher.edited == 1 and dispatcher.coalesced == 1
+        # Once it has gone out, the next edit is queued on its own
+        await dispatcher.edit(message, content="3")
+        assert dispatcher.edited == 2
+    asyncio.run(main())
+
+
+def test_a_coalesced_edit_takes_the_higher_priority():
+    async def main():
+        dispatcher = OutboundDispatcher()
+        channel = Channel()
+        message = Message(channel, 5)
+        dispatcher.send(channel, content="a")
+        dispatcher.edit(message, content="1", priority=LOW)
+        dispatcher.edit(message, content="2", priority=HIGH)
+        await dispatcher.drain()
+        assert channel.calls[0] == ("edit", 5, {"content": "2"})
+    asyncio.run(main())
+
+
+def test_failures_reach_the_caller_and_the_queue_continues():
+    async def main():
+        dispatcher = OutboundDispatcher()
+        channel = Channel()
+        failed = dispatcher.send(channel, content="boom")
+        sent = dispatcher.send(channel, content="after")
+        assert (await sent).fields["content"] == "after"
+        try:
+            await failed
+        except discord.HTTPException:
+            pass
+        else:
+            raise AssertionError("expected the send to fail")
+        assert dispatcher.failed == 1 and dispatcher.sent == 1
+    asyncio.run(main())
+
+
+def test_cleanups_due_together_share_one_bulk_delete():
+    async def main():
+        dispatcher = OutboundDispatcher(delete_window=0.2)
+        channel = Channel()
+        messages = await asyncio.gather(*(dispatcher.send(channel, content=str(i), cleanup_after=0.05) for i in range(3)))
+        await dispatcher.drain()
+        assert channel.calls[-1] == ("delete_messages", [message.id for message in messages])
+        assert dispatcher.deleted == 3 and dispatcher.delete_calls == 1
+    asyncio.run(main())
+
+
+def test_cleanups_fall_back_to_single_deletes_without_bulk_delete():
+    async def main():
+        dispatcher = OutboundDispatcher(delete_window=0.2)
+        channel = PlainChannel()
+        messages = [Message(channel, i) for i in range(3)]
+        for message in messages:
+            dispatcher.delete_later(message)
+        await dispatcher.drain()
+        assert channel.calls == [("delete", 0), ("delete", 1), ("delete", 2)]
+        assert dispatcher.deleted == 3 and dispatcher.delete_calls == 3
+    asyncio.run(main())
+
+
+def test_channels_are_paced_independently_and_workers_exit():
+    async def main():
+        dispatcher = OutboundDispatcher(rate=2, per=0.2)
+        busy, quiet = Channel(1), Channel(2)
+        started = time.monotonic()
+        busy_sends = [dispatcher.send(busy, content=str(i)) for i in range(3)]
+        await dispatcher.send(quiet, content="q")
+        assert time.monotonic() - started < 0.1
+        await asyncio.gather(*busy_sends)
+        # The third send had to wait out the first window
+        assert time.monotonic() - started >= 0.2
+        assert dispatcher.depth == 0
+
+        # Workers linger to the end of their window, then drop their queue
+        for _ in range(100):
+            if not dispatcher._queues:
+                break
+            await asyncio.sleep(0.05)
+        assert not dispatcher._queues
+    asyncio.run(main())
+
+
+def test_render_metrics():
+    async def main():
+        dispatcher = OutboundDispatcher()
+        await dispatcher.send(Channel(), content="a")
+        lines = dispatcher.render_metrics()
+        assert "bot_outbound_queue_depth 0" in lines
+        assert 'bot_outbound_operations_total{operation="send"} 1' in lines
+        assert 'bot_outbound_wait_seconds_bucket{le="+Inf"} 1' in lines
+        assert "bot_outbound_wait_seconds_count 1" in lines
+    asyncio.run(main())
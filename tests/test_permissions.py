@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+from discord.ext import commands
+
+from cogs.backups import Backups
+from cogs.general import General
+from cogs.stats import Stats
+from cogs.warnings import Warnings
+
+# Prefix commands only see the checks on the command; default_permissions applies to slash commands alone
+GUARDED = [
+    (Backups.autobackup, discord.Permissions(administrator=True), discord.Permissions.none()),
+    (Backups.backups, discord.Permissions(administrator=True), discord.Permissions.none()),
+    (Backups.restorebackup, discord.Permissions(administrator=True), discord.Permissions(manage_roles=True, manage_channels=True)),
+    (General.servericon, discord.Permissions(manage_guild=True), discord.Permissions.none()),
+    (Stats.channelbackfill, discord.Permissions(manage_guild=True), discord.Permissions.none()),
+    (Warnings.warn, discord.Permissions(kick_members=True), discord.Permissions.none()),
+    (Warnings.unwarn, discord.Permissions(kick_members=True), discord.Permissions.none()),
+    (Warnings.warnings_history, discord.Permissions(kick_members=True), discord.Permissions.none()),
+]
+
+
+def context(guild=True, permissions=discord.Permissions.none(), bot_permissions=discord.Permissions.all()):
+    return SimpleNamespace(guild=object() if guild else None, permissions=permissions, bot_permissions=bot_permissions)
+
+
+def run_checks(command, ctx):
+    async def main():
+        for check in command.checks:
+            result = check(ctx)
+            if asyncio.iscoroutine(result):
+                result = await result
+            if not result:
+                raise commands.CheckFailure()
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("command, required, bot_required", GUARDED, ids=lambda value: getattr(value, "name", ""))
+def test_prefix_commands_check_permissions(command, required, bot_required):
+    run_checks(command, context(permissions=required, bot_permissions=bot_required))
+    with pytest.raises(commands.NoPrivateMessage):
+        run_checks(command, context(guild=False, permissions=required))
+    with pytest.raises(commands.MissingPermissions):
+        run_checks(command, context())
+    if bot_required.value:
+        with pytest.raises(commands.BotMissingPermissions):
+            run_checks(command, context(permissions=required, bot_permissions=discord.Permissions.none()))
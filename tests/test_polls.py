@@ -0,0 +1,110 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from polls import PollManager, PollStore
+
+DEBOUNCE = 0.05
+
+
+class Edits:
+    def __init__(self, fail=False, delay=0):
+        self.calls = []
+        self.fail = fail
+        self.delay = delay
+
+    async def __call__(self, poll, final):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise sqlite3.OperationalError("database is locked")
+        self.calls.append((list(poll.tallies), final))
+
+
+def manager(tmp_path, edit=None):
+    return PollManager(PollStore(str(tmp_path / "polls.db")), edit or Edits(), debounce=DEBOUNCE)
+
+
+def test_votes_switch_and_retract(tmp_path):
+    async def main():
+        polls = manager(tmp_path)
+        poll = polls.create(1, 2, 3, "Lunch?", ["Pizza", "Sushi", "Salad"])
+        assert poll.emojis == ["1️⃣", "2️⃣", "3️⃣"]
+        assert polls.vote(poll.id, 10, 0) == 0
+        assert polls.vote(poll.id, 10, 1) == 1
+        assert polls.vote(poll.id, 11, 1) == 1
+        assert polls.vote(poll.id, 11, 1) is None
+        assert poll.tallies == [0, 1, 0] and poll.total == 1
+        with pytest.raises(KeyError):
+            polls.vote(poll.id, 10, 3)
+        await polls.stop()
+    asyncio.run(main())
+
+
+def test_bursts_of_votes_cause_one_write_and_edit(tmp_path):
+    async def main():
+        edits = Edits()
+        polls = manager(tmp_path, edits)
+        poll = polls.create(1, 2, 3, "Lunch?", ["Pizza", "Sushi"])
+        for user_id in range(100):
+            polls.vote(poll.id, user_id, user_id % 2)
+        assert polls.store.votes(poll.id) == []
+        await asyncio.sleep(DEBOUNCE * 3)
+        assert edits.calls == [([50, 50], False)]
+        assert len(polls.store.votes(poll.id)) == 100 and not polls._flushing
+    asyncio.run(main())
+
+
+def test_votes_survive_a_restart(tmp_path):
+    async def main():
+        polls = manager(tmp_path)
+        poll = polls.create(1, 2, 3, "Lunch?", ["Pizza", "Sushi"])
+        polls.attach(poll, 99)
+        polls.vote(poll.id, 10, 1)
+        polls.vote(poll.id, 11, 1)
+        await polls.stop()
+        polls.store.close()
+
+        resumed = manager(tmp_path).resume()
+        assert [(p.id, p.message_id, p.tallies) for p in resumed] == [(poll.id, 99, [0, 2])]
+    asyncio.run(main())
+
+
+def test_closing_publishes_a_final_edit(tmp_path):
+    async def main():
+        edits = Edits()
+        polls = manager(tmp_path, edits)
+        poll = polls.create(1, 2, 3, "Lunch?", ["Pizza", "Sushi"])
+        polls.attach(poll, 99)
+        polls.vote(poll.id, 10, 0)
+        closed = await polls.close_poll(poll.id)
+        assert closed.closed and edits.calls == [([1, 0], True)]
+        assert polls.get(poll.id) is None and polls.store.by_message(99).closed
+        with pytest.raises(KeyError):
+            polls.vote(poll.id, 11, 0)
+        assert await polls.close_poll(poll.id) is None
+    asyncio.run(main())
+
+
+def test_stop_waits_for_running_flushes(tmp_path):
+    async def main():
+        edits = Edits(delay=DEBOUNCE * 2)
+        polls = manager(tmp_path, edits)
+        poll = polls.create(1, 2, 3, "Lunch?", ["Pizza", "Sushi"])
+        polls.vote(poll.id, 10, 0)
+        await asyncio.sleep(DEBOUNCE * 1.5)
+        assert polls._flushing and not edits.calls
+        await polls.stop()
+        assert edits.calls == [([1, 0], False)] and not polls._flushing
+    asyncio.run(main())
+
+
+def test_failed_timer_flushes_are_logged(tmp_path, caplog):
+    async def main():
+        polls = manager(tmp_path, Edits(fail=True))
+        poll = polls.create(1, 2, 3, "Lunch?", ["Pizza", "Sushi"])
+        polls.vote(poll.id, 10, 0)
+        await asyncio.sleep(DEBOUNCE * 2)
+        assert not polls._flushing
+    asyncio.run(main())
+    assert "Failed to flush poll votes" in caplog.text
@@ -0,0 +1,25 @@
+import asyncio
+
+from progress import ThrottledProgress
+
+
+class Message:
+    def __init__(self):
+        self.edits = []
+
+    async def edit(self, content):
+        await asyncio.sleep(0)
+        self.edits.append(content)
+
+
+def test_progress_edits_are_throttled():
+    async def main():
+        message = Message()
+        progress = ThrottledProgress(message, interval=60, template="{done}/{total}")
+        for done in range(1, 101):
+            progress(done, 100)
+            await asyncio.sleep(0)
+        await progress.finish("finished")
+        return message.edits
+
+    assert asyncio.run(main()) == ["1/100", "finished"]
@@ -0,0 +1,118 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import discord
+
+from purge import PurgeFlags, PurgeJob, PurgeQueue
+
+
+def flags(**values):
+    purge_flags = PurgeFlags()
+    for name, flag in PurgeFlags.get_flags().items():
+        setattr(purge_flags, name, values.get(name, flag.default))
+    return purge_flags
+
+
+def message(message_id, author=1, bot=False, content="", attachments=(), days_old=0):
+    created = discord.utils.utcnow() - datetime.timedelta(days=days_old)
+    return SimpleNamespace(
+        id=discord.utils.time_snowflake(created) + message_id, content=content, attachments=list(attachments),
+        author=SimpleNamespace(id=author, bot=bot)
+    )
+
+
+def error(kind, status):
+    return kind(SimpleNamespace(status=status, reason=""), "")
+
+
+def test_filters_combine():
+    spam = message(1, author=7, content="Buy CHEAP followers", attachments=["ad.png"])
+    assert flags().check(spam)
+    assert flags(user=SimpleNamespace(id=7), contains="cheap", attachments=True).check(spam)
+    assert not flags(user=SimpleNamespace(id=8)).check(spam)
+    assert not flags(bots=True).check(spam)
+    assert not flags(contains="free").check(spam)
+    assert not flags(attachments=True).check(message(2))
+
+
+class Channel:
+    def __init__(self, channel_id, messages):
+        self.id = channel_id
+        self.messages = messages
+        self.bulk_deletes = []
+
+    async def history(self, limit, before=None):
+        for item in self.messages[:limit]:
+            yield item
+
+    async def delete_messages(self, batch):
+        self.bulk_deletes.append(len(batch))
+
+
+class Queue:
+    def __init__(self):
+        self.queued = []
+
+    def enqueue(self, channel_id, message_ids):
+        self.queued += [(channel_id, message_id) for message_id in message_ids]
+        return len(message_ids)
+
+
+def test_job_bulk_deletes_recent_matches_and_queues_old_ones():
+    recent = [message(i, author=i % 2) for i in range(250)]
+    old = [message(1000 + i, author=1, days_old=20) for i in range(5)]
+    first, second = Channel(1, recent + old), Channel(2, [message(i) for i in range(10)])
+    queue = Queue()
+    progress = []
+    job = PurgeJob(queue, flags(user=SimpleNamespace(id=1)).check, lambda done, total: progress.append((done, total)))
+
+    asyncio.run(job.run([first, second], 300))
+    assert first.bulk_deletes == [100, 25] and second.bulk_deletes == [10]
+    assert job.deleted == 135 and job.scanned == 265
+    assert [channel_id for channel_id, _ in queue.queued] == [1] * 5 and job.queued == 5
+    assert progress[-1][1] == 600
+
+
+def test_job_falls_back_to_single_deletes_when_a_message_is_gone():
+    deleted = []
+
+    async def delete_messages(batch):
+        raise error(discord.NotFound, 404)
+
+    def deletable(message_id):
+        async def delete():
+            if message_id == 1:
+                raise error(discord.NotFound, 404)
+            deleted.append(message_id)
+        return SimpleNamespace(id=message_id, delete=delete)
+
+    channel = Channel(1, [])
+    channel.delete_messages = delete_messages
+    job = PurgeJob(Queue())
+    asyncio.run(job._delete_batch(channel, [deletable(i) for i in range(3)]))
+    assert deleted == [0, 2] and job.deleted == 2 and not job.failures
+
+
+def test_queue_deletes_newest_first_per_channel_and_drops_lost_channels(tmp_path):
+    attempts = []
+
+    async def delete(channel_id, message_id):
+        attempts.append((channel_id, message_id))
+        if channel_id == 2:
+            raise error(discord.Forbidden, 403)
+
+    async def main():
+        queue = PurgeQueue(str(tmp_path / "purge.db"), delete)
+        assert queue.enqueue(1, [10, 11, 12]) == 3
+        assert queue.enqueue(1, [12]) == 0
+        queue.enqueue(2, [20, 21])
+        assert await queue.process_once() == 2
+        assert sorted(attempts) == [(1, 12), (2, 21)]
+        assert (queue.pending(1), queue.pending(2)) == (2, 0)
+        while await queue.process_once():
+            pass
+        assert attempts[-2:] == [(1, 11), (1, 10)] and queue.pending() == 0
+        queue.close()
+
+    asyncio.run(main())
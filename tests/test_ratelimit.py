@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+
+from ratelimit import CommandLimiter, Limit, RateLimited, TokenBuckets, parse_limits
+
+
+def test_parse_limits():
+    limits = parse_limits(" user=5/10, guild=60/2.5 ,channel=3")
+    assert {scope: (limit.rate, limit.per) for scope, limit in limits.items()} == {
+        "user": (5, 10.0), "guild": (60, 2.5), "channel": (3, 1.0)
+    }
+    assert parse_limits("") == parse_limits(None) == {}
+    with pytest.raises(ValueError, match="Unknown rate limit scope"):
+        parse_limits("member=1/1")
+    with pytest.raises(ValueError):
+        parse_limits("user=0/10")
+
+
+def test_buckets_refill_over_time():
+    buckets = TokenBuckets()
+    limit = Limit(2, 10)
+    assert buckets.take([("a", limit)], now=0) is None
+    assert buckets.take([("a", limit)], now=0) is None
+    assert buckets.take([("a", limit)], now=1) == ("a", pytest.approx(4), True)
+    assert buckets.take([("a", limit)], now=2) == ("a", pytest.approx(3), False)
+    assert buckets.take([("a", limit)], now=5) is None
+    # Bursts never exceed the bucket's size, however long it was idle
+    for _ in range(2):
+        assert buckets.take([("a", limit)], now=1000) is None
+    assert buckets.take([("a", limit)], now=1000) is not None
+
+
+def test_take_is_all_or_nothing():
+    buckets = TokenBuckets()
+    user, guild = Limit(5, 10), Limit(1, 10)
+    assert buckets.take([("user", user), ("guild", guild)], now=0) is None
+    assert buckets.take([("user", user), ("guild", guild)], now=0)[0] == "guild"
+    # The rejected call took no token from the user's bucket
+    for _ in range(4):
+        assert buckets.take([("user", user)], now=0) is None
+    assert buckets.take([("user", user)], now=0) is not None
+
+
+def test_least_recently_used_buckets_are_evicted():
+    buckets = TokenBuckets(max_keys=2)
+    limit = Limit(2, 100)
+    for key in ("a", "b", "a", "c"):
+        assert buckets.take([(key, limit)], now=0) is None
+    assert len(buckets) == 2 and buckets.evicted == 1
+    # "b" was used least recently, so it was evicted and starts with a full bucket again
+    assert buckets.take([("a", limit)], now=0) is not None
+    assert buckets.take([("b", limit)], now=0) is None
+    assert buckets.take([("b", limit)], now=0) is None
+
+
+def context(command, user=1, channel=10, guild=100):
+    return SimpleNamespace(
+        command=command, author=SimpleNamespace(id=user), channel=SimpleNamespace(id=channel),
+        guild=SimpleNamespace(id=guild) if guild else None
+    )
+
+
+def test_limiter_combines_shared_and_per_command_budgets():
+    roll = SimpleNamespace(qualified_name="roll", extras={"limits": "user=1/1000"})
+    ping = SimpleNamespace(qualified_name="ping", extras={})
+    limiter = CommandLimiter("user=3/1000")
+
+    assert limiter.check(context(roll))
+    with pytest.raises(RateLimited) as rejected:
+        limiter.check(context(roll))
+    assert (rejected.value.command, rejected.value.scope, rejected.value.notify) == ("roll", "user", True)
+    assert limiter.check(context(roll, user=2))
+
+    # The shared default budget is spent across commands
+    assert limiter.check(context(ping))
+    assert limiter.check(context(ping))
+    with pytest.raises(RateLimited):
+        limiter.check(context(ping))
+    assert limiter.allowed == 4 and limiter.rejected == {("roll", "user"): 1, ("ping", "user"): 1}
+    assert "bot_rate_limit_allowed_total 4" in limiter.render_metrics()
+
+
+def test_guild_limits_skip_direct_messages():
+    command = SimpleNamespace(qualified_name="say", extras={"limits": "guild=1/1000"})
+    limiter = CommandLimiter()
+    for _ in range(3):
+        assert limiter.check(context(command, guild=None))
+    assert limiter.check(context(command))
+    with pytest.raises(RateLimited):
+        limiter.check(context(command, user=2))
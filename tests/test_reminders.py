@@ -0,0 +1,93 @@
+import asyncio
+
+from reminders import ReminderScheduler, ReminderStore
+
+
+def scheduler(tmp_path, deliver, **kwargs):
+    return ReminderScheduler(ReminderStore(str(tmp_path / "reminders.db")), deliver, **kwargs)
+
+
+def test_reminders_fire_in_due_order(tmp_path):
+    delivered = []
+
+    async def deliver(row):
+        delivered.append(row[4])
+
+    async def main():
+        reminders = scheduler(tmp_path, deliver)
+        reminders.start()
+        reminders.schedule(1, 10, 0.3, "third")
+        reminders.schedule(1, 10, 0.1, "first")
+        reminders.schedule(2, 10, 0.2, "second")
+        await asyncio.sleep(0.4)
+        reminders.stop()
+        return reminders
+
+    reminders = asyncio.run(main())
+    assert delivered == ["first", "second", "third"]
+    assert reminders.pending_count(1) == reminders.pending_count(2) == 0
+    reminders.store.close()
+
+
+def test_only_the_next_window_is_held_in_memory(tmp_path):
+    reminders = scheduler(tmp_path, None, window=60)
+    reminders.load_window()
+    reminders.schedule(1, 10, 30, "soon")
+    reminders.schedule(1, 10, 3600, "later")
+    assert len(reminders._heap) == 1
+    assert [message for _, _, message in reminders.pending(1)] == ["soon", "later"]
+    reminders.store.close()
+
+
+def test_cancelled_reminders_are_not_delivered(tmp_path):
+    delivered = []
+
+    async def deliver(row):
+        delivered.append(row[0])
+
+    reminders = scheduler(tmp_path, deliver)
+    reminders.load_window()
+    keep = reminders.schedule(1, 10, 0, "keep")
+    drop = reminders.schedule(1, 10, 0, "drop")
+    assert not reminders.cancel(drop, user_id=2)
+    assert reminders.cancel(drop, user_id=1)
+    assert asyncio.run(reminders.fire_due()) == 1
+    assert delivered == [keep]
+    reminders.store.close()
+
+
+def test_failed_deliveries_are_dropped(tmp_path):
+    async def deliver(row):
+        raise RuntimeError("DMs closed")
+
+    reminders = scheduler(tmp_path, deliver)
+    reminders.load_window()
+    reminders.schedule(1, 10, 0, "lost")
+    assert asyncio.run(reminders.fire_due()) == 1
+    assert reminders.pending_count(1) == 0
+    reminders.store.close()
+
+
+def test_stopping_mid_batch_does_not_resend_delivered_reminders(tmp_path):
+    delivered = []
+
+    async def deliver(row):
+        if row[4] == "slow":
+            await asyncio.sleep(10)
+        delivered.append(row[4])
+
+    async def main():
+        reminders = scheduler(tmp_path, deliver)
+        reminders.load_window()
+        for message in ("a", "slow", "b"):
+            reminders.schedule(1, 10, 0, message)
+        batch = asyncio.create_task(reminders.fire_due())
+        await asyncio.sleep(0.05)
+        batch.cancel()
+        await asyncio.gather(batch, return_exceptions=True)
+        return reminders
+
+    reminders = asyncio.run(main())
+    assert sorted(delivered) == ["a", "b"]
+    assert [message for _, _, message in reminders.pending(1)] == ["slow"]
+    reminders.store.close()
@@ -0,0 +1,63 @@
+import asyncio
+
+import discord
+
+from bench_restore import FakeChannel, FakeGuild, FakeREST, FakeRole
+from restore import RestoreExecutor, plan_restore
+
+
+def make_guild():
+    """A guild with the objects a restore must leave alone: managed roles, roles above the bot and unsupported channel types"""
+    guild = FakeGuild(FakeREST(0), roles=3, channels_per_category=2, categories=2)
+    bot_role = FakeRole(guild, "BotRole", discord.Color.default(), discord.Permissions(8), 50)
+    bot_role.managed = True
+    guild.me.top_role = bot_role
+    guild.roles += [bot_role, FakeRole(guild, "Admin", discord.Color.red(), discord.Permissions(8), 100)]
+    category = guild.categories[0]
+    guild.channels += [
+        FakeChannel(guild, "general", discord.ChannelType.text),
+        FakeChannel(guild, "announcements", discord.ChannelType.news, category),
+        FakeChannel(guild, "help", discord.ChannelType.forum),
+        FakeChannel(guild, "stage", discord.ChannelType.stage_voice, category),
+    ]
+    return guild
+
+
+def names(phases):
+    return sorted(str(op) for phase in phases for op in phase)
+
+
+def test_restoring_a_guild_onto_itself_changes_nothing():
+    guild = make_guild()
+    general = next(channel for channel in guild.channels if channel.name == "general")
+    assert plan_restore(guild.backup(), guild, keep_channel=general) == []
+    assert plan_restore(guild.backup(), guild) == []
+
+
+def test_plan_only_touches_what_drifted():
+    guild = make_guild()
+    backup = guild.backup()
+    guild.roles[1].permissions = discord.Permissions(1234)
+    guild.channels.remove(next(channel for channel in guild.channels if channel.name == "chat-0-1"))
+    guild.channels.append(FakeChannel(guild, "spam", discord.ChannelType.text))
+    guild.name = "Renamed"
+
+    assert names(plan_restore(backup, guild)) == [
+        "create channel chat-0-1", "delete channel spam", "edit role role-0", "edit server name"
+    ]
+
+
+def test_missing_roles_and_categories_are_created_before_their_channels():
+    guild = make_guild()
+    backup = guild.backup()
+    backup["roles"].append({"name": "Helper", "color": "#00ff00", "permissions": 0})
+    backup["channels"].append({"name": "lobby", "type": "voice", "category": "Events"})
+
+    phases = plan_restore(backup, guild)
+    assert [[str(op) for op in phase] for phase in phases] == [
+        ["create role Helper"], ["create category Events"], ["create channel lobby"]
+    ]
+    asyncio.run(RestoreExecutor().run(phases))
+    lobby = next(channel for channel in guild.channels if channel.name == "lobby")
+    assert lobby.category.name == "Events" and str(lobby.type) == "voice"
+    assert plan_restore(backup, guild) == []
@@ -0,0 +1,63 @@
+import itertools
+
+import pytest
+
+import warning_ledger
+from warning_ledger import WarningLedger
+
+GUILD, MEMBER, MODERATOR = 1, 2, 3
+NOW = 1_700_000_000
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    """One second passes between warnings, so newest-first order is well defined"""
+    ticks = itertools.count(NOW)
+    monkeypatch.setattr(warning_ledger.time, "time", lambda: next(ticks))
+
+
+def test_warnings_are_counted_per_guild_and_member(tmp_path):
+    ledger = WarningLedger(str(tmp_path / "warnings.db"))
+    assert ledger.add(GUILD, MEMBER, MODERATOR, "spam")[1] == 1
+    assert ledger.add(GUILD, MEMBER, MODERATOR, "more spam")[1] == 2
+    ledger.add(GUILD, MEMBER + 1, MODERATOR, "someone else")
+    ledger.add(GUILD + 1, MEMBER, MODERATOR, "another guild")
+    assert ledger.active_count(GUILD, MEMBER) == 2
+    ledger.close()
+
+
+def test_remove_latest_deactivates_the_newest_warning(tmp_path):
+    ledger = WarningLedger(str(tmp_path / "warnings.db"))
+    ledger.add(GUILD, MEMBER, MODERATOR, "first")
+    latest, _ = ledger.add(GUILD, MEMBER, MODERATOR, "second")
+    assert ledger.remove_latest(GUILD, MEMBER) == (latest, "second", 1)
+    assert ledger.remove_latest(GUILD, MEMBER)[1:] == ("first", 0)
+    assert ledger.remove_latest(GUILD, MEMBER) is None
+    # Removed warnings stay in the history
+    assert ledger.history(GUILD, MEMBER)[1] == 2
+    ledger.close()
+
+
+def test_history_pages_newest_first(tmp_path):
+    ledger = WarningLedger(str(tmp_path / "warnings.db"))
+    for i in range(12):
+        ledger.add(GUILD, MEMBER, MODERATOR, f"warning {i}")
+    rows, total = ledger.history(GUILD, MEMBER, page=1)
+    assert total == 12
+    assert [row[2] for row in rows] == [f"warning {i}" for i in range(11, 6, -1)]
+    assert [row[2] for row in ledger.history(GUILD, MEMBER, page=3)[0]] == ["warning 1", "warning 0"]
+    assert ledger.history(GUILD, MEMBER, page=4)[0] == []
+    ledger.close()
+
+
+def test_expire_deactivates_only_expired_warnings(tmp_path):
+    ledger = WarningLedger(str(tmp_path / "warnings.db"))
+    ledger.add(GUILD, MEMBER, MODERATOR, "short", expires_in=60)
+    ledger.add(GUILD, MEMBER, MODERATOR, "permanent")
+    ledger.add(GUILD, MEMBER + 1, MODERATOR, "long", expires_in=3600)
+
+    assert ledger.expire(NOW + 120) == [(GUILD, MEMBER)]
+    assert ledger.expire(NOW + 120) == []
+    assert ledger.active_count(GUILD, MEMBER) == 1
+    assert ledger.active_count(GUILD, MEMBER + 1) == 1
+    ledger.close()
@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from httpclient import HttpClient
+from weather import OpenMeteoBackend, WeatherService, WeatherUnavailable
+
+LATENCY = 0.02
+
+
+class StandIn:
+    """Local stand-in for the Open-Meteo geocoding and forecast API"""
+
+    def __init__(self):
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.fail = False
+        self.app = web.Application()
+        self.app.router.add_get("/v1/search", self.search)
+        self.app.router.add_get("/v1/forecast", self.forecast)
+
+    async def _enter(self):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(LATENCY)
+        self.active -= 1
+
+    async def search(self, request):
+        await self._enter()
+        if self.fail:
+            return web.json_response({"reason": "down"}, status=503)
+        name = request.query["name"]
+        if name.startswith("nowhere"):
+            return web.json_response({"generationtime_ms": 0.1})
+        return web.json_response({"results": [{"name": name.title(), "latitude": 52.5, "longitude": 13.4, "country": "Testland"}]})
+
+    async def forecast(self, request):
+        await self._enter()
+        return web.json_response({"current": {
+            "temperature_2m": 21.5, "apparent_temperature": 20.9, "relative_humidity_2m": 40,
+            "wind_speed_10m": 12.0, "weather_code": 2
+        }})
+
+
+def run(test):
+    """Run `test(stand_in, make_service)` against a stand-in server on a free port"""
+    async def main():
+        stand_in = StandIn()
+        runner = web.AppRunner(stand_in.app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        http_client = HttpClient(allow_private=True)
+
+        def make_service(**kwargs):
+            return WeatherService(OpenMeteoBackend(http_client, f"{base}/v1/search", f"{base}/v1/forecast"), **kwargs)
+
+        try:
+            await test(stand_in, make_service)
+        finally:
+            await http_client.close()
+            await runner.cleanup()
+    asyncio.run(main())
+
+
+def test_fresh_lookups_are_served_from_cache():
+    async def test(stand_in, make_service):
+        weather = make_service()
+        report, age = await weather.get("Berlin")
+        assert report.place == "Berlin, Testland" and age == 0.0
+        assert stand_in.calls == 2  # geocode + forecast
+
+        report, age = await weather.get("  BERLIN!! ")
+        assert report.temperature == 21.5 and age > 0
+        assert stand_in.calls == 2
+        assert (weather.hits, weather.misses) == (1, 1)
+    run(test)
+
+
+def test_expired_lookups_go_upstream_again():
+    async def test(stand_in, make_service):
+        weather = make_service(ttl=0.05, stale_ttl=0)
+        await weather.get("Berlin")
+        await asyncio.sleep(0.06)
+        report, age = await weather.get("Berlin")
+        assert report is not None and age == 0.0
+        assert stand_in.calls == 4
+        assert weather.misses == 2
+    run(test)
+
+
+def test_unknown_locations_are_cached():
+    async def test(stand_in, make_service):
+        weather = make_service()
+        assert (await weather.get("nowhere"))[0] is None
+        assert (await weather.get("Nowhere"))[0] is None
+        assert stand_in.calls == 1
+    run(test)
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    async def test(stand_in, make_service):
+        weather = make_service()
+        results = await asyncio.gather(*(weather.get("Berlin") for _ in range(50)))
+        assert all(report.place == "Berlin, Testland" for report, _ in results)
+        assert stand_in.calls == 2
+        assert (weather.misses, weather.coalesced) == (1, 49)
+    run(test)
+
+
+def test_stale_lookups_are_served_while_refreshing():
+    async def test(stand_in, make_service):
+        weather = make_service(ttl=0.05, stale_ttl=60)
+        await weather.get("Rome")
+        await asyncio.sleep(0.06)
+
+        started = time.perf_counter()
+        report, age = await weather.get("Rome")
+        assert report is not None and age > 0.05
+        assert time.perf_counter() - started < LATENCY
+        assert weather.stale_hits == 1
+
+        await asyncio.sleep(LATENCY * 4)
+        assert stand_in.calls == 4
+        assert (await weather.get("Rome"))[1] < 0.05
+    run(test)
+
+
+def test_upstream_calls_are_capped():
+    async def test(stand_in, make_service):
+        weather = make_service(max_concurrency=3)
+        await asyncio.gather(*(weather.get(f"city {i}") for i in range(12)))
+        assert stand_in.max_active == 3
+        assert stand_in.calls == 24
+    run(test)
+
+
+def test_upstream_errors_raise_weather_unavailable():
+    async def test(stand_in, make_service):
+        weather = make_service()
+        stand_in.fail = True
+        with pytest.raises(WeatherUnavailable):
+            await weather.get("Paris")
+        assert weather.errors == 1
+
+        stand_in.fail = False
+        assert (await weather.get("Paris"))[0] is not None
+    run(test)
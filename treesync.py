@@ -0,0 +1,52 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+
+def tree_fingerprint(tree, guild=None):
+    """Hash of the app command payloads that a sync would upload"""
+    payloads = sorted(
+        (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+        key=lambda payload: (payload.get("type", 1), payload["name"])
+    )
+    # Include the application so switching tokens to another bot still syncs
+    data = {"application_id": tree.client.application_id, "commands": payloads}
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class TreeSyncState:
+    """Remembers the fingerprint of the last successful sync per scope"""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS tree_sync ("
+            "scope INTEGER PRIMARY KEY, fingerprint TEXT NOT NULL, synced_at REAL NOT NULL)"
+        )
+        self.db.commit()
+
+    def fingerprint(self, scope):
+        row = self.db.execute("SELECT fingerprint FROM tree_sync WHERE scope = ?", (scope,)).fetchone()
+        return row[0] if row else None
+
+    def record(self, scope, fingerprint):
+        self.db.execute(
+            "INSERT INTO tree_sync (scope, fingerprint, synced_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (scope) DO UPDATE SET fingerprint = excluded.fingerprint, synced_at = excluded.synced_at",
+            (scope, fingerprint, time.time())
+        )
+        self.db.commit()
+
+    async def sync_if_changed(self, tree, guild=None, force=False):
+        """Sync the tree only when its payloads differ from the last sync, returning whether it synced"""
+        scope = guild.id if guild else 0
+        fingerprint = tree_fingerprint(tree, guild)
+        if not force and fingerprint == self.fingerprint(scope):
+            return False
+        await tree.sync(guild=guild)
+        self.record(scope, fingerprint)
+        return True
+
+    def close(self):
+        self.db.close()
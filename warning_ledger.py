@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import sqlite3
+import time
+
+log = logging.getLogger(__name__)
+
+
+class WarningLedger:
+    """SQLite ledger of member warnings with expiry
+
+    Every lookup goes through the (guild_id, user_id, active, created_at) index,
+    so counting or paging a member's warnings stays O(log n) in the ledger size.
+    """
+
+    def __init__(self, path, on_expire=None, sweep_interval=300):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS warnings ("
+            "id INTEGER PRIMARY KEY, guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+            "moderator_id INTEGER NOT NULL, reason TEXT NOT NULL, created_at REAL NOT NULL, "
+            "expires_at REAL, active INTEGER NOT NULL DEFAULT 1)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS warnings_member ON warnings (guild_id, user_id, active, created_at)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS warnings_expiry ON warnings (expires_at) WHERE active = 1")
+        self.db.commit()
+        self.on_expire = on_expire
+        self.sweep_interval = sweep_interval
+        self._task = None
+
+    def add(self, guild_id, user_id, moderator_id, reason, expires_in=None):
+        """Record a warning and return (warning id, active warning count)"""
+        now = time.time()
+        cur = self.db.execute(
+            "INSERT INTO warnings (guild_id, user_id, moderator_id, reason, created_at, expires_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (guild_id, user_id, moderator_id, reason, now, now + expires_in if expires_in else None)
+        )
+        self.db.commit()
+        return cur.lastrowid, self.active_count(guild_id, user_id)
+
+    def active_count(self, guild_id, user_id):
+        return self.db.execute(
+            "SELECT COUNT(*) FROM warnings WHERE guild_id = ? AND user_id = ? AND active = 1",
+            (guild_id, user_id)
+        ).fetchone()[0]
+
+    def remove_latest(self, guild_id, user_id):
+        """Deactivate the newest active warning and return (id, reason, active count left)"""
+        row = self.db.execute(
+            "SELECT id, reason FROM warnings WHERE guild_id = ? AND user_id = ? AND active = 1 "
+            "ORDER BY created_at DESC LIMIT 1",
+            (guild_id, user_id)
+        ).fetchone()
+        if row is None:
+            return None
+        self.db.execute("UPDATE warnings SET active = 0 WHERE id = ?", (row[0],))
+        self.db.commit()
+        return row[0], row[1], self.active_count(guild_id, user_id)
+
+    def history(self, guild_id, user_id, page=1, per_page=5):
+        """Return (rows, total) for one page of a member's warnings, newest first"""
+        total = self.db.execute(
+            "SELECT COUNT(*) FROM warnings WHERE guild_id = ? AND user_id = ?", (guild_id, user_id)
+        ).fetchone()[0]
+        rows = self.db.execute(
+            "SELECT id, moderator_id, reason, created_at, expires_at, active FROM warnings "
+            "WHERE guild_id = ? AND user_id = ? ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (guild_id, user_id, per_page, (max(page, 1) - 1) * per_page)
+        ).fetchall()
+        return rows, total
+
+    def expire(self, now=None):
+        """Deactivate every warning past its expiry and return the affected (guild_id, user_id) pairs"""
+        now = time.time() if now is None else now
+        affected = self.db.execute(
+            "SELECT DISTINCT guild_id, user_id FROM warnings WHERE active = 1 AND expires_at <= ?", (now,)
+        ).fetchall()
+        if affected:
+            self.db.execute("UPDATE warnings SET active = 0 WHERE active = 1 AND expires_at <= ?", (now,))
+            self.db.commit()
+        return affected
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def run(self):
+        while True:
+            try:
+                affected = self.expire()
+                if affected and self.on_expire:
+                    await self.on_expire(affected)
+            except Exception as e:
+                log.warning("Failed to expire warnings: %s", e)
+            await asyncio.sleep(self.sweep_interval)
+
+    def close(self):
+        if self._task:
+            self._task.cancel()
+        self.db.close()
@@ -0,0 +1,188 @@
+import asyncio
+import re
+import time
+from collections import OrderedDict
+
+import aiohttp
+
+from metrics import LATENCY_BUCKETS, Histogram
+
+GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+WEATHER_CODES = {
+    0: ("☀️", "Clear sky"), 1: ("🌤️", "Mainly clear"), 2: ("⛅", "Partly cloudy"), 3: ("☁️", "Overcast"),
+    45: ("🌫️", "Fog"), 48: ("🌫️", "Rime fog"), 51: ("🌦️", "Light drizzle"), 53: ("🌦️", "Drizzle"),
+    55: ("🌧️", "Dense drizzle"), 61: ("🌦️", "Light rain"), 63: ("🌧️", "Rain"), 65: ("🌧️", "Heavy rain"),
+    66: ("🌧️", "Freezing rain"), 67: ("🌧️", "Heavy freezing rain"), 71: ("🌨️", "Light snow"),
+    73: ("🌨️", "Snow"), 75: ("❄️", "Heavy snow"), 77: ("🌨️", "Snow grains"), 80: ("🌦️", "Rain showers"),
+    81: ("🌧️", "Heavy rain showers"), 82: ("⛈️", "Violent rain showers"), 85: ("🌨️", "Snow showers"),
+    86: ("❄️", "Heavy snow showers"), 95: ("⛈️", "Thunderstorm"), 96: ("⛈️", "Thunderstorm with hail"),
+    99: ("⛈️", "Thunderstorm with heavy hail")
+}
+
+
+class WeatherUnavailable(Exception):
+    """The upstream provider failed or answered with something unexpected"""
+
+
+def normalize_location(location):
+    """Cache key for a location: case-folded, punctuation-insensitive, single spaces"""
+    return " ".join(re.sub(r"[^\w\s]", " ", location.casefold()).split())
+
+
+class WeatherReport:
+    __slots__ = ("place", "temperature", "feels_like", "humidity", "wind_speed", "code")
+
+    def __init__(self, place, temperature, feels_like, humidity, wind_speed, code):
+        self.place = place
+        self.temperature = temperature
+        self.feels_like = feels_like
+        self.humidity = humidity
+        self.wind_speed = wind_speed
+        self.code = code
+
+    @property
+    def emoji(self):
+        return WEATHER_CODES.get(self.code, ("🌡️", ""))[0]
+
+    @property
+    def description(self):
+        return WEATHER_CODES.get(self.code, ("", "Unknown"))[1]
+
+
+class OpenMeteoBackend:
+    """Geocodes a location name and fetches its current conditions from Open-Meteo (no API key)"""
+
+    def __init__(self, http_client, geocode_url=GEOCODE_URL, forecast_url=FORECAST_URL):
+        self.http_client = http_client
+        self.geocode_url = geocode_url
+        self.forecast_url = forecast_url
+
+    async def _get_json(self, url, params):
+        session = await self.http_client.start()
+        async with session.get(url, params=params) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+
+    async def lookup(self, location):
+        """Return a WeatherReport, or None if the location is unknown"""
+        places = (await self._get_json(self.geocode_url, {"name": location, "count": 1})).get("results")
+        if not places:
+            return None
+        place = places[0]
+        data = await self._get_json(self.forecast_url, {
+            "latitude": place["latitude"], "longitude": place["longitude"],
+            "current": "temperature_2m,apparent_temperature,relative_humidity_2m,wind_speed_10m,weather_code"
+        })
+        current = data["current"]
+        name = ", ".join(part for part in (place.get("name"), place.get("admin1"), place.get("country")) if part)
+        return WeatherReport(
+            name, current["temperature_2m"], current["apparent_temperature"],
+            current["relative_humidity_2m"], current["wind_speed_10m"], current["weather_code"]
+        )
+
+
+class CachedWeather:
+    __slots__ = ("report", "fetched_at")
+
+    def __init__(self, report, fetched_at):
+        self.report = report
+        self.fetched_at = fetched_at
+
+
+class WeatherService:
+    """TTL cache with single-flight lookups and stale-while-revalidate in front of a backend
+
+    A lookup younger than `ttl` is answered from memory. Between `ttl` and
+    `stale_ttl` the old answer is returned at once while one background refresh
+    runs. Concurrent misses for the same location share a single upstream call,
+    and at most `max_concurrency` upstream calls run at a time. Unknown
+    locations are cached for `negative_ttl`.
+    """
+
+    def __init__(self, backend, ttl=600, stale_ttl=3600, negative_ttl=300, max_concurrency=4, max_entries=2048):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self.upstream_latency = Histogram()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return (self.hits + self.stale_hits) / lookups if lookups else 0.0
+
+    async def _refresh(self, key, location):
+        try:
+            async with self._semaphore:
+                started = time.perf_counter()
+                try:
+                    report = await self.backend.lookup(location)
+                finally:
+                    self.upstream_latency.observe(time.perf_counter() - started)
+            self._cache[key] = CachedWeather(report, time.monotonic())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            return report
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, ValueError) as e:
+            self.errors += 1
+            raise WeatherUnavailable(str(e) or type(e).__name__) from e
+        finally:
+            del self._inflight[key]
+
+    def _start_refresh(self, key, location):
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.create_task(self._refresh(key, location))
+        return task
+
+    async def get(self, location):
+        """Return (WeatherReport or None, age in seconds)"""
+        key = normalize_location(location)
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None:
+            age = now - cached.fetched_at
+            ttl = self.ttl if cached.report is not None else self.negative_ttl
+            if age < ttl:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return cached.report, age
+            if cached.report is not None and age < self.stale_ttl:
+                self.stale_hits += 1
+                task = self._start_refresh(key, location)
+                # A failed background refresh only matters to the next caller
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                return cached.report, age
+
+        if key in self._inflight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        report = await asyncio.shield(self._start_refresh(key, location))
+        return report, 0.0
+
+    def render_metrics(self):
+        lines = ["# TYPE bot_weather_lookups_total counter"]
+        for result, count in (("hit", self.hits), ("stale", self.stale_hits), ("miss", self.misses),
+                              ("coalesced", self.coalesced), ("error", self.errors)):
+            lines.append(f'bot_weather_lookups_total{{result="{result}"}} {count}')
+        lines += ["# TYPE bot_weather_cache_hit_ratio gauge", f"bot_weather_cache_hit_ratio {self.hit_ratio}"]
+        lines.append("# TYPE bot_weather_upstream_seconds histogram")
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), self.upstream_latency.counts):
+            cumulative += count
+            lines.append(f'bot_weather_upstream_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f"bot_weather_upstream_seconds_sum {self.upstream_latency.sum}")
+        lines.append(f"bot_weather_upstream_seconds_count {self.upstream_latency.count}")
+        return lines